@@ -0,0 +1,276 @@
+import hashlib
+import json
+from contextlib import asynccontextmanager
+
+import pandas as pd
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+
+from backend import analytics_query
+from backend.analytics import span
+from backend.call_custom_vision import call_custom_vision
+from backend.call_openai_api import call_openai_api
+from backend.data_quality import load_reports, summarize
+from backend.metrics import render_prometheus
+from backend.poi_store import LAYER_TRASH, get_poi_store, register_shops
+from backend.shop_finder import get_shops_by_location
+from backend.single_flight import SingleFlight
+from backend.snapshots import get_snapshot_store
+from backend.topk import LruCache, TopKPager, rank_of
+from backend.walking import WALK_MAX_M, load_walk_graph, rank_by_walking, walking_available
+from backend.trash_can_info import (
+    current_trash_dataset,
+    filter_by_gu,
+    lookup_trash_can,
+    search_by_keyword,
+    source_key,
+    start_trash_reloader,
+)
+
+# Streamlit 없이 백엔드 기능을 JSON으로 제공하는 API 서버
+# 실행: uvicorn api:app --workers 4
+# 워커(프로세스)마다 POI 저장소를 한 번만 로드해서 모든 요청이 공유한다.
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 첫 요청이 데이터 로드를 기다리지 않도록 미리 올려둔다
+    await run_in_threadpool(get_poi_store)
+    if walking_available():
+        await run_in_threadpool(load_walk_graph)
+    start_trash_reloader()
+    yield
+
+
+app = FastAPI(title="쓰담 API", lifespan=lifespan)
+
+_coach_flight = SingleFlight()
+
+# 목록 정렬 상태: 저장소 버전별 (자치구, 이름) 순위와 질의별 부분 정렬 결과
+_name_ranks = LruCache(max_entries=2)
+_list_pagers = LruCache(max_entries=64)
+
+
+def _records(df: pd.DataFrame) -> list[dict]:
+    """DataFrame → JSON 레코드 (NaN은 null, numpy 정수는 int로)."""
+    if df.empty:
+        return []
+    return json.loads(df.to_json(orient="records", force_ascii=False))
+
+
+def _split(value: str | None) -> list[str] | None:
+    if not value:
+        return None
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok", "store_version": get_poi_store().version}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus 수집용 지연 시간/호출 수 지표."""
+    return render_prometheus()
+
+
+# ───────────────── 휴지통 / POI ─────────────────
+
+@app.get("/trash-cans")
+async def list_trash_cans(
+    gu: str | None = None,
+    keyword: str = "",
+    limit: int = Query(100, ge=1, le=5000),
+    offset: int = Query(0, ge=0),
+):
+    """자치구/검색어 필터 (지도 페이지의 목록과 같은 결과)."""
+    return await run_in_threadpool(_list_trash_cans, gu, keyword, limit, offset)
+
+
+def _list_trash_cans(gu: str | None, keyword: str, limit: int, offset: int) -> dict:
+    store = get_poi_store()
+    # 사용 기록에는 검색어 내용 대신 검색 여부만 남긴다
+    with span("api", "list", gu=gu, keyword=bool(keyword)) as ev:
+        df = filter_by_gu(store.layer_frame(LAYER_TRASH), gu)
+        df = search_by_keyword(df, keyword)
+        # 전체를 정렬하지 않고 요청한 페이지까지만 정렬한다 (앞 페이지 정렬 결과는 질의별로 재사용)
+        rank = _name_ranks.get(
+            store.version, lambda: rank_of(store.layer_frame(LAYER_TRASH), ["gu", "name"])
+        )
+        pager = _list_pagers.get(
+            (store.version, gu, keyword), lambda: TopKPager(rank[df.index.to_numpy()])
+        )
+        items = _records(df.iloc[pager.slice(offset, offset + limit)])
+        ev["count"] = len(df)
+    return {"store_version": store.version, "total": len(df), "items": items}
+
+
+@app.get("/trash-cans/quality")
+async def trash_data_quality():
+    """적재 단계 검증 보고서 (좌표 복구/제거, 근접 중복 제거 내역)."""
+    return await run_in_threadpool(_trash_data_quality)
+
+
+def _trash_data_quality() -> dict:
+    sources = [source_key(path) for path in sorted(current_trash_dataset().signatures)]
+    reports = load_reports(sources)
+    return {"summary": summarize(reports), "files": reports}
+
+
+@app.get("/trash-cans/history")
+async def trash_history():
+    """출처(자치구 파일)별 스냅샷 날짜 목록."""
+    store = await run_in_threadpool(get_snapshot_store)
+    return {"sources": store.sources()}
+
+
+@app.get("/trash-cans/as-of")
+async def trash_cans_as_of(
+    date: str,
+    gu: str | None = None,
+    limit: int = Query(100, ge=1, le=5000),
+    offset: int = Query(0, ge=0),
+):
+    """date(YYYY-MM-DD) 당시의 휴지통 목록 (출처마다 그 날짜 이전의 가장 최근 스냅샷)."""
+    try:
+        return await run_in_threadpool(_trash_cans_as_of, date, gu, limit, offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _trash_cans_as_of(date: str, gu: str | None, limit: int, offset: int) -> dict:
+    df = get_snapshot_store().as_of(date, gu)
+    return {"date": date, "total": len(df), "items": _records(df.iloc[offset : offset + limit])}
+
+
+@app.get("/trash-cans/diff")
+async def trash_cans_diff(start: str, end: str, gu: str | None = None, items: bool = False):
+    """start → end 사이 자치구별 추가/삭제/이동 수 (items=true면 바뀐 휴지통 목록도)."""
+    try:
+        return await run_in_threadpool(_trash_cans_diff, start, end, gu, items)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _trash_cans_diff(start: str, end: str, gu: str | None, items: bool) -> dict:
+    diff = get_snapshot_store().diff(start, end, gu)
+    body = {"start": diff.start.isoformat(), "end": diff.end.isoformat(), "summary": diff.summary}
+    if items:
+        body.update(
+            added=_records(diff.added), removed=_records(diff.removed), moved=_records(diff.moved)
+        )
+    return body
+
+
+@app.get("/trash-cans/nearby")
+async def nearby_trash_cans(
+    lat: float,
+    lng: float,
+    radius_m: float = Query(300.0, gt=0, le=20000),
+    limit: int = Query(50, ge=1, le=1000),
+    types: str | None = None,
+    walking: bool = False,
+):
+    """walking=true면 반경 안의 휴지통을 도보 거리순으로 정렬 (보행 그래프가 있을 때만, walk_m 포함)."""
+    store = get_poi_store()
+    # 위치(lat/lng)는 사용 기록에 남기지 않는다
+    with span("api", "nearby", walking=walking, radius_m=radius_m) as ev:
+        if walking and walking_available():
+            # 도보 거리는 직선거리 이상이므로 반경(최대 WALK_MAX_M) 안을 모두 후보로 본다
+            df = await run_in_threadpool(
+                store.query, lat, lng, [LAYER_TRASH], _split(types), min(radius_m, WALK_MAX_M), None
+            )
+            df = await run_in_threadpool(rank_by_walking, df, lat, lng, limit)
+        else:
+            df = await run_in_threadpool(
+                store.query, lat, lng, [LAYER_TRASH], _split(types), radius_m, limit
+            )
+        ev["count"] = len(df)
+    return {"store_version": store.version, "items": _records(df)}
+
+
+@app.get("/trash-cans/{bin_id}")
+async def get_trash_can(bin_id: int):
+    item = await run_in_threadpool(_get_trash_can, bin_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail="해당 휴지통을 찾을 수 없어요.")
+    return item
+
+
+def _get_trash_can(bin_id: int) -> dict | None:
+    row = lookup_trash_can(bin_id)
+    return None if row is None else _records(row.to_frame().T)[0]
+
+
+@app.get("/pois/nearby")
+async def nearby_pois(
+    lat: float,
+    lng: float,
+    layers: str | None = None,
+    types: str | None = None,
+    radius_m: float | None = Query(None, gt=0, le=20000),
+    limit: int = Query(50, ge=1, le=1000),
+):
+    """휴지통/분리배출 장소/샵을 통합 조회 (layers=trash,dropoff,shop)."""
+    store = get_poi_store()
+    with span("api", "pois_nearby", layers=layers, radius_m=radius_m) as ev:
+        df = await run_in_threadpool(
+            store.query, lat, lng, _split(layers), _split(types), radius_m, limit
+        )
+        ev["count"] = len(df)
+    return {"store_version": store.version, "items": _records(df)}
+
+
+@app.get("/pois/search")
+async def search_pois(
+    keyword: str,
+    layers: str | None = None,
+    limit: int = Query(100, ge=1, le=5000),
+):
+    return await run_in_threadpool(_search_pois, keyword, layers, limit)
+
+
+def _search_pois(keyword: str, layers: str | None, limit: int) -> dict:
+    df = get_poi_store().search(keyword, _split(layers))
+    return {"total": len(df), "items": _records(df.head(limit))}
+
+
+@app.get("/analytics/summary")
+async def analytics_summary(days: int = Query(7, ge=1, le=90), top: int = Query(10, ge=1, le=100)):
+    """최근 days일의 날짜별 상위 품목, 정확도 분포, 단계별 지연 시간 백분위수."""
+    return await run_in_threadpool(analytics_query.summary, days, top)
+
+
+# ───────────────── 분리배출 코칭 ─────────────────
+
+@app.post("/coach/guide")
+async def classify_and_guide(request: Request, lang: str = "ko"):
+    """
+    이미지 바이너리(application/octet-stream)를 받아 품목 인식 + 분리배출 안내를 반환한다.
+    """
+    image_data = await request.body()
+    # 같은 사진이 동시에 여러 번 올라오면 인식 + 안내 생성을 한 번만 수행
+    key = (hashlib.sha256(image_data).hexdigest(), lang)
+    return await _coach_flight.do_async(key, _classify_and_guide, image_data, lang)
+
+
+async def _classify_and_guide(image_data: bytes, lang: str) -> dict:
+    cv_result = await run_in_threadpool(call_custom_vision, image_data)
+    if "error" in cv_result:
+        return {"vision": cv_result, "guide": None}
+
+    guide = await run_in_threadpool(
+        call_openai_api, cv_result["tag"], cv_result["probability"], lang
+    )
+    return {"vision": cv_result, "guide": guide}
+
+
+# ───────────────── 제로웨이스트 샵 ─────────────────
+
+@app.get("/shops")
+async def search_shops(location: str):
+    df = await run_in_threadpool(get_shops_by_location, location)
+    await run_in_threadpool(register_shops, location, df)
+    return {"items": _records(df)}
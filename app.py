@@ -1,10 +1,12 @@
 import streamlit as st
 
+from backend.trash_can_info import start_trash_reloader
 from views.coach import page as coach_page
 from views.seoul_trash_map import page as trash_page
 from views.seoul_waste_request import page as waste_page
 from views.zerowaste_map import page as zerowaste_page
 from views.dropoff_map import page as dropoff_page
+from views.debug_panel import render_metrics_panel
 
 st.set_page_config(
     page_title="쓰담 | 재활용 분리배출 코치",
@@ -45,5 +47,12 @@ pages = [
     ),
 ]
 
+# data/trash CSV 변경 감지 (프로세스당 한 번만 시작됨)
+start_trash_reloader()
+
 nav = st.navigation(pages)
 nav.run()
+
+# ?debug=1 일 때만 성능 지표 패널 표시
+if st.query_params.get("debug") == "1":
+    render_metrics_panel()
@@ -0,0 +1,244 @@
+# backend/analytics.py
+
+from __future__ import annotations
+
+import atexit
+import datetime as dt
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from backend import ROOT_DIR
+from backend.metrics import counter
+
+logger = logging.getLogger(__name__)
+
+# 사용 기록(분류 결과, 단계별 지연 시간, 지도 조회)을 Parquet 파일로 남기는 이벤트 기록기.
+#
+# record()는 메모리 버퍼에 한 줄 붙이기만 하고 바로 돌아간다. 백그라운드 스레드가
+# ANALYTICS_FLUSH_INTERVAL_S마다(또는 버퍼가 ANALYTICS_BATCH_SIZE를 넘으면) 모아서
+# 지금 쓰는 Parquet 파일에 row group 하나로 붙인다.
+# 파일은 날짜가 바뀌거나, ANALYTICS_ROTATE_MB를 넘거나, ANALYTICS_ROTATE_S가 지나면 닫고
+# 새 파일을 연다. 쓰는 중인 파일은 .inprogress로 두었다가 닫을 때 이름을 바꾸므로
+# 조회(analytics_query)는 완성된 파일만 읽는다. 파일 이름에 호스트/pid가 들어가서 워커끼리 겹치지 않는다.
+#
+# 이미지는 저장하지 않고 sha256 해시만 남긴다 (coach 화면의 개인정보 보호 방침).
+
+# 비워 두면("") 기록하지 않는다
+ANALYTICS_DIR = os.environ.get("ANALYTICS_DIR", str(ROOT_DIR / "build" / "analytics"))
+ANALYTICS_BATCH_SIZE = int(os.environ.get("ANALYTICS_BATCH_SIZE", "512"))
+ANALYTICS_FLUSH_INTERVAL_S = float(os.environ.get("ANALYTICS_FLUSH_INTERVAL_S", "5"))
+ANALYTICS_ROTATE_MB = float(os.environ.get("ANALYTICS_ROTATE_MB", "64"))
+ANALYTICS_ROTATE_S = float(os.environ.get("ANALYTICS_ROTATE_S", "300"))
+# 디스크 쓰기가 밀려도 메모리가 무한정 늘지 않도록, 넘치면 새 이벤트를 버린다
+ANALYTICS_MAX_BUFFER = int(os.environ.get("ANALYTICS_MAX_BUFFER", "50000"))
+
+SCHEMA = pa.schema(
+    [
+        ("ts", pa.timestamp("ms", tz="UTC")),
+        # coach / map / api 등 기록한 곳
+        ("event", pa.string()),
+        # vision / guide / list / nearby 등 단계
+        ("stage", pa.string()),
+        ("latency_ms", pa.float64()),
+        ("image_hash", pa.string()),
+        ("tag", pa.string()),
+        ("probability", pa.float64()),
+        ("lang", pa.string()),
+        ("gu", pa.string()),
+        # 결과 건수 (목록/주변 조회)
+        ("count", pa.int64()),
+        # ok / error / local / llm 등
+        ("outcome", pa.string()),
+        # 그 밖의 값 (JSON 문자열)
+        ("detail", pa.string()),
+    ]
+)
+FIELDS = tuple(SCHEMA.names)
+
+_recorded = counter("analytics_events_total", "analytics events recorded")
+_dropped = counter("analytics_dropped_total", "analytics events dropped (buffer full or write failure)")
+_flushed = counter("analytics_flush_total", "analytics batches written")
+
+
+class EventWriter:
+    """버퍼 + 백그라운드 flush + 파일 교체. 스레드 안전."""
+
+    def __init__(
+        self,
+        directory: str,
+        batch_size: int = ANALYTICS_BATCH_SIZE,
+        interval_s: float = ANALYTICS_FLUSH_INTERVAL_S,
+        rotate_bytes: float = ANALYTICS_ROTATE_MB * 1024 * 1024,
+        rotate_s: float = ANALYTICS_ROTATE_S,
+        max_buffer: int = ANALYTICS_MAX_BUFFER,
+    ):
+        self.directory = directory
+        self.batch_size = batch_size
+        self.interval_s = interval_s
+        self.rotate_bytes = rotate_bytes
+        self.rotate_s = rotate_s
+        self.max_buffer = max_buffer
+
+        self._lock = threading.Lock()
+        self._buffer: list[dict] = []
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # 파일 쓰기는 flush 스레드(또는 close)만 한다
+        self._io_lock = threading.Lock()
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._path: Optional[str] = None
+        self._opened_at = 0.0
+        self._day: Optional[dt.date] = None
+        self._seq = 0
+        self._prefix = f"{socket.gethostname()}-{os.getpid()}"
+
+    # ---- 요청 경로 ----
+
+    def record(self, row: dict) -> None:
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer:
+                _dropped.inc()
+                return
+            self._buffer.append(row)
+            full = len(self._buffer) >= self.batch_size
+            if self._thread is None:
+                self._start()
+        _recorded.inc()
+        if full:
+            self._wake.set()
+
+    def _start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="analytics-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.interval_s)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:  # 기록 실패는 다음 주기에 다시 시도
+                logger.exception("사용 기록 저장 실패")
+
+    # ---- 파일 ----
+
+    def flush(self) -> int:
+        """버퍼를 파일에 쓴다. 쓴 이벤트 수를 돌려준다."""
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+        with self._io_lock:
+            if rows:
+                try:
+                    table = pa.Table.from_pylist(rows, schema=SCHEMA)
+                    self._writer_for(dt.datetime.now(dt.timezone.utc).date()).write_table(table)
+                    _flushed.inc()
+                except (OSError, pa.ArrowException) as e:
+                    _dropped.inc(len(rows))
+                    logger.warning("사용 기록을 저장하지 못했어요 (%d건): %s", len(rows), e)
+                    return 0
+            if self._writer is not None and self._should_rotate():
+                self._rotate()
+        return len(rows)
+
+    def _writer_for(self, day: dt.date) -> pq.ParquetWriter:
+        if self._writer is not None and day != self._day:
+            self._rotate()
+        if self._writer is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._seq += 1
+            name = f"events-{day:%Y%m%d}-{self._prefix}-{int(time.time())}-{self._seq}.parquet"
+            self._path = os.path.join(self.directory, name)
+            self._writer = pq.ParquetWriter(f"{self._path}.inprogress", SCHEMA, compression="zstd")
+            self._opened_at = time.monotonic()
+            self._day = day
+        return self._writer
+
+    def _should_rotate(self) -> bool:
+        if time.monotonic() - self._opened_at >= self.rotate_s:
+            return True
+        if dt.datetime.now(dt.timezone.utc).date() != self._day:
+            return True
+        try:
+            return os.path.getsize(f"{self._path}.inprogress") >= self.rotate_bytes
+        except OSError:
+            return False
+
+    def _rotate(self) -> None:
+        """지금 파일을 닫고 완성된 이름으로 공개한다 (잠금 안에서 호출)."""
+        writer, path = self._writer, self._path
+        self._writer = self._path = None
+        try:
+            writer.close()
+            os.replace(f"{path}.inprogress", path)
+        except OSError as e:
+            logger.warning("사용 기록 파일을 닫지 못했어요 (%s): %s", path, e)
+
+    def close(self) -> None:
+        self.flush()
+        with self._io_lock:
+            if self._writer is not None:
+                self._rotate()
+
+
+_writer: Optional[EventWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> Optional[EventWriter]:
+    """프로세스당 하나의 기록기 (ANALYTICS_DIR가 비어 있으면 None)."""
+    global _writer
+    if not ANALYTICS_DIR:
+        return None
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = EventWriter(ANALYTICS_DIR)
+                atexit.register(_writer.close)
+    return _writer
+
+
+def record(event: str, stage: str, latency_ms: Optional[float] = None, **fields) -> None:
+    """
+    이벤트 한 건을 기록한다 (버퍼에 넣기만 하고 바로 반환).
+    SCHEMA에 없는 키는 detail(JSON)에 모은다.
+    """
+    writer = get_writer()
+    if writer is None:
+        return
+    row = {"ts": time.time_ns() // 1_000_000, "event": event, "stage": stage, "latency_ms": latency_ms}
+    extra = {}
+    for key, value in fields.items():
+        if key in FIELDS:
+            row[key] = value
+        else:
+            extra[key] = value
+    if extra:
+        row["detail"] = json.dumps(extra, ensure_ascii=False, default=str)
+    writer.record(row)
+
+
+@contextmanager
+def span(event: str, stage: str, **fields):
+    """
+    with span("map", "list", gu=gu) as ev: ... ev["count"] = len(df)
+    블록의 소요 시간과 함께 기록한다. 블록 안에서 dict에 값을 더 넣을 수 있다.
+    예외가 나면 outcome="error"로 기록한다.
+    """
+    start = time.perf_counter()
+    try:
+        yield fields
+    except BaseException:
+        fields["outcome"] = "error"
+        raise
+    finally:
+        record(event, stage, (time.perf_counter() - start) * 1000, **fields)
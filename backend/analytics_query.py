@@ -0,0 +1,140 @@
+# backend/analytics_query.py
+
+from __future__ import annotations
+
+import datetime as dt
+import glob
+import json
+import logging
+import os
+import re
+import sys
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from backend import analytics
+
+logger = logging.getLogger(__name__)
+
+# analytics가 남긴 Parquet 파일 집계: 날짜별 많이 찍은 품목, 정확도 분포, 단계별 지연 시간 백분위수.
+# 파일 이름의 날짜로 읽을 파일을 먼저 고르고, 필요한 컬럼만 읽는다.
+#   python -m backend.analytics_query --days 7
+
+_FILE_DATE = re.compile(r"^events-(\d{8})-")
+
+
+def event_files(
+    since: Optional[dt.date] = None, until: Optional[dt.date] = None, directory: Optional[str] = None
+) -> list[str]:
+    """완성된(닫힌) 이벤트 파일 중 [since, until] 날짜에 해당하는 것."""
+    paths = []
+    for path in sorted(glob.glob(os.path.join(directory or analytics.ANALYTICS_DIR, "events-*.parquet"))):
+        match = _FILE_DATE.match(os.path.basename(path))
+        if not match:
+            continue
+        day = dt.datetime.strptime(match.group(1), "%Y%m%d").date()
+        if (since is None or day >= since) and (until is None or day <= until):
+            paths.append(path)
+    return paths
+
+
+def load_events(
+    since: Optional[dt.date] = None,
+    until: Optional[dt.date] = None,
+    columns: Optional[Iterable[str]] = None,
+    directory: Optional[str] = None,
+) -> pd.DataFrame:
+    """이벤트 DataFrame (date 컬럼 포함, UTC 기준)."""
+    columns = list(columns) if columns is not None else list(analytics.FIELDS)
+    if "ts" not in columns:
+        columns = ["ts"] + columns
+    tables = []
+    for path in event_files(since, until, directory):
+        try:
+            tables.append(pq.read_table(path, columns=columns))
+        except (OSError, pa.ArrowException) as e:
+            logger.warning("사용 기록 파일을 읽지 못했어요 (%s): %s", path, e)
+    if not tables:
+        return pd.DataFrame(columns=columns + ["date"])
+    df = pa.concat_tables(tables).to_pandas()
+    df["date"] = df["ts"].dt.date
+    if since is not None:
+        df = df[df["date"] >= since]
+    if until is not None:
+        df = df[df["date"] <= until]
+    return df.reset_index(drop=True)
+
+
+def daily_top_tags(events: pd.DataFrame, n: int = 10) -> pd.DataFrame:
+    """날짜별 인식 품목 상위 n개 (건수, 서로 다른 이미지 수, 평균 정확도)."""
+    vision = events[(events["stage"] == "vision") & events["tag"].notna()]
+    if vision.empty:
+        return pd.DataFrame(columns=["date", "tag", "count", "images", "mean_probability"])
+    grouped = (
+        vision.groupby(["date", "tag"])
+        .agg(count=("tag", "size"), images=("image_hash", "nunique"), mean_probability=("probability", "mean"))
+        .reset_index()
+        .sort_values(["date", "count", "tag"], ascending=[True, False, True])
+    )
+    return grouped.groupby("date").head(n).reset_index(drop=True)
+
+
+def confidence_histogram(events: pd.DataFrame, bins: int = 10) -> pd.DataFrame:
+    """인식 정확도 분포 (0~1을 bins칸으로)."""
+    p = events.loc[events["stage"] == "vision", "probability"].dropna().to_numpy(dtype=np.float64)
+    counts, edges = np.histogram(p, bins=bins, range=(0.0, 1.0))
+    return pd.DataFrame({"low": edges[:-1].round(3), "high": edges[1:].round(3), "count": counts})
+
+
+def latency_percentiles(
+    events: pd.DataFrame, quantiles: tuple[float, ...] = (0.5, 0.95, 0.99)
+) -> pd.DataFrame:
+    """날짜/이벤트/단계별 지연 시간 백분위수 (ms)."""
+    timed_events = events[events["latency_ms"].notna()]
+    cols = ["date", "event", "stage"]
+    if timed_events.empty:
+        return pd.DataFrame(columns=cols + ["count"] + [f"p{round(q * 100)}_ms" for q in quantiles])
+    grouped = timed_events.groupby(cols)["latency_ms"]
+    out = grouped.size().rename("count").to_frame()
+    for q in quantiles:
+        out[f"p{round(q * 100)}_ms"] = grouped.quantile(q).round(2)
+    return out.reset_index()
+
+
+def summary(days: int = 7, n: int = 10, directory: Optional[str] = None) -> dict:
+    """최근 days일 요약 (API/CLI용)."""
+    since = dt.datetime.now(dt.timezone.utc).date() - dt.timedelta(days=days - 1)
+    events = load_events(since=since, directory=directory)
+
+    def records(df: pd.DataFrame) -> list[dict]:
+        return json.loads(df.to_json(orient="records", force_ascii=False, date_format="iso"))
+
+    if "date" in events.columns:
+        events["date"] = events["date"].astype(str)
+    return {
+        "since": since.isoformat(),
+        "events": int(len(events)),
+        "top_tags": records(daily_top_tags(events, n)),
+        "confidence": records(confidence_histogram(events)),
+        "latency": records(latency_percentiles(events)),
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="사용 기록 요약 (날짜별 상위 품목, 정확도 분포, 지연 시간 백분위수)")
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--dir", default=None, help="이벤트 파일 폴더 (기본: ANALYTICS_DIR)")
+    args = parser.parse_args(argv if argv is not None else sys.argv[1:])
+    print(json.dumps(summary(args.days, args.top, args.dir), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
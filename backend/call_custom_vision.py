@@ -1,10 +1,50 @@
+import hashlib
 import requests
 import os
+import time
+
+from backend.analytics import record
+from backend.limiter import (
+    PRIORITY_INTERACTIVE,
+    UpstreamBusy,
+    UpstreamThrottled,
+    parse_retry_after,
+    vision_limiter,
+)
+from backend.metrics import timed
+from backend.single_flight import SingleFlight
 
 PREDICTION_KEY = os.environ.get("AZURE_CV_PREDICTION_KEY", "")
 ENDPOINT_URL = os.environ.get("AZURE_CV_ENDPOINT", "")
 
-def call_custom_vision(image_data: bytes) -> dict:
+_flight = SingleFlight()
+
+@timed("custom_vision")
+def _post_prediction(url: str, headers: dict, image_data: bytes) -> dict:
+    response = requests.post(url, headers=headers, data=image_data)
+    if response.status_code == 429:
+        raise UpstreamThrottled(parse_retry_after(response.headers.get("Retry-After")))
+    response.raise_for_status()
+    return response.json()
+
+def _predict(url: str, headers: dict, image_data: bytes, priority: int) -> dict:
+    # 동시 호출 수 제한 + 429 시 Retry-After 만큼 쉬었다가 한 번 재시도
+    return vision_limiter.call(_post_prediction, url, headers, image_data, priority=priority)
+
+def call_custom_vision(image_data: bytes, priority: int = PRIORITY_INTERACTIVE) -> dict:
+    start = time.perf_counter()
+    image_key = hashlib.sha256(image_data).hexdigest() if image_data else None
+    result = _call_custom_vision(image_data, image_key, priority)
+    # 사용 기록: 이미지는 남기지 않고 해시만
+    record(
+        "coach", "vision", (time.perf_counter() - start) * 1000,
+        image_hash=image_key,
+        tag=result.get("tag"), probability=result.get("probability"),
+        outcome="error" if "error" in result else "ok",
+    )
+    return result
+
+def _call_custom_vision(image_data: bytes, image_key: str | None, priority: int) -> dict:
     if not image_data:
         return {"error": "이미지 데이터가 비어있습니다."}
     
@@ -19,10 +59,8 @@ def call_custom_vision(image_data: bytes) -> dict:
     }
     
     try:
-        response = requests.post(url, headers=headers, data=image_data)
-        response.raise_for_status()
-
-        result = response.json()
+        # 같은 이미지가 동시에 여러 번 들어오면 업로드/추론은 한 번만
+        result = _flight.do(image_key, _predict, url, headers, image_data, priority)
         
         if result.get('predictions'):
             best_prediction = max(result['predictions'], key=lambda x: x['probability'])
@@ -33,16 +71,20 @@ def call_custom_vision(image_data: bytes) -> dict:
         else:
             return {"error": "Custom Vision이 아무것도 인식하지 못했어요."}
 
+    except UpstreamBusy as e:
+        return {"error": f"지금 이용자가 많아 사진을 분석할 수 없어요. 약 {e.retry_after_s:.0f}초 뒤 다시 시도해 주세요."}
+
     except requests.exceptions.RequestException as e:
         return {"error": f"Custom Vision API 호출 에러: {e}"}
 
 
-try:
-    with open("path/to/your/image.jpg", "rb") as f:
-        sample_image_data = f.read()
-    
-    prediction_result = call_custom_vision(sample_image_data)
-    print(prediction_result)
-    
-except FileNotFoundError:
-    print("예시 이미지 파일을 찾을 수 없습니다. 실제 이미지 경로를 사용해 주세요.")
\ No newline at end of file
+if __name__ == "__main__":
+    try:
+        with open("path/to/your/image.jpg", "rb") as f:
+            sample_image_data = f.read()
+        
+        prediction_result = call_custom_vision(sample_image_data)
+        print(prediction_result)
+        
+    except FileNotFoundError:
+        print("예시 이미지 파일을 찾을 수 없습니다. 실제 이미지 경로를 사용해 주세요.")
\ No newline at end of file
@@ -1,11 +1,26 @@
-from openai import OpenAI
+from openai import OpenAI, RateLimitError
 import os
+import time
 import streamlit as st 
 
+from backend.limiter import (
+    PRIORITY_INTERACTIVE,
+    UpstreamBusy,
+    UpstreamThrottled,
+    llm_limiter,
+    parse_retry_after,
+)
+from backend.analytics import record
+from backend.guide_gate import early_exit
+from backend.guide_prompts import PromptTemplate, get_template, parse_guide, render_guide
+from backend.metrics import counter, timed
+from backend.single_flight import SingleFlight
+
 try:
     AZURE_OPENAI_API_KEY = st.secrets["OPENAI_API_KEY"] 
-except KeyError:
-    AZURE_OPENAI_API_KEY = None
+except (KeyError, FileNotFoundError):
+    # Streamlit 밖(API 서버 등)에서는 secrets.toml 대신 환경 변수 사용
+    AZURE_OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 
 AZURE_OPENAI_ENDPOINT = os.environ.get(
     "AZURE_OPENAI_ENDPOINT",
@@ -13,129 +28,119 @@ AZURE_OPENAI_ENDPOINT = os.environ.get(
 )
 AZURE_OPENAI_DEPLOYMENT = "gpt-4o-mini"
 
+# 키가 없으면 클라이언트를 만들 수 없으므로 None (호출 시 안내 메시지 반환)
+# 429 재시도는 SDK 대신 llm_limiter가 대기열을 다시 거쳐서 처리한다
 client = OpenAI(
     base_url=AZURE_OPENAI_ENDPOINT,
     api_key=AZURE_OPENAI_API_KEY,
-)
+    max_retries=0,
+) if AZURE_OPENAI_API_KEY else None
+
+
+_flight = SingleFlight()
+
+
+_prompt_tokens = counter("openai_prompt_tokens_total", "prompt tokens sent to OpenAI")
+_completion_tokens = counter("openai_completion_tokens_total", "completion tokens received from OpenAI")
+_truncated = counter("openai_truncated_total", "completions cut off by max_tokens")
+
+
+@timed("openai_completion")
+def _create_completion(template: PromptTemplate, user_prompt: str) -> str:
+    kwargs = {}
+    if template.max_tokens is not None:
+        kwargs["max_tokens"] = template.max_tokens
+    if template.structured:
+        kwargs["response_format"] = {"type": "json_object"}
+    try:
+        response = client.chat.completions.create(
+            model=AZURE_OPENAI_DEPLOYMENT,
+            messages=[
+                {"role": "system", "content": template.system},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=0.3, # 설명서이므로 창의성을 낮춤
+            **kwargs,
+        )
+    except RateLimitError as e:
+        raise UpstreamThrottled(parse_retry_after(e.response.headers.get("retry-after"))) from e
+
+    # 호출별 토큰 사용량 (템플릿 버전마다 따로도 집계)
+    usage = response.usage
+    if usage is not None:
+        _prompt_tokens.inc(usage.prompt_tokens)
+        _completion_tokens.inc(usage.completion_tokens)
+        counter(f"openai_prompt_tokens_{template.version}_total").inc(usage.prompt_tokens)
+        counter(f"openai_completion_tokens_{template.version}_total").inc(usage.completion_tokens)
+    choice = response.choices[0]
+    if choice.finish_reason == "length":
+        _truncated.inc()
+    return choice.message.content
+
+
+def _request_guide(template: PromptTemplate, user_prompt: str, priority: int) -> str:
+    # 동시 호출 수 제한 + 429 시 Retry-After 만큼 쉬었다가 한 번 재시도
+    return llm_limiter.call(_create_completion, template, user_prompt, priority=priority)
 
 
 def call_openai_api(
     identified_tag: str,
     confidence: float | None = None,
     lang: str = "ko",
+    priority: int = PRIORITY_INTERACTIVE,
 ) -> str:
+    start = time.perf_counter()
+    guide, outcome = _call_openai_api(identified_tag, confidence, lang, priority)
+    # 사용 기록: 안내 생성 단계 지연 시간과 결과 (local = LLM 없이 답함)
+    record(
+        "coach", "guide", (time.perf_counter() - start) * 1000,
+        tag=identified_tag or None, probability=confidence, lang=lang, outcome=outcome,
+    )
+    return guide
+
+
+def _call_openai_api(
+    identified_tag: str, confidence: float | None, lang: str, priority: int
+) -> tuple[str, str]:
     # 1. API 키 확인
     if not AZURE_OPENAI_API_KEY:
         if lang == "en":
-            return "OpenAI API key is not set. Please check your environment settings."
-        return "OpenAI API Key 환경 변수가 설정되지 않아 정보를 생성할 수 없어요. .env 파일을 확인하세요."
+            return "OpenAI API key is not set. Please check your environment settings.", "skipped"
+        return "OpenAI API Key 환경 변수가 설정되지 않아 정보를 생성할 수 없어요. .env 파일을 확인하세요.", "skipped"
 
     # 2. 태그 확인
     if not identified_tag:
         if lang == "en":
-            return "No item was detected."
-        return "인식된 품목이 없어 분리수거 정보를 제공할 수 없어요."
-
-    # ───────────────── confidence 텍스트 준비 ─────────────────
-    # 프롬프트에 들어갈 정확도 정보를 포맷팅합니다.
-    conf_text_en = ""
-    conf_text_ko = ""
-    if confidence is not None:
-        conf_text_en = f" (Confidence Score: {confidence:.2f})"
-        conf_text_ko = f" (정확도: {confidence:.2f})"
-
-    # ───────────────── 시스템 프롬프트 설정 (핵심 수정 부분) ─────────────────
-    if lang == "en":
-        system_prompt = """
-You are a friendly and professional 'Recycling Coach' following standard Korean recycling guidelines.
-
-# Task
-Analyze the given waste item and its confidence score to provide proper disposal instructions.
-
-# Logic based on Confidence Score
-1. **Low (< 0.6)**: 
-   - The image is unclear. Apologize and ask the user to retake the photo. 
-   - **DO NOT** provide recycling steps.
-   - Message: "Sorry, I can't clearly identify the item. 😥 Could you take a closer picture?"
-2. **Medium (0.6 ~ 0.85)**: 
-   - Unsure. Ask "Is this [Item Name]?" first. 
-   - If yes, provide the recycling guide below.
-3. **High (>= 0.85)**: 
-   - Confident. Say "This is [Item Name]! 🙆‍♂️" and provide the recycling guide immediately.
-
-# Output Format (Recycling Guide)
-If the score is high enough to provide a guide, use this Markdown format:
-
-## 🗑️ [Item Name] Disposal Guide
-* **Empty/Rinse 🚿**: (Instructions on emptying and washing)
-* **Remove/Separate ✂️**: (Instructions on removing labels, caps, etc.)
-* **Crush/Compress 🦶**: (Instructions on reducing volume)
-* **Disposal Location 📦**: (Where to put it: e.g., Transparent PET bin, General waste)
-
-# Constraints
-- Respond in Markdown.
-- Use emojis to make it friendly.
-"""
-        user_prompt = (
-            f"Item: '{identified_tag}'{conf_text_en}. "
-            "Provide the recycling guide based on the confidence score."
-        )
+            return "No item was detected.", "skipped"
+        return "인식된 품목이 없어 분리수거 정보를 제공할 수 없어요.", "skipped"
 
-    else:
-        # 한국어 프롬프트
-        system_prompt = """
-당신은 대한민국 환경부 지침을 따르는 '친절하고 꼼꼼한 분리배출 코치'입니다.
-
-# 임무
-사용자가 제공한 쓰레기 품목(Item)과 정확도(Confidence)를 분석하여 상황에 맞는 답변을 하세요.
-
-# 정확도(Confidence)별 대응 로직
-1. 낮음 (0.6 미만):
-   - 행동: 분리배출 방법을 안내하지 마세요.
-   - 메시지: "죄송합니다, 사진이 흔들렸거나 잘 보이지 않아 판단하기 어렵네요. 😥 물체가 잘 보이도록 다시 찍어주시겠어요?"
-
-2. 중간 (0.6 이상 ~ 0.85 미만):
-   - 행동: 추측이 맞는지 먼저 물어보세요.
-   - 메시지: "혹시 이 물건이 [한국어 분류명] 맞나요? 🤔 맞다면 아래 방법대로 배출해 주세요!" (이후 가이드 출력)
-
-3. 높음 (0.85 이상):
-   - 행동: 확신을 가지고 바로 안내하세요.
-   - 메시지: "이건 [한국어 분류명] 입니다! 🙆‍♂️ 이렇게 분리배출 하시면 완벽합니다." (이후 가이드 출력)
-
-# 배출 가이드 출력 양식 (Markdown)
-안내 시에는 반드시 아래 목차를 사용하여 구체적인 행동을 지시하세요.
-
-## 🗑️ [한국어 분류] 배출 가이드
- 비우기/헹구기 🚿: (내용물을 비우고 물로 씻어야 하는지 설명)
- 분리하기 ✂️: (라벨, 뚜껑, 테이프 등 다른 재질 제거 여부)
- 부피 줄이기 🦶: (찌그러뜨리거나 접어서 부피를 줄이는 방법)
- 배출 장소 📦: (투명 페트병 전용, 캔류, 일반쓰레기 등 배출 위치)
-
-# 제약 사항
-- 입력된 품목 명(tag)이 영어라면 한국어로 자연스럽게 번역하세요 (예: cardboard -> 골판지 박스).
-- 사용자가 헷갈릴 만한 부분(예: 씻어도 얼룩진 컵라면 용기 등)은 '💡 꿀팁'으로 한 줄 덧붙여주세요.
-
-# [책임감 있는 AI - 공정성 원칙 적용]
-1. 재질 중심 분석: 쓰레기의 브랜드(고가/저가)나 외관의 낡음 정도에 따라 차별적인 어조를 사용하지 마세요. 오직 '재질'과 '배출 방법'에만 집중하여 공평하게 정보를 제공하세요.
-2. 편향 방지: 특정 지역이나 계층에서만 사용하는 용어보다는, 누구나 이해할 수 있는 표준어를 사용하세요.
-"""
-        user_prompt = (
-            f"분리수거 품목: '{identified_tag}'{conf_text_ko}. "
-            "이 정보와 정확도를 바탕으로 가이드를 제공해주세요."
-        )
+    # 3. 정확도가 품목별 기준보다 낮거나 고정 안내가 있는 품목이면 LLM 없이 바로 답한다
+    local = early_exit(identified_tag, confidence, lang)
+    if local is not None:
+        return local, "local"
+
+    # ───────────────── 프롬프트 템플릿 ─────────────────
+    # 버전별 템플릿(backend/guide_prompts.py)에서 시스템/사용자 프롬프트를 만든다
+    template = get_template(lang)
+    user_prompt = template.format_user(identified_tag, confidence)
 
     try:
-        response = client.chat.completions.create(
-            model=AZURE_OPENAI_DEPLOYMENT,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.3, # 설명서이므로 창의성을 낮춤
+        # 같은 품목/정확도/언어의 요청이 동시에 몰리면 LLM 호출은 한 번만
+        content = _flight.do(
+            (template.version, lang, user_prompt), _request_guide, template, user_prompt, priority
         )
-        return response.choices[0].message.content
+        if not template.structured:
+            return content, "llm"
+        # JSON 응답을 로컬에서 Markdown으로 렌더링
+        return render_guide(parse_guide(content), lang, fallback_item=identified_tag), "llm"
+
+    except UpstreamBusy as e:
+        # 타임아웃까지 기다리게 하지 않고 바로 안내
+        if lang == "en":
+            return f"⏳ Too many people are asking right now. Please try again in about {e.retry_after_s:.0f}s.", "busy"
+        return f"⏳ 지금 이용자가 많아 안내를 만들 수 없어요. 약 {e.retry_after_s:.0f}초 뒤 다시 시도해 주세요.", "busy"
 
     except Exception as e:
         if lang == "en":
-            return f"❌ OpenAI API call error: {e}"
-        return f"❌ OpenAI API 호출 에러: {e}"
\ No newline at end of file
+            return f"❌ OpenAI API call error: {e}", "error"
+        return f"❌ OpenAI API 호출 에러: {e}", "error"
\ No newline at end of file
@@ -0,0 +1,400 @@
+# backend/csv_schema.py
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from backend import ROOT_DIR
+from backend.metrics import counter
+from backend.seoul_districts import assign_gu
+
+logger = logging.getLogger(__name__)
+
+# 자치구마다 조금씩 다른 CSV 형식을 자동으로 맞추는 스키마 레지스트리.
+#
+# 1) 헤더 이름을 정규화(공백/괄호 안 설명 제거, 소문자)해서 필드별 별칭과 맞춘다.
+# 2) 좌표 컬럼은 이름으로 못 찾으면 표본 행의 값 범위로 찾는다.
+# 3) 좌표계는 등록된 후보(WGS84, 한국 TM 좌표계들)로 표본을 변환해 보고
+#    서울 자치구 경계 안에 가장 많이 들어오는 것을 고른다 (같으면 등록 순서).
+# 4) 고른 스키마는 파일 내용 해시별로 SCHEMA_CACHE_DIR에 JSON으로 남겨서
+#    같은 파일을 다시 읽을 때는 분석을 건너뛴다.
+#
+# 새 별칭/좌표계는 register_alias() / register_crs()로 코드 수정 없이 추가할 수 있다.
+
+# 감지 로직이 바뀌면 올린다 (예전 캐시를 쓰지 않게)
+REGISTRY_VERSION = 1
+
+SCHEMA_CACHE_DIR = os.environ.get("SCHEMA_CACHE_DIR", str(ROOT_DIR / "build" / "schemas"))
+
+# 좌표계 판정에 쓰는 표본 행 수
+SAMPLE_ROWS = 200
+# 표본 중 이 비율 이상이 서울 안에 들어와야 좌표계로 인정
+MIN_INSIDE_RATIO = 0.5
+
+FIELDS = ("gu", "name", "road_address", "jibun_address", "lat", "lng", "detail", "type")
+
+# 필드 → 헤더 별칭 (정규화한 이름 기준으로 비교하므로 공백/괄호 설명은 신경 쓰지 않아도 된다)
+FIELD_ALIASES: dict[str, list[str]] = {
+    "gu": ["시군구명", "자치구명", "구명", "자치구", "시군구", "district", "gu"],
+    "name": ["설치장소명", "휴지통설치장소", "설치 장소명", "설치장소", "장소명", "명칭", "name"],
+    "road_address": ["소재지도로명주소", "도로명주소", "도로명", "road_address"],
+    "jibun_address": ["소재지지번주소", "지번주소", "지번", "jibun_address"],
+    "lat": ["위도", "Y좌표", "latitude", "lat", "y"],
+    "lng": ["경도", "X좌표", "longitude", "lng", "lon", "x"],
+    "detail": ["상세위치", "세부위치", "비고", "설치위치", "detail"],
+    "type": ["휴지통종류", "용도구분", "종류", "구분", "type"],
+}
+
+_detected = counter("csv_schema_detect_total", "CSV schemas profiled (cache misses)")
+_cached = counter("csv_schema_cache_hit_total", "CSV schemas reused from the file-hash cache")
+
+
+def normalize_header(name: str) -> str:
+    """헤더 비교용: BOM/공백 제거, 괄호 안 설명 제거, 소문자."""
+    name = str(name).replace("﻿", "")
+    name = re.sub(r"\(.*?\)|\[.*?\]", "", name)
+    return re.sub(r"\s+", "", name).lower()
+
+
+def register_alias(field_name: str, *aliases: str) -> None:
+    """필드에 헤더 별칭을 추가한다 (앞에 추가할수록 우선)."""
+    if field_name not in FIELD_ALIASES:
+        raise ValueError(f"알 수 없는 필드예요: {field_name}")
+    FIELD_ALIASES[field_name][:0] = list(aliases)
+
+
+# ---- 좌표계 ----
+
+@dataclass(frozen=True)
+class Ellipsoid:
+    a: float
+    f: float
+
+    @property
+    def e2(self) -> float:
+        return self.f * (2 - self.f)
+
+
+GRS80 = Ellipsoid(6378137.0, 1 / 298.257222101)
+BESSEL = Ellipsoid(6377397.155, 1 / 299.1528128)
+
+
+@dataclass(frozen=True)
+class CrsSpec:
+    """
+    좌표계 하나. kind="geographic"이면 (경도, 위도) 그대로,
+    "tm"이면 횡메르카토르 역변환 후 필요하면 7변수 Helmert로 WGS84 변환.
+    """
+
+    code: str
+    kind: str
+    # 표본 값이 이 범위 안이어야 후보로 본다: (x_min, x_max, y_min, y_max)
+    bounds: tuple[float, float, float, float]
+    ellipsoid: Ellipsoid = GRS80
+    lat0: float = 0.0
+    lon0: float = 0.0
+    k0: float = 1.0
+    false_easting: float = 0.0
+    false_northing: float = 0.0
+    # WGS84로의 Helmert 변수 (tx, ty, tz m, rx, ry, rz 초, ds ppm; position vector). None이면 변환 없음
+    to_wgs84: Optional[tuple[float, ...]] = None
+
+
+def _meridian_arc(phi: np.ndarray, ell: Ellipsoid) -> np.ndarray:
+    e2 = ell.e2
+    e4, e6 = e2 * e2, e2 * e2 * e2
+    return ell.a * (
+        (1 - e2 / 4 - 3 * e4 / 64 - 5 * e6 / 256) * phi
+        - (3 * e2 / 8 + 3 * e4 / 32 + 45 * e6 / 1024) * np.sin(2 * phi)
+        + (15 * e4 / 256 + 45 * e6 / 1024) * np.sin(4 * phi)
+        - (35 * e6 / 3072) * np.sin(6 * phi)
+    )
+
+
+def _inverse_tm(x: np.ndarray, y: np.ndarray, crs: CrsSpec) -> tuple[np.ndarray, np.ndarray]:
+    """횡메르카토르 (x=동향, y=북향) → (위도, 경도) 도 (Snyder 공식, 벡터 연산)."""
+    ell = crs.ellipsoid
+    e2 = ell.e2
+    ep2 = e2 / (1 - e2)
+    m = _meridian_arc(np.radians(crs.lat0), ell) + (y - crs.false_northing) / crs.k0
+    mu = m / (ell.a * (1 - e2 / 4 - 3 * e2**2 / 64 - 5 * e2**3 / 256))
+    e1 = (1 - math.sqrt(1 - e2)) / (1 + math.sqrt(1 - e2))
+    phi1 = (
+        mu
+        + (3 * e1 / 2 - 27 * e1**3 / 32) * np.sin(2 * mu)
+        + (21 * e1**2 / 16 - 55 * e1**4 / 32) * np.sin(4 * mu)
+        + (151 * e1**3 / 96) * np.sin(6 * mu)
+        + (1097 * e1**4 / 512) * np.sin(8 * mu)
+    )
+    sin1, cos1, tan1 = np.sin(phi1), np.cos(phi1), np.tan(phi1)
+    c1 = ep2 * cos1**2
+    t1 = tan1**2
+    n1 = ell.a / np.sqrt(1 - e2 * sin1**2)
+    r1 = ell.a * (1 - e2) / (1 - e2 * sin1**2) ** 1.5
+    d = (x - crs.false_easting) / (n1 * crs.k0)
+
+    lat = phi1 - (n1 * tan1 / r1) * (
+        d**2 / 2
+        - (5 + 3 * t1 + 10 * c1 - 4 * c1**2 - 9 * ep2) * d**4 / 24
+        + (61 + 90 * t1 + 298 * c1 + 45 * t1**2 - 252 * ep2 - 3 * c1**2) * d**6 / 720
+    )
+    lon = np.radians(crs.lon0) + (
+        d
+        - (1 + 2 * t1 + c1) * d**3 / 6
+        + (5 - 2 * c1 + 28 * t1 - 3 * c1**2 + 8 * ep2 + 24 * t1**2) * d**5 / 120
+    ) / cos1
+    return np.degrees(lat), np.degrees(lon)
+
+
+def _helmert_to_wgs84(
+    lat: np.ndarray, lng: np.ndarray, ell: Ellipsoid, params: tuple[float, ...]
+) -> tuple[np.ndarray, np.ndarray]:
+    """다른 타원체의 (위도, 경도) → WGS84 (지심 좌표에서 7변수 변환)."""
+    tx, ty, tz, rx, ry, rz, ds = params
+    rx, ry, rz = (math.radians(r / 3600) for r in (rx, ry, rz))
+    s = 1 + ds * 1e-6
+
+    phi, lam = np.radians(lat), np.radians(lng)
+    n = ell.a / np.sqrt(1 - ell.e2 * np.sin(phi) ** 2)
+    x = n * np.cos(phi) * np.cos(lam)
+    y = n * np.cos(phi) * np.sin(lam)
+    z = n * (1 - ell.e2) * np.sin(phi)
+
+    x2 = tx + s * (x - rz * y + ry * z)
+    y2 = ty + s * (rz * x + y - rx * z)
+    z2 = tz + s * (-ry * x + rx * y + z)
+
+    # 지심 좌표 → WGS84 위경도 (반복 몇 번이면 mm 단위로 수렴)
+    wgs = GRS80
+    p = np.hypot(x2, y2)
+    phi = np.arctan2(z2, p * (1 - wgs.e2))
+    for _ in range(4):
+        n = wgs.a / np.sqrt(1 - wgs.e2 * np.sin(phi) ** 2)
+        phi = np.arctan2(z2 + wgs.e2 * n * np.sin(phi), p)
+    return np.degrees(phi), np.degrees(np.arctan2(y2, x2))
+
+
+def to_wgs84(x, y, crs: CrsSpec) -> tuple[np.ndarray, np.ndarray]:
+    """(x, y) 배열 → (위도, 경도) 배열. x는 경도/동향, y는 위도/북향."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if crs.kind == "geographic":
+        return y, x
+    lat, lng = _inverse_tm(x, y, crs)
+    if crs.to_wgs84 is not None:
+        lat, lng = _helmert_to_wgs84(lat, lng, crs.ellipsoid, crs.to_wgs84)
+    return lat, lng
+
+
+# 등록 순서가 곧 우선순위 (표본이 여러 좌표계에서 똑같이 서울 안이면 앞의 것).
+# EPSG:5181과 5174는 값 범위가 같아 값만으로는 구분이 안 되므로(약 300 m 차이) 5181이 이긴다.
+# Bessel 자료라면 register_crs 순서를 바꾸거나 스키마 캐시 JSON의 crs를 고쳐 쓰면 된다.
+CRS_REGISTRY: dict[str, CrsSpec] = {}
+
+
+def register_crs(crs: CrsSpec) -> None:
+    CRS_REGISTRY[crs.code] = crs
+
+
+# 서울 근처 값 범위 (넉넉하게)
+_TM_CENTRAL = dict(lat0=38.0, lon0=127.0, k0=1.0, false_easting=200_000.0)
+_KOREAN_1985 = (-115.80, 474.99, 674.11, 1.16, -2.31, -1.63, 6.43)
+
+for _crs in (
+    CrsSpec("EPSG:4326", "geographic", (124.0, 132.0, 33.0, 39.0)),
+    # Korea 2000 / Central Belt 2010 (도로명주소 등 최근 공공데이터)
+    CrsSpec("EPSG:5186", "tm", (150_000, 250_000, 520_000, 590_000), false_northing=600_000.0, **_TM_CENTRAL),
+    # Korea 2000 / Unified CS (UTM-K, 네이버 지도 등)
+    CrsSpec("EPSG:5179", "tm", (900_000, 1_000_000, 1_920_000, 1_990_000),
+            lat0=38.0, lon0=127.5, k0=0.9996, false_easting=1_000_000.0, false_northing=2_000_000.0),
+    # Korea 2000 / Central Belt
+    CrsSpec("EPSG:5181", "tm", (150_000, 250_000, 420_000, 490_000), false_northing=500_000.0, **_TM_CENTRAL),
+    # Korean 1985 / Modified Central Belt (Bessel, 예전 지자체 자료)
+    CrsSpec("EPSG:5174", "tm", (150_000, 250_000, 420_000, 490_000), ellipsoid=BESSEL,
+            lat0=38.0, lon0=127.0028902777778, k0=1.0, false_easting=200_000.0, false_northing=500_000.0,
+            to_wgs84=_KOREAN_1985),
+):
+    register_crs(_crs)
+
+
+# ---- 스키마 ----
+
+@dataclass(frozen=True)
+class CsvSchema:
+    # 필드 → 원본 컬럼 이름 (없는 필드는 빠진다)
+    columns: dict[str, str]
+    crs: str
+    # 원본에서 x(경도/동향), y(위도/북향)로 쓴 컬럼
+    x_col: str
+    y_col: str
+    # 표본 중 서울 안에 들어온 비율 (참고용)
+    inside_ratio: float = 1.0
+    version: int = REGISTRY_VERSION
+    notes: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CsvSchema":
+        return cls(**data)
+
+
+def _numeric(sample: pd.DataFrame, col: str) -> np.ndarray:
+    return pd.to_numeric(sample[col], errors="coerce").to_numpy(dtype=np.float64)
+
+
+def _match_columns(columns: list[str]) -> dict[str, str]:
+    """헤더 이름 → 필드 매핑 (별칭 앞쪽이 우선, 한 컬럼은 한 필드에만)."""
+    by_norm: dict[str, str] = {}
+    for col in columns:
+        by_norm.setdefault(normalize_header(col), col)
+    mapping: dict[str, str] = {}
+    used: set[str] = set()
+    for field_name in FIELDS:
+        for alias in FIELD_ALIASES[field_name]:
+            col = by_norm.get(normalize_header(alias))
+            if col is not None and col not in used:
+                mapping[field_name] = col
+                used.add(col)
+                break
+    return mapping
+
+
+def _inside_ratio(lat: np.ndarray, lng: np.ndarray) -> float:
+    ok = ~(np.isnan(lat) | np.isnan(lng))
+    if not ok.any():
+        return 0.0
+    gu = assign_gu(lat[ok], lng[ok])
+    return float((gu != None).sum()) / int(ok.sum())  # noqa: E711
+
+
+def _coordinate_candidates(sample: pd.DataFrame, mapping: dict[str, str]) -> list[tuple[str, str]]:
+    """(x 컬럼, y 컬럼) 후보. 이름으로 찾은 쌍을 먼저, 그다음 값이 숫자인 컬럼 쌍 전부 (양방향)."""
+    pairs: list[tuple[str, str]] = []
+    if "lng" in mapping and "lat" in mapping:
+        pairs += [(mapping["lng"], mapping["lat"]), (mapping["lat"], mapping["lng"])]
+    numeric_cols = [
+        c for c in sample.columns
+        if pd.to_numeric(sample[c], errors="coerce").notna().mean() >= MIN_INSIDE_RATIO
+    ]
+    for a in numeric_cols:
+        for b in numeric_cols:
+            if a != b and (a, b) not in pairs:
+                pairs.append((a, b))
+    return pairs
+
+
+def detect_schema(sample: pd.DataFrame) -> CsvSchema:
+    """
+    헤더와 표본 행으로 컬럼 매핑과 좌표계를 고른다.
+    서울 안에 들어오는 좌표 컬럼/좌표계를 찾지 못하면 ValueError.
+    """
+    _detected.inc()
+    sample = sample.head(SAMPLE_ROWS)
+    mapping = _match_columns([str(c) for c in sample.columns])
+
+    best: Optional[tuple[float, str, str, str]] = None
+    for x_col, y_col in _coordinate_candidates(sample, mapping):
+        x, y = _numeric(sample, x_col), _numeric(sample, y_col)
+        x_med, y_med = np.nanmedian(x), np.nanmedian(y)
+        for crs in CRS_REGISTRY.values():
+            x_min, x_max, y_min, y_max = crs.bounds
+            if not (x_min <= x_med <= x_max and y_min <= y_med <= y_max):
+                continue
+            ratio = _inside_ratio(*to_wgs84(x, y, crs))
+            if best is None or ratio > best[0]:
+                best = (ratio, crs.code, x_col, y_col)
+        # 이름으로 찾은 쌍에서 충분히 맞으면 나머지 컬럼 조합은 보지 않는다
+        if best is not None and best[0] >= 0.99:
+            break
+
+    if best is None or best[0] < MIN_INSIDE_RATIO:
+        raise ValueError("위도/경도 컬럼을 찾을 수 없어요. CSV 컬럼명을 확인해 주세요.")
+
+    ratio, crs_code, x_col, y_col = best
+    notes = []
+    if (mapping.get("lng"), mapping.get("lat")) != (x_col, y_col):
+        notes.append(f"좌표 컬럼을 값으로 판정: x={x_col}, y={y_col}")
+    # 좌표로 쓴 컬럼은 다른 필드에서 뺀다
+    mapping = {k: v for k, v in mapping.items() if k not in ("lat", "lng") and v not in (x_col, y_col)}
+    return CsvSchema(columns=mapping, crs=crs_code, x_col=x_col, y_col=y_col,
+                     inside_ratio=round(ratio, 4), notes=notes)
+
+
+def apply_schema(df: pd.DataFrame, schema: CsvSchema) -> pd.DataFrame:
+    """원본 DataFrame → 표준 컬럼(FIELDS) DataFrame. 좌표는 WGS84 위경도로 변환한다."""
+    crs = CRS_REGISTRY.get(schema.crs)
+    if crs is None:
+        raise ValueError(f"등록되지 않은 좌표계예요: {schema.crs}")
+    for col in (schema.x_col, schema.y_col, *schema.columns.values()):
+        if col not in df.columns:
+            raise ValueError(f"CSV에 '{col}' 컬럼이 없어요. 스키마를 다시 확인해 주세요.")
+
+    lat, lng = to_wgs84(_numeric(df, schema.x_col), _numeric(df, schema.y_col), crs)
+    # 컬럼은 복사 없이 이름만 바꿔서 가져온다 (문자열 컬럼 dtype 유지)
+    out = df[list(schema.columns.values())].set_axis(list(schema.columns), axis=1)
+    for f in FIELDS:
+        if f not in out.columns:
+            out[f] = None
+    out = out[list(FIELDS)]
+    out["lat"] = lat
+    out["lng"] = lng
+    return out
+
+
+# ---- 파일 해시별 캐시 ----
+
+_cache_lock = threading.Lock()
+_memory_cache: dict[str, CsvSchema] = {}
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def _cache_path(digest: str) -> str:
+    return os.path.join(SCHEMA_CACHE_DIR, f"v{REGISTRY_VERSION}-{digest}.json")
+
+
+def schema_for(digest: str, sample: Callable[[], pd.DataFrame]) -> CsvSchema:
+    """
+    파일 내용 해시에 해당하는 스키마. 메모리 → 디스크(JSON) 캐시 순으로 찾고,
+    없으면 sample()로 표본을 받아 분석한 뒤 저장한다.
+    """
+    with _cache_lock:
+        schema = _memory_cache.get(digest)
+    if schema is not None:
+        _cached.inc()
+        return schema
+
+    path = _cache_path(digest)
+    try:
+        with open(path, encoding="utf-8") as f:
+            schema = CsvSchema.from_dict(json.load(f))
+        _cached.inc()
+    except (OSError, ValueError, TypeError):
+        schema = detect_schema(sample())
+        try:
+            os.makedirs(SCHEMA_CACHE_DIR, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(schema.to_dict(), f, ensure_ascii=False, indent=2)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning("CSV 스키마 캐시를 저장하지 못했어요: %s", e)
+
+    with _cache_lock:
+        _memory_cache[digest] = schema
+    return schema
@@ -0,0 +1,292 @@
+# backend/data_quality.py
+
+from __future__ import annotations
+
+import glob
+import json
+import logging
+import math
+import os
+import sys
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from backend import ROOT_DIR
+from backend.metrics import counter
+from backend.seoul_districts import assign_gu
+
+logger = logging.getLogger(__name__)
+
+# 적재 단계의 좌표 검증 + 중복 제거.
+#   1) 숫자가 아닌/빈 좌표 제거
+#   2) 서울 경계 밖인데 위도/경도를 바꾸면 안에 들어가는 행은 바꿔서 살린다
+#   3) 그래도 자치구 경계 밖이면 제거
+#   4) 종류(type)/이름/상세위치가 같은(대소문자, 공백, 기호 차이는 무시) 휴지통이 DEDUP_RADIUS_M 이내에
+#      또 있으면 먼저 나온 것만 남긴다. 격자 해시로 이웃 칸끼리만 비교하므로 O(n)이다.
+#      원본에는 이름/상세위치가 다른데 좌표가 똑같은 행(주소 지오코딩 결과를 그대로 쓴 경우)이나
+#      "OO길 (1)", "OO길 (2)"처럼 번호를 붙인 여러 개의 휴지통이 많아서, 위치만으로 지우면
+#      실제 다른 휴지통이 사라진다. 그래서 설명까지 같은 행만 중복으로 본다.
+# 파일마다 결과를 QualityReport(JSON)로 QUALITY_REPORT_DIR에 남긴다.
+
+DEDUP_RADIUS_M = float(os.environ.get("DEDUP_RADIUS_M", "3"))
+QUALITY_REPORT_DIR = os.environ.get("QUALITY_REPORT_DIR", str(ROOT_DIR / "build" / "quality"))
+
+# 보고서에 남길 예시 행 수
+SAMPLE_ROWS = 20
+
+METERS_PER_DEG_LAT = 111_320.0
+
+_dropped = counter("ingest_rows_dropped_total", "rows dropped by ingest validation")
+_swapped = counter("ingest_coords_swapped_total", "rows with lat/lng swapped back at ingest")
+
+
+@dataclass
+class QualityReport:
+    source: str
+    rows_in: int = 0
+    rows_out: int = 0
+    missing_coords: int = 0
+    swapped_coords: int = 0
+    outside_seoul: int = 0
+    near_duplicates: int = 0
+    dedup_radius_m: float = DEDUP_RADIUS_M
+    # 예시 (행 번호는 원본 CSV 기준, 0부터)
+    swapped_rows: list[int] = field(default_factory=list)
+    outside_rows: list[int] = field(default_factory=list)
+    duplicates: list[dict] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _distances_m(lat1, lng1, lat2, lng2) -> np.ndarray:
+    # 수 m 단위 비교라 등장방형 근사로 충분하다
+    dy = (lat2 - lat1) * METERS_PER_DEG_LAT
+    dx = (lng2 - lng1) * METERS_PER_DEG_LAT * np.cos(np.radians((lat1 + lat2) / 2))
+    return np.hypot(dx, dy)
+
+
+def fix_coordinates(df: pd.DataFrame, report: QualityReport) -> pd.DataFrame:
+    """좌표를 숫자로 바꾸고, 뒤바뀐 위도/경도를 바로잡고, 서울 밖 행을 뺀 뒤 gu를 채운다."""
+    lat = pd.to_numeric(df["lat"], errors="coerce").to_numpy(dtype=np.float64, copy=True)
+    lng = pd.to_numeric(df["lng"], errors="coerce").to_numpy(dtype=np.float64, copy=True)
+
+    valid = ~(np.isnan(lat) | np.isnan(lng))
+    report.missing_coords = int((~valid).sum())
+
+    gu = np.full(len(df), None, dtype=object)
+    gu[valid] = assign_gu(lat[valid], lng[valid])
+
+    # 경계 밖인 행만 위도/경도를 바꿔서 다시 판정 (assign_gu는 밖이면 None)
+    retry = np.flatnonzero(valid & (gu == None))  # noqa: E711 - object 배열 원소별 비교
+    if len(retry):
+        swapped_gu = assign_gu(lng[retry], lat[retry])
+        hit = swapped_gu != None  # noqa: E711
+        rows = retry[hit]
+        lat[rows], lng[rows] = lng[rows].copy(), lat[rows].copy()
+        gu[rows] = swapped_gu[hit]
+        report.swapped_coords = int(len(rows))
+        report.swapped_rows = rows[:SAMPLE_ROWS].tolist()
+
+    outside = valid & (gu == None)  # noqa: E711
+    report.outside_seoul = int(outside.sum())
+    report.outside_rows = np.flatnonzero(outside)[:SAMPLE_ROWS].tolist()
+
+    df = df.assign(lat=lat, lng=lng, gu=gu)
+    keep = valid & ~outside
+    return df if keep.all() else df[keep]
+
+
+def near_pairs(
+    lat: np.ndarray,
+    lng: np.ndarray,
+    radius_m: float = DEDUP_RADIUS_M,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    radius_m 이내인 행 쌍 (i < j)과 거리.
+    radius_m 크기 격자 칸 번호를 정수 하나로 묶어 정렬해 두고,
+    자기 칸 + 이웃 칸 절반(4칸)만 searchsorted로 찾아 비교한다.
+    """
+    n = len(lat)
+    empty = np.empty(0, dtype=np.int64)
+    if n < 2 or radius_m <= 0:
+        return empty, empty, np.empty(0)
+
+    lat_step = radius_m / METERS_PER_DEG_LAT
+    lng_step = lat_step / math.cos(math.radians(float(np.mean(lat))))
+    y = np.floor(lat / lat_step).astype(np.int64)
+    x = np.floor(lng / lng_step).astype(np.int64)
+    # 이웃 칸(±1)이 음수/자리 넘침이 되지 않도록 1칸 여유를 둔다
+    y -= y.min() - 1
+    x -= x.min() - 1
+    width = int(x.max()) + 2
+    cell = y * width + x
+
+    order = np.argsort(cell, kind="stable")
+    sorted_cell = cell[order]
+
+    left_parts, right_parts = [], []
+    for dy, dx in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+        # 찾을 값도 정렬된 상태로 넘겨야 searchsorted가 빠르다
+        target = sorted_cell + (dy * width + dx)
+        lo = np.searchsorted(sorted_cell, target, side="left")
+        hi = np.searchsorted(sorted_cell, target, side="right")
+        count = hi - lo
+        if not count.any():
+            continue
+        i = order[np.repeat(np.arange(n), count)]
+        offset = np.arange(int(count.sum())) - np.repeat(np.cumsum(count) - count, count)
+        j = order[np.repeat(lo, count) + offset]
+        if (dy, dx) == (0, 0):
+            keep = i < j
+            i, j = i[keep], j[keep]
+        left_parts.append(np.minimum(i, j))
+        right_parts.append(np.maximum(i, j))
+
+    if not left_parts:
+        return empty, empty, np.empty(0)
+    i = np.concatenate(left_parts)
+    j = np.concatenate(right_parts)
+    dist = _distances_m(lat[i], lng[i], lat[j], lng[j])
+    close = dist <= radius_m
+    return i[close], j[close], dist[close]
+
+
+def duplicate_roots(n: int, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    """쌍으로 이어진 행들을 묶어, 각 행이 속한 묶음의 가장 앞 행 번호를 돌려준다."""
+    root = np.arange(n)
+    while len(i):
+        lo = np.minimum(root[i], root[j])
+        new = root.copy()
+        np.minimum.at(new, i, lo)
+        np.minimum.at(new, j, lo)
+        new = new[new]  # 경로 압축
+        if np.array_equal(new, root):
+            break
+        root = new
+    return root
+
+
+def text_keys(values: pd.Series) -> pd.Series:
+    """중복 판정용 문자열: 소문자로 바꾸고 공백/기호를 뺀다 (숫자는 남긴다)."""
+    key = values.astype("string").fillna("").str.lower()
+    return key.str.replace(r"[^0-9a-z가-힣]", "", regex=True)
+
+
+def drop_near_duplicates(
+    df: pd.DataFrame,
+    report: QualityReport,
+    radius_m: float = DEDUP_RADIUS_M,
+) -> pd.DataFrame:
+    """종류/이름/상세위치가 같은 휴지통이 radius_m 이내에 겹쳐 있으면 먼저 나온 행만 남긴다."""
+    if len(df) < 2:
+        return df
+    lat = df["lat"].to_numpy(dtype=np.float64)
+    lng = df["lng"].to_numpy(dtype=np.float64)
+    i, j, dist = near_pairs(lat, lng, radius_m)
+    if not len(i):
+        return df
+
+    # 가까운 쌍에 대해서만 문자열 비교 (전체 행의 문자열 정규화는 비싸다)
+    involved = np.unique(np.concatenate([i, j]))
+    same = np.ones(len(i), dtype=bool)
+    for col in ("type", "name", "detail"):
+        keys = pd.Series(text_keys(df[col].iloc[involved]).to_numpy(), index=involved)
+        same &= keys.loc[i].to_numpy() == keys.loc[j].to_numpy()
+    i, j, dist = i[same], j[same], dist[same]
+    if not len(i):
+        return df
+
+    root = duplicate_roots(len(df), i, j)
+    keep = root == np.arange(len(df))
+    report.near_duplicates = int((~keep).sum())
+
+    rows = df.index.to_numpy()
+    names = df["name"]
+    report.duplicates = [
+        {
+            "kept_row": int(rows[root[b]]),
+            "dropped_row": int(rows[b]),
+            "distance_m": round(float(d), 2),
+            "kept_name": str(names.iat[root[b]]),
+            "dropped_name": str(names.iat[b]),
+        }
+        for b, d in zip(j[:SAMPLE_ROWS].tolist(), dist[:SAMPLE_ROWS].tolist())
+    ]
+    return df[keep]
+
+
+def validate_frame(df: pd.DataFrame, source: str = "") -> tuple[pd.DataFrame, QualityReport]:
+    """
+    lat/lng/name/type/detail 컬럼이 있는 DataFrame을 검증한다.
+    반환하는 DataFrame의 index는 원본 행 번호 그대로다 (보고서의 행 번호와 같음).
+    """
+    report = QualityReport(source=source, rows_in=len(df))
+    df = fix_coordinates(df, report)
+    df = drop_near_duplicates(df, report)
+    report.rows_out = len(df)
+
+    _dropped.inc(report.rows_in - report.rows_out)
+    _swapped.inc(report.swapped_coords)
+    return df, report
+
+
+# ---- 보고서 저장 / 조회 ----
+
+def _report_path(source: str) -> str:
+    return os.path.join(QUALITY_REPORT_DIR, f"{source or 'unknown'}.json")
+
+
+def write_report(report: QualityReport) -> None:
+    """출처별 보고서를 JSON으로 저장 (실패해도 적재는 계속)."""
+    path = _report_path(report.source)
+    try:
+        os.makedirs(QUALITY_REPORT_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning("품질 보고서를 저장하지 못했어요 (%s): %s", report.source, e)
+
+
+def load_reports(sources: Optional[list[str]] = None) -> list[dict]:
+    """저장된 보고서들 (sources를 주면 그 출처만)."""
+    if sources is not None:
+        paths = [_report_path(s) for s in sources]
+    else:
+        paths = sorted(glob.glob(os.path.join(QUALITY_REPORT_DIR, "*.json")))
+    reports = []
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as f:
+                reports.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return reports
+
+
+def summarize(reports: list[dict]) -> dict:
+    keys = ("rows_in", "rows_out", "missing_coords", "swapped_coords", "outside_seoul", "near_duplicates")
+    return {k: sum(r.get(k, 0) for r in reports) for k in keys}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """CSV들을 검증만 하고 보고서를 출력: python -m backend.data_quality data/trash/*.csv"""
+    from backend.trash_can_info import TRASH_CSV_GLOB, _read_raw_csv, normalize_with_report, source_key
+
+    paths = (argv if argv is not None else sys.argv[1:]) or sorted(glob.glob(str(ROOT_DIR / TRASH_CSV_GLOB)))
+    reports = []
+    for path in paths:
+        raw, schema = _read_raw_csv(path)
+        _, report = normalize_with_report(raw, source=source_key(path), schema=schema)
+        reports.append(report.to_dict())
+    print(json.dumps({"summary": summarize(reports), "files": reports}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+# backend/dropoff_info.py
+
+from __future__ import annotations
+
+import pandas as pd
+
+# 분리배출 장소(재활용품 수거함) 데이터 - 지금은 용산구만 제공
+RECYCLING_SPOTS = [
+    {
+        "name": "재활용품 수거함",
+        "lat": 37.531405951,
+        "lon": 126.968820855,
+        "loc": "서울특별시 용산구 한강대로39길 34-5",
+    },
+    {
+        "name": "재활용품 수거함",
+        "lat": 37.526158356,
+        "lon": 126.963991217,
+        "loc": "서울특별시 용산구 한강대로15길 8-5",
+    },
+    {
+        "name": "재활용품 수거함",
+        "lat": 37.532477219,
+        "lon": 126.992280033,
+        "loc": "서울특별시 용산구 녹사평대로26가길 13",
+    },
+    {
+        "name": "재활용품 수거함",
+        "lat": 37.546230421,
+        "lon": 126.968248405,
+        "loc": "서울특별시 용산구 청파로57가길 20",
+    },
+    {
+        "name": "재활용품 수거함",
+        "lat": 37.543276420,
+        "lon": 126.967577129,
+        "loc": "서울특별시 용산구 청파로43길 47-16",
+    },
+    {
+        "name": "재활용품 수거함",
+        "lat": 37.542685125,
+        "lon": 126.96436403,
+        "loc": "서울특별시 용산구 백범로79길 91",
+    },
+    {
+        "name": "재활용품 수거함",
+        "lat": 37.553795554,
+        "lon": 126.977122664,
+        "loc": "서울특별시 용산구 소월로2나길 15-7",
+    },
+    {
+        "name": "재활용품 수거함",
+        "lat": 37.54254174,
+        "lon": 126.963011087,
+        "loc": "서울특별시 용산구 효창원로72길 23",
+    },
+    {
+        "name": "재활용품 수거함",
+        "lat": 37.534944062,
+        "lon": 126.990599864,
+        "loc": "서울특별시 용산구 이태원로15길 18",
+    },
+]
+
+
+def get_dropoff_spots() -> pd.DataFrame:
+    """분리배출 장소 목록을 DataFrame으로 반환한다."""
+    df = pd.DataFrame(RECYCLING_SPOTS)
+    df["id"] = [f"용산구-dropoff-{i}" for i in range(len(df))]
+    return df.rename(columns={"lon": "lng", "loc": "road_address"})
@@ -0,0 +1,91 @@
+# backend/geo_cell.py
+
+from __future__ import annotations
+
+import math
+
+# geohash 기반 위치 셀. 같은 셀 안의 사용자는 같은 캐시 결과를 공유한다.
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE_MAP = {c: i for i, c in enumerate(_BASE32)}
+
+# 정밀도 7 ≈ 153m x 153m (서울 위도 기준 가로는 조금 더 좁음)
+DEFAULT_PRECISION = 7
+
+METERS_PER_DEG_LAT = 111_320.0
+
+
+def encode(lat: float, lng: float, precision: int = DEFAULT_PRECISION) -> str:
+    """위경도를 geohash 문자열로 변환한다."""
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    chars = []
+    bits = 0
+    n_bits = 0
+    even = True  # 짝수 번째 비트는 경도
+
+    while len(chars) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if lng >= mid:
+                bits = (bits << 1) | 1
+                lng_lo = mid
+            else:
+                bits <<= 1
+                lng_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_lo = mid
+            else:
+                bits <<= 1
+                lat_hi = mid
+        even = not even
+        n_bits += 1
+        if n_bits == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            n_bits = 0
+
+    return "".join(chars)
+
+
+def decode_bbox(cell: str) -> tuple[float, float, float, float]:
+    """geohash 셀의 범위 (lat_min, lat_max, lng_min, lng_max)."""
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    even = True
+
+    for ch in cell:
+        value = _DECODE_MAP[ch]
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            if even:
+                mid = (lng_lo + lng_hi) / 2
+                if bit:
+                    lng_lo = mid
+                else:
+                    lng_hi = mid
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                if bit:
+                    lat_lo = mid
+                else:
+                    lat_hi = mid
+            even = not even
+
+    return lat_lo, lat_hi, lng_lo, lng_hi
+
+
+def cell_center(cell: str) -> tuple[float, float]:
+    lat_lo, lat_hi, lng_lo, lng_hi = decode_bbox(cell)
+    return ((lat_lo + lat_hi) / 2, (lng_lo + lng_hi) / 2)
+
+
+def cell_radius_m(cell: str) -> float:
+    """셀 중심에서 꼭짓점까지의 거리(미터). 셀 안의 어느 점이든 중심과 이만큼 이내."""
+    lat_lo, lat_hi, lng_lo, lng_hi = decode_bbox(cell)
+    half_h = (lat_hi - lat_lo) / 2 * METERS_PER_DEG_LAT
+    half_w = (lng_hi - lng_lo) / 2 * METERS_PER_DEG_LAT * math.cos(math.radians(lat_lo))
+    return math.hypot(half_h, half_w)
@@ -0,0 +1,207 @@
+# backend/guide_gate.py
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import threading
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from backend import ROOT_DIR
+from backend.guide_prompts import render_guide
+from backend.metrics import counter, histogram
+
+logger = logging.getLogger(__name__)
+
+# LLM을 부르기 전에 로컬에서 답할 수 있는 경우를 걸러 내는 단계.
+#
+# - 정확도가 품목별 기준(retake_below)보다 낮으면 "다시 찍어 주세요" 안내를 바로 돌려준다.
+#   (프롬프트도 0.6 미만이면 같은 고정 문구만 돌려주게 되어 있어서 왕복 비용만 든다)
+# - 품목별 고정 안내(templates)가 있으면 LLM 없이 그 안내를 렌더링한다.
+#
+# 기준표는 기록된 예측(품목, 정확도, 맞았는지)에서 오프라인으로 맞춘다:
+#   python -m backend.guide_gate fit predictions.jsonl > data/guide_thresholds.json
+# 기준표 파일이 없으면 프롬프트와 같은 전역 기준(0.6 / 0.85)만 쓴다.
+
+GUIDE_THRESHOLDS_PATH = os.environ.get(
+    "GUIDE_THRESHOLDS_PATH", str(ROOT_DIR / "data" / "guide_thresholds.json")
+)
+
+# 프롬프트의 정확도 구간과 같은 값 (guide_prompts의 v1/v2 시스템 프롬프트)
+RETAKE_BELOW = 0.6
+CONFIRM_BELOW = 0.85
+
+# 기준 맞추기: 기준 이상인 예측의 정답률이 TARGET_PRECISION 이상이 되는 가장 낮은 정확도.
+# 예측이 MIN_SUPPORT건보다 적은 품목은 전역 기준을 쓴다.
+TARGET_PRECISION = float(os.environ.get("GUIDE_TARGET_PRECISION", "0.9"))
+MIN_SUPPORT = int(os.environ.get("GUIDE_MIN_SUPPORT", "30"))
+
+# LLM 호출 기록이 아직 없을 때 아낀 시간 추정치 (초)
+LLM_LATENCY_ESTIMATE_S = float(os.environ.get("GUIDE_LLM_LATENCY_ESTIMATE_S", "2.0"))
+
+_avoided = counter("guide_llm_avoided_total", "guide requests answered locally without an LLM call")
+_saved = counter("guide_llm_saved_seconds_total", "estimated LLM latency saved by local answers")
+
+_table_lock = threading.Lock()
+_table: Optional[dict] = None
+
+
+def load_table(path: Optional[str] = None) -> dict:
+    """기준표 JSON (없거나 읽을 수 없으면 빈 표)."""
+    try:
+        with open(path or GUIDE_THRESHOLDS_PATH, encoding="utf-8") as f:
+            table = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning("가이드 기준표를 읽지 못했어요, 전역 기준을 씁니다: %s", e)
+        return {}
+    return table if isinstance(table, dict) else {}
+
+
+def threshold_table() -> dict:
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                _table = load_table()
+    return _table
+
+
+def retake_below(tag: str, table: Optional[dict] = None) -> float:
+    table = threshold_table() if table is None else table
+    entry = table.get("tags", {}).get(tag) or {}
+    return float(entry.get("retake_below", table.get("default", {}).get("retake_below", RETAKE_BELOW)))
+
+
+def _llm_latency_s() -> float:
+    """지금까지 실제 LLM 호출의 평균 지연 시간 (기록이 없으면 추정치)."""
+    _, total, count = histogram("openai_completion_seconds").snapshot()
+    return total / count if count else LLM_LATENCY_ESTIMATE_S
+
+
+def _record(reason: str) -> None:
+    _avoided.inc()
+    counter(f"guide_llm_avoided_{reason}_total", f"guide requests answered locally ({reason})").inc()
+    _saved.inc(_llm_latency_s())
+
+
+def early_exit(
+    tag: str, confidence: Optional[float], lang: str = "ko", table: Optional[dict] = None
+) -> Optional[str]:
+    """
+    LLM 없이 답할 수 있으면 안내 Markdown을, 아니면 None을 돌려준다.
+    정확도를 모르면(None) 판단하지 않고 LLM에 맡긴다.
+    """
+    if confidence is None:
+        return None
+    table = threshold_table() if table is None else table
+
+    if confidence < retake_below(tag, table):
+        _record("retake")
+        return render_guide({"status": "retake"}, lang)
+
+    lang_key = "en" if lang == "en" else "ko"
+    template = (table.get("templates", {}).get(tag) or {}).get(lang_key)
+    if template:
+        status = "confirm" if confidence < CONFIRM_BELOW else "confident"
+        _record("template")
+        return render_guide({**template, "status": status}, lang, fallback_item=tag)
+    return None
+
+
+# ───────────────── 오프라인 기준 맞추기 ─────────────────
+
+def _read_predictions(path: str) -> pd.DataFrame:
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    if path.endswith(".csv"):
+        return pd.read_csv(path)
+    return pd.read_json(path, lines=True)
+
+
+def fit_thresholds(
+    predictions: pd.DataFrame,
+    target_precision: float = TARGET_PRECISION,
+    min_support: int = MIN_SUPPORT,
+) -> dict:
+    """
+    기록된 예측(tag, probability, 그리고 correct 또는 정답 품목 label)에서 품목별 retake 기준을 맞춘다.
+    기준 이상 예측의 정답률이 target_precision 이상인 가장 낮은 정확도를 고르되,
+    프롬프트가 어차피 다시 찍으라고 하는 RETAKE_BELOW보다 낮게는 두지 않는다.
+    목표 정답률에 닿지 않는 품목은 unreachable에 적고 전역 기준을 쓴다.
+    """
+    if "correct" in predictions.columns:
+        correct = predictions["correct"].astype(bool)
+    elif "label" in predictions.columns:
+        correct = predictions["label"].astype("string") == predictions["tag"].astype("string")
+    else:
+        raise ValueError("예측 기록에 correct 또는 label 컬럼이 있어야 해요.")
+    df = pd.DataFrame(
+        {
+            "tag": predictions["tag"].astype(str),
+            "p": pd.to_numeric(predictions["probability"], errors="coerce"),
+            "ok": correct.fillna(False).to_numpy(dtype=bool),
+        }
+    ).dropna(subset=["p"])
+
+    tags, unreachable = {}, []
+    for tag, group in df.groupby("tag", sort=True):
+        if len(group) < min_support:
+            continue
+        # 정확도 내림차순으로 쌓아 가며 "이 값 이상" 예측의 정답률을 구한다
+        order = np.argsort(-group["p"].to_numpy(), kind="stable")
+        p = group["p"].to_numpy()[order]
+        ok = group["ok"].to_numpy()[order]
+        precision = np.cumsum(ok) / np.arange(1, len(ok) + 1)
+        # 같은 정확도가 여러 건이면 마지막 건에서만 자를 수 있다
+        last_of_value = np.r_[p[1:] != p[:-1], True]
+        passing = np.flatnonzero((precision >= target_precision) & last_of_value)
+        if not passing.size:
+            # 어느 정확도에서도 목표에 못 미치면 안내를 막지 않고 전역 기준을 쓴다
+            unreachable.append(tag)
+            continue
+        threshold = max(float(p[passing[-1]]), RETAKE_BELOW)
+        kept = p >= threshold
+        tags[tag] = {
+            "retake_below": round(threshold, 4),
+            "support": int(len(p)),
+            "precision": round(float(ok[kept].mean()) if kept.any() else 0.0, 4),
+            "kept_ratio": round(float(kept.mean()), 4),
+        }
+    return {
+        "default": {"retake_below": RETAKE_BELOW, "confirm_below": CONFIRM_BELOW},
+        "target_precision": target_precision,
+        "tags": tags,
+        "unreachable": unreachable,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    python -m backend.guide_gate fit predictions.jsonl   # 기준표 JSON을 출력
+    python -m backend.guide_gate show                    # 현재 기준표
+    """
+    args = argv if argv is not None else sys.argv[1:]
+    if len(args) >= 2 and args[0] == "fit":
+        table = fit_thresholds(pd.concat([_read_predictions(p) for p in args[1:]], ignore_index=True))
+        # 기존 표의 고정 안내는 유지한다
+        templates = load_table().get("templates")
+        if templates:
+            table["templates"] = templates
+    elif args[:1] == ["show"]:
+        table = threshold_table()
+    else:
+        print(main.__doc__)
+        return 1
+    print(json.dumps(table, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
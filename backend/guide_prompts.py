@@ -0,0 +1,230 @@
+# backend/guide_prompts.py
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+# 분리배출 가이드용 프롬프트 템플릿.
+# 버전별로 보관해서 바꿔 보거나 되돌릴 수 있게 하고, 템플릿마다 토큰 예산을 둔다.
+#   v1: 예전 프롬프트 그대로 (모델이 Markdown을 직접 작성, 출력 길이 제한 없음)
+#   v2: 짧은 프롬프트 + JSON 출력. Markdown은 render_guide()가 로컬에서 만든다.
+
+DEFAULT_VERSION = os.environ.get("GUIDE_PROMPT_VERSION", "v2")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토크나이저 없이 쓰는 보수적인 토큰 수 추정.
+    영문은 약 4글자당 1토큰, 한글/이모지 등은 글자당 1토큰으로 센다.
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    version: str
+    lang: str
+    system: str
+    # {tag}, {confidence} 자리표시자
+    user: str
+    # True면 JSON 객체로 응답받아 render_guide()로 Markdown을 만든다
+    structured: bool
+    # 응답 길이 상한 (None이면 제한 없음)
+    max_tokens: Optional[int]
+    # 시스템 + 사용자 프롬프트 토큰 예산 (추정치 기준)
+    prompt_budget: int
+
+    def __post_init__(self):
+        used = self.prompt_tokens(tag="x" * 20, confidence=1.0)
+        if used > self.prompt_budget:
+            raise ValueError(
+                f"프롬프트 템플릿 {self.version}/{self.lang}이 토큰 예산을 넘었어요 "
+                f"({used} > {self.prompt_budget})."
+            )
+
+    def format_user(self, tag: str, confidence: Optional[float]) -> str:
+        if confidence is None:
+            conf = ""
+        elif self.lang == "en":
+            conf = f" (Confidence Score: {confidence:.2f})"
+        else:
+            conf = f" (정확도: {confidence:.2f})"
+        return self.user.format(tag=tag, confidence=conf)
+
+    def prompt_tokens(self, tag: str, confidence: Optional[float]) -> int:
+        return estimate_tokens(self.system) + estimate_tokens(self.format_user(tag, confidence))
+
+
+# ───────────────── v1: 기존 프롬프트 ─────────────────
+
+_V1_SYSTEM_EN = """
+You are a friendly and professional 'Recycling Coach' following standard Korean recycling guidelines.
+
+# Task
+Analyze the given waste item and its confidence score to provide proper disposal instructions.
+
+# Logic based on Confidence Score
+1. **Low (< 0.6)**:
+   - The image is unclear. Apologize and ask the user to retake the photo.
+   - **DO NOT** provide recycling steps.
+   - Message: "Sorry, I can't clearly identify the item. 😥 Could you take a closer picture?"
+2. **Medium (0.6 ~ 0.85)**:
+   - Unsure. Ask "Is this [Item Name]?" first.
+   - If yes, provide the recycling guide below.
+3. **High (>= 0.85)**:
+   - Confident. Say "This is [Item Name]! 🙆‍♂️" and provide the recycling guide immediately.
+
+# Output Format (Recycling Guide)
+If the score is high enough to provide a guide, use this Markdown format:
+
+## 🗑️ [Item Name] Disposal Guide
+* **Empty/Rinse 🚿**: (Instructions on emptying and washing)
+* **Remove/Separate ✂️**: (Instructions on removing labels, caps, etc.)
+* **Crush/Compress 🦶**: (Instructions on reducing volume)
+* **Disposal Location 📦**: (Where to put it: e.g., Transparent PET bin, General waste)
+
+# Constraints
+- Respond in Markdown.
+- Use emojis to make it friendly.
+"""
+
+_V1_SYSTEM_KO = """
+당신은 대한민국 환경부 지침을 따르는 '친절하고 꼼꼼한 분리배출 코치'입니다.
+
+# 임무
+사용자가 제공한 쓰레기 품목(Item)과 정확도(Confidence)를 분석하여 상황에 맞는 답변을 하세요.
+
+# 정확도(Confidence)별 대응 로직
+1. 낮음 (0.6 미만):
+   - 행동: 분리배출 방법을 안내하지 마세요.
+   - 메시지: "죄송합니다, 사진이 흔들렸거나 잘 보이지 않아 판단하기 어렵네요. 😥 물체가 잘 보이도록 다시 찍어주시겠어요?"
+
+2. 중간 (0.6 이상 ~ 0.85 미만):
+   - 행동: 추측이 맞는지 먼저 물어보세요.
+   - 메시지: "혹시 이 물건이 [한국어 분류명] 맞나요? 🤔 맞다면 아래 방법대로 배출해 주세요!" (이후 가이드 출력)
+
+3. 높음 (0.85 이상):
+   - 행동: 확신을 가지고 바로 안내하세요.
+   - 메시지: "이건 [한국어 분류명] 입니다! 🙆‍♂️ 이렇게 분리배출 하시면 완벽합니다." (이후 가이드 출력)
+
+# 배출 가이드 출력 양식 (Markdown)
+안내 시에는 반드시 아래 목차를 사용하여 구체적인 행동을 지시하세요.
+
+## 🗑️ [한국어 분류] 배출 가이드
+ 비우기/헹구기 🚿: (내용물을 비우고 물로 씻어야 하는지 설명)
+ 분리하기 ✂️: (라벨, 뚜껑, 테이프 등 다른 재질 제거 여부)
+ 부피 줄이기 🦶: (찌그러뜨리거나 접어서 부피를 줄이는 방법)
+ 배출 장소 📦: (투명 페트병 전용, 캔류, 일반쓰레기 등 배출 위치)
+
+# 제약 사항
+- 입력된 품목 명(tag)이 영어라면 한국어로 자연스럽게 번역하세요 (예: cardboard -> 골판지 박스).
+- 사용자가 헷갈릴 만한 부분(예: 씻어도 얼룩진 컵라면 용기 등)은 '💡 꿀팁'으로 한 줄 덧붙여주세요.
+
+# [책임감 있는 AI - 공정성 원칙 적용]
+1. 재질 중심 분석: 쓰레기의 브랜드(고가/저가)나 외관의 낡음 정도에 따라 차별적인 어조를 사용하지 마세요. 오직 '재질'과 '배출 방법'에만 집중하여 공평하게 정보를 제공하세요.
+2. 편향 방지: 특정 지역이나 계층에서만 사용하는 용어보다는, 누구나 이해할 수 있는 표준어를 사용하세요.
+"""
+
+# ───────────────── v2: 짧은 프롬프트 + JSON 출력 ─────────────────
+# 인사말/목차/이모지는 render_guide()가 붙이므로 모델은 내용만 짧게 채운다.
+
+_V2_SYSTEM_EN = """You are a recycling coach following Korean recycling rules.
+Reply with one JSON object only:
+{"status":"retake|confirm|confident","item":"","rinse":"","separate":"","compress":"","location":"","tip":""}
+- status: retake if confidence < 0.6 (leave other fields empty), confirm if < 0.85, else confident.
+- item: short English name of the item.
+- Each step: one short imperative sentence. tip: one line for a common mistake, or "".
+- Focus only on material and disposal method; use plain, neutral language."""
+
+_V2_SYSTEM_KO = """당신은 환경부 지침을 따르는 분리배출 코치입니다.
+아래 JSON 객체 하나로만 답하세요:
+{"status":"retake|confirm|confident","item":"","rinse":"","separate":"","compress":"","location":"","tip":""}
+- status: 정확도 0.6 미만이면 retake(나머지 필드는 빈 문자열), 0.85 미만이면 confirm, 그 외 confident.
+- item: 품목의 자연스러운 한국어 분류명 (예: cardboard → 골판지 박스).
+- rinse/separate/compress/location: 각각 한 문장의 구체적인 행동 지시.
+- tip: 헷갈리기 쉬운 점 한 줄 (없으면 "").
+- 브랜드나 외관과 관계없이 재질과 배출 방법에만 집중하고, 누구나 이해할 표준어를 쓰세요."""
+
+_USER_EN = "Item: '{tag}'{confidence}. Provide the recycling guide based on the confidence score."
+_USER_KO = "분리수거 품목: '{tag}'{confidence}. 이 정보와 정확도를 바탕으로 가이드를 제공해주세요."
+
+TEMPLATES: dict[tuple[str, str], PromptTemplate] = {
+    (t.version, t.lang): t
+    for t in (
+        PromptTemplate("v1", "en", _V1_SYSTEM_EN, _USER_EN, structured=False, max_tokens=None, prompt_budget=400),
+        PromptTemplate("v1", "ko", _V1_SYSTEM_KO, _USER_KO, structured=False, max_tokens=None, prompt_budget=800),
+        PromptTemplate("v2", "en", _V2_SYSTEM_EN, _USER_EN, structured=True, max_tokens=300, prompt_budget=250),
+        PromptTemplate("v2", "ko", _V2_SYSTEM_KO, _USER_KO, structured=True, max_tokens=400, prompt_budget=450),
+    )
+}
+
+
+def get_template(lang: str = "ko", version: Optional[str] = None) -> PromptTemplate:
+    version = version or DEFAULT_VERSION
+    key = (version, "en" if lang == "en" else "ko")
+    if key not in TEMPLATES:
+        raise ValueError(f"프롬프트 템플릿 {version}/{lang}을 찾을 수 없어요.")
+    return TEMPLATES[key]
+
+
+# ───────────────── JSON 응답 → Markdown ─────────────────
+
+_LABELS = {
+    "ko": {
+        "retake": "죄송합니다, 사진이 흔들렸거나 잘 보이지 않아 판단하기 어렵네요. 😥 물체가 잘 보이도록 다시 찍어주시겠어요?",
+        "confirm": "혹시 이 물건이 {item} 맞나요? 🤔 맞다면 아래 방법대로 배출해 주세요!",
+        "confident": "이건 {item} 입니다! 🙆‍♂️ 이렇게 분리배출 하시면 완벽합니다.",
+        "title": "## 🗑️ {item} 배출 가이드",
+        "rinse": "비우기/헹구기 🚿",
+        "separate": "분리하기 ✂️",
+        "compress": "부피 줄이기 🦶",
+        "location": "배출 장소 📦",
+        "tip": "💡 꿀팁",
+    },
+    "en": {
+        "retake": "Sorry, I can't clearly identify the item. 😥 Could you take a closer picture?",
+        "confirm": "Is this {item}? 🤔 If so, please follow the guide below!",
+        "confident": "This is {item}! 🙆‍♂️",
+        "title": "## 🗑️ {item} Disposal Guide",
+        "rinse": "Empty/Rinse 🚿",
+        "separate": "Remove/Separate ✂️",
+        "compress": "Crush/Compress 🦶",
+        "location": "Disposal Location 📦",
+        "tip": "💡 Tip",
+    },
+}
+
+GUIDE_STEPS = ("rinse", "separate", "compress", "location")
+
+
+def parse_guide(content: str) -> dict:
+    """모델의 JSON 응답을 dict로. 형식이 맞지 않으면 ValueError."""
+    try:
+        data = json.loads(content)
+    except (TypeError, json.JSONDecodeError) as e:
+        raise ValueError(f"가이드 응답이 JSON 형식이 아니에요: {e}") from e
+    if not isinstance(data, dict) or data.get("status") not in ("retake", "confirm", "confident"):
+        raise ValueError("가이드 응답에 올바른 status가 없어요.")
+    return {k: str(v).strip() if v is not None else "" for k, v in data.items()}
+
+
+def render_guide(data: dict, lang: str = "ko", fallback_item: str = "") -> str:
+    """구조화된 가이드(dict)를 화면에 보여 줄 Markdown으로 만든다."""
+    labels = _LABELS["en" if lang == "en" else "ko"]
+    status = data.get("status", "confident")
+    if status == "retake":
+        return labels["retake"]
+
+    item = data.get("item") or fallback_item
+    lines = [labels[status].format(item=item), "", labels["title"].format(item=item)]
+    for step in GUIDE_STEPS:
+        if data.get(step):
+            lines.append(f"* **{labels[step]}**: {data[step]}")
+    if data.get("tip"):
+        lines += ["", f"{labels['tip']}: {data['tip']}"]
+    return "\n".join(lines)
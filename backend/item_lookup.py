@@ -0,0 +1,264 @@
+# backend/item_lookup.py
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from backend import ROOT_DIR
+from backend.metrics import counter, timed
+
+logger = logging.getLogger(__name__)
+
+# 품목 이름(자유 입력) → 분류 태그. 사진 없이 "컵라면 용기", "pizza box" 같은 입력을
+# Custom Vision 태그로 바꿔서 기존 안내 생성(call_openai_api)을 그대로 쓴다.
+#
+# 임베딩: 공백/기호를 뺀 문자열의 글자 2~3-gram을 crc32로 N_BUCKETS칸에 해싱한 희소 벡터 (L2 정규화).
+#   한글은 음절 단위라 짧은 단어도 n-gram이 충분하고, 오타/띄어쓰기/복수형에도 잘 맞는다.
+# 인덱스: 동의어 표(ITEM_SYNONYMS_PATH)의 벡터를 n-gram 칸별 역색인(칸 → (행, 가중치))으로 저장한다.
+#   질의의 n-gram 칸만 훑어 코사인 유사도를 누적하므로 동의어 수와 거의 무관하게 빠르다.
+#   (수백~수천 개 동의어 규모에서는 근사 검색 구조보다 정확한 역색인이 더 빠르다)
+# 인덱스 파일(.npy)은 ITEM_INDEX_DIR/<동의어 표 해시>/에 한 번 만들고 mmap으로 연다.
+
+ITEM_SYNONYMS_PATH = os.environ.get(
+    "ITEM_SYNONYMS_PATH", str(ROOT_DIR / "data" / "items" / "item_synonyms.csv")
+)
+ITEM_INDEX_DIR = os.environ.get("ITEM_INDEX_DIR", str(ROOT_DIR / "build" / "item_index"))
+
+# 이 유사도보다 낮으면 태그를 확정하지 않는다
+MATCH_MIN_SCORE = float(os.environ.get("ITEM_MATCH_MIN_SCORE", "0.45"))
+
+INDEX_FORMAT_VERSION = 2
+N_BUCKETS = 1 << 18
+NGRAM_SIZES = (2, 3)
+
+_resolved = counter("item_lookup_resolved_total", "free-text item queries resolved to a tag")
+_unresolved = counter("item_lookup_unresolved_total", "free-text item queries below the match threshold")
+
+
+_NON_WORD = re.compile(r"[^0-9a-z가-힣]")
+
+
+def normalize_query(text: str) -> str:
+    """비교용: 소문자, 공백/기호 제거 (한글/영문/숫자만)."""
+    return _NON_WORD.sub("", str(text).lower())
+
+
+@lru_cache(maxsize=1 << 16)
+def _bucket(gram: str) -> int:
+    # 프로세스마다 달라지는 hash() 대신 crc32 (인덱스 파일과 같은 칸을 써야 한다)
+    return zlib.crc32(gram.encode("utf-8")) & (N_BUCKETS - 1)
+
+
+def embed(text: str) -> tuple[np.ndarray, np.ndarray]:
+    """희소 벡터 (칸 번호, L2 정규화한 가중치). 빈 입력이면 길이 0."""
+    norm = normalize_query(text)
+    if not norm:
+        return np.empty(0, np.int64), np.empty(0, np.float32)
+    padded = f"^{norm}$"
+    counts: dict[int, int] = {}
+    for n in NGRAM_SIZES:
+        for i in range(len(padded) - n + 1):
+            b = _bucket(padded[i : i + n])
+            counts[b] = counts.get(b, 0) + 1
+    buckets = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    weights = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+    return buckets, weights / np.float32(np.sqrt((weights * weights).sum()))
+
+
+@dataclass(frozen=True)
+class ItemMatch:
+    tag: str
+    # 가장 비슷한 동의어와 코사인 유사도
+    synonym: str
+    score: float
+
+
+class ItemIndex:
+    """동의어 역색인 (칸별 행/가중치 배열은 mmap)."""
+
+    def __init__(self, ptr: np.ndarray, rows: np.ndarray, weights: np.ndarray, meta: dict):
+        # memmap 하위 클래스의 연산 오버헤드를 피하려고 같은 메모리의 일반 ndarray로 본다
+        self.ptr = np.asarray(ptr)
+        self.rows = np.asarray(rows)
+        self.weights = np.asarray(weights)
+        self.synonyms: list[str] = meta["synonyms"]
+        self.tags: list[str] = meta["tags"]
+        # 동의어는 태그순으로 저장돼 있다: 태그 t의 동의어 행은 tag_ptr[t]:tag_ptr[t+1]
+        self.tag_ptr = np.asarray(meta["tag_ptr"], dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.synonyms)
+
+    def scores(self, text: str) -> np.ndarray:
+        """모든 동의어와의 코사인 유사도."""
+        buckets, q = embed(text)
+        starts = self.ptr[buckets]
+        lengths = self.ptr[buckets + 1] - starts
+        # 질의 칸들의 역색인 구간을 한 번에 모은다 (색인에 없는 칸은 길이 0)
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        return np.bincount(
+            self.rows[offsets],
+            weights=self.weights[offsets] * np.repeat(q, lengths),
+            minlength=len(self.synonyms),
+        )
+
+    def lookup(self, text: str, k: int = 3) -> list[ItemMatch]:
+        """비슷한 태그 상위 k개 (태그마다 가장 비슷한 동의어 기준, 점수 내림차순)."""
+        scores = self.scores(text)
+        best = np.maximum.reduceat(scores, self.tag_ptr[:-1])
+        top = np.argsort(-best, kind="stable")[:k]
+        out = []
+        for t in top:
+            if best[t] <= 0:
+                break
+            start = self.tag_ptr[t]
+            row = start + int(np.argmax(scores[start : self.tag_ptr[t + 1]]))
+            out.append(ItemMatch(self.tags[t], self.synonyms[row], round(float(best[t]), 4)))
+        return out
+
+
+# ───────────────── 만들기 / 불러오기 ─────────────────
+
+def read_synonyms(path: Optional[str] = None) -> pd.DataFrame:
+    """동의어 표 (tag, synonym[, lang]). 태그 이름 자체도 동의어로 넣는다."""
+    df = pd.read_csv(path or ITEM_SYNONYMS_PATH, dtype=str).dropna(subset=["tag", "synonym"])
+    tags = pd.DataFrame({"tag": df["tag"].unique()})
+    tags["synonym"] = tags["tag"].str.replace("_", " ")
+    df = pd.concat([df[["tag", "synonym"]], tags], ignore_index=True)
+    df = df[df["synonym"].map(normalize_query) != ""]
+    return df.drop_duplicates(subset=["tag", "synonym"]).reset_index(drop=True)
+
+
+def build_index(synonyms: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray, dict]:
+    """동의어 표 → (ptr, rows, weights, meta). ptr[b]:ptr[b+1]이 칸 b의 역색인 구간."""
+    synonyms = synonyms.sort_values("tag", kind="stable").reset_index(drop=True)
+    tags, counts = np.unique(synonyms["tag"].to_numpy(dtype=str), return_counts=True)
+    all_buckets, all_rows, all_weights = [], [], []
+    for row, text in enumerate(synonyms["synonym"]):
+        buckets, weights = embed(text)
+        all_buckets.append(buckets)
+        all_rows.append(np.full(len(buckets), row, dtype=np.int32))
+        all_weights.append(weights)
+    buckets = np.concatenate(all_buckets)
+    order = np.argsort(buckets, kind="stable")
+    ptr = np.zeros(N_BUCKETS + 1, dtype=np.int64)
+    np.cumsum(np.bincount(buckets, minlength=N_BUCKETS), out=ptr[1:])
+    meta = {
+        "version": INDEX_FORMAT_VERSION,
+        "tags": tags.tolist(),
+        "synonyms": synonyms["synonym"].tolist(),
+        "tag_ptr": [0] + np.cumsum(counts).tolist(),
+    }
+    return ptr, np.concatenate(all_rows)[order], np.concatenate(all_weights)[order], meta
+
+
+def _index_token(path: str) -> str:
+    with open(path, "rb") as f:
+        digest = hashlib.sha1(f.read())
+    digest.update(f"{INDEX_FORMAT_VERSION}:{N_BUCKETS}:{NGRAM_SIZES}".encode())
+    return digest.hexdigest()[:16]
+
+
+def _write_index(directory: str, ptr, rows, weights, meta) -> None:
+    tmp = f"{directory}.{os.getpid()}.tmp"
+    os.makedirs(tmp, exist_ok=True)
+    np.save(os.path.join(tmp, "ptr.npy"), ptr)
+    np.save(os.path.join(tmp, "rows.npy"), rows)
+    np.save(os.path.join(tmp, "weights.npy"), weights)
+    with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    try:
+        os.replace(tmp, directory)
+    except OSError:
+        # 다른 프로세스가 먼저 만들었다
+        for name in os.listdir(tmp):
+            os.remove(os.path.join(tmp, name))
+        os.rmdir(tmp)
+
+
+def _open_index(directory: str) -> ItemIndex:
+    def load(name):
+        return np.load(os.path.join(directory, name), mmap_mode="r")
+
+    with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    return ItemIndex(load("ptr.npy"), load("rows.npy"), load("weights.npy"), meta)
+
+
+_index_lock = threading.Lock()
+_index: Optional[ItemIndex] = None
+
+
+def load_item_index(path: Optional[str] = None) -> ItemIndex:
+    """동의어 표의 인덱스 (없으면 만들어 ITEM_INDEX_DIR에 저장, 저장할 수 없으면 메모리에만)."""
+    global _index
+    if _index is not None and path is None:
+        return _index
+    with _index_lock:
+        if _index is not None and path is None:
+            return _index
+        path = path or ITEM_SYNONYMS_PATH
+        directory = os.path.join(ITEM_INDEX_DIR, _index_token(path))
+        try:
+            if not os.path.exists(os.path.join(directory, "meta.json")):
+                os.makedirs(ITEM_INDEX_DIR, exist_ok=True)
+                _write_index(directory, *build_index(read_synonyms(path)))
+            index = _open_index(directory)
+        except OSError as e:
+            logger.warning("품목 인덱스를 저장하지 못했어요, 메모리에서 사용합니다: %s", e)
+            ptr, rows, weights, meta = build_index(read_synonyms(path))
+            index = ItemIndex(ptr, rows, weights, meta)
+        if path == ITEM_SYNONYMS_PATH:
+            _index = index
+        return index
+
+
+@timed("item_lookup")
+def resolve_item(text: str, k: int = 3) -> tuple[Optional[ItemMatch], list[ItemMatch]]:
+    """
+    입력 → (확정된 태그 또는 None, 후보 상위 k개).
+    가장 비슷한 태그가 MATCH_MIN_SCORE 이상이면 확정한다.
+    """
+    candidates = load_item_index().lookup(text, k)
+    if candidates and candidates[0].score >= MATCH_MIN_SCORE:
+        _resolved.inc()
+        return candidates[0], candidates
+    _unresolved.inc()
+    return None, candidates
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    python -m backend.item_lookup build          # 인덱스 만들기
+    python -m backend.item_lookup "컵라면 용기"   # 조회
+    """
+    args = argv if argv is not None else sys.argv[1:]
+    index = load_item_index()
+    if not args or args == ["build"]:
+        print(f"품목 인덱스: 태그 {len(index.tags)}개, 동의어 {len(index)}개")
+        return 0
+    for text in args:
+        match, candidates = resolve_item(text)
+        print(json.dumps(
+            {"query": text, "tag": match.tag if match else None,
+             "candidates": [c.__dict__ for c in candidates]},
+            ensure_ascii=False,
+        ))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,292 @@
+# backend/limiter.py
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional, TypeVar
+
+from backend.metrics import counter, histogram
+
+try:
+    import fcntl  # 여러 프로세스가 슬롯을 나눠 쓸 때만 필요 (POSIX)
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+T = TypeVar("T")
+
+# 외부 API(LLM / Vision) 동시 호출 제한.
+# 동시에 나갈 수 있는 호출 수를 정해 두고, 나머지는 우선순위 대기열에서 기다린다.
+# 대기열이 꽉 찼거나 제한 시간 안에 차례가 오지 않을 것 같으면 바로 거절해서
+# 사용자가 타임아웃까지 기다리지 않고 안내 메시지를 받게 한다.
+# 업스트림이 429(Retry-After)를 주면 동시 호출 수를 절반으로 줄이고 그 시간 동안 새 호출을 멈춘다.
+
+# 숫자가 작을수록 먼저 처리
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+DEFAULT_RETRY_AFTER_S = 1.0
+
+
+class UpstreamThrottled(Exception):
+    """업스트림이 429를 돌려줬을 때 호출 함수가 던지는 예외."""
+
+    def __init__(self, retry_after_s: float = DEFAULT_RETRY_AFTER_S):
+        super().__init__(f"upstream throttled (retry after {retry_after_s:.1f}s)")
+        self.retry_after_s = retry_after_s
+
+
+class UpstreamBusy(Exception):
+    """대기열이 꽉 찼거나 제한 시간 안에 호출할 수 없어서 요청을 거절했다."""
+
+    def __init__(self, name: str, retry_after_s: float):
+        super().__init__(f"{name}: too busy (retry after {retry_after_s:.1f}s)")
+        self.name = name
+        self.retry_after_s = retry_after_s
+
+
+def parse_retry_after(value: Optional[str], default: float = DEFAULT_RETRY_AFTER_S) -> float:
+    """Retry-After 헤더 (초 또는 HTTP 날짜) → 초."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class ConcurrencyLimiter:
+    """
+    프로세스 안의 모든 세션이 공유하는 업스트림 호출 제한기.
+
+    slot_dir를 주면 같은 디렉터리를 쓰는 모든 프로세스가 파일 잠금(fcntl)으로
+    max_concurrency개의 슬롯과 Retry-After 정지 시각을 나눠 쓴다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        max_queue: int = 32,
+        queue_timeout_s: float = 10.0,
+        slot_dir: Optional[str] = None,
+    ):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max_queue
+        self.queue_timeout_s = queue_timeout_s
+        self.slot_dir = slot_dir if (slot_dir and fcntl is not None) else None
+        if self.slot_dir:
+            os.makedirs(self.slot_dir, exist_ok=True)
+
+        self._cond = threading.Condition()
+        # 429를 받으면 줄었다가 성공할 때마다 조금씩 회복 (AIMD)
+        self._limit = float(self.max_concurrency)
+        self._active = 0
+        self._blocked_until = 0.0
+        self._waiters: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+
+        self._wait_hist = histogram(f"{name}_queue_wait_seconds", f"{name} limiter queue wait")
+        self._shed = counter(f"{name}_shed_total", f"{name} requests rejected by limiter")
+        self._throttled = counter(f"{name}_throttled_total", f"{name} upstream 429 responses")
+
+    # ---- 상태 ----
+
+    @property
+    def limit(self) -> int:
+        return max(1, int(self._limit))
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    # ---- 슬롯 ----
+
+    def _shed_now(self, retry_after_s: float) -> UpstreamBusy:
+        self._shed.inc()
+        return UpstreamBusy(self.name, max(retry_after_s, DEFAULT_RETRY_AFTER_S))
+
+    def _acquire_local(self, priority: int, deadline: float) -> None:
+        with self._cond:
+            blocked_until = max(self._blocked_until, self._shared_blocked_until())
+            if len(self._waiters) >= self.max_queue:
+                raise self._shed_now(blocked_until - time.monotonic())
+            if blocked_until > deadline:
+                # Retry-After가 대기 제한보다 길면 기다려 봐야 소용없으므로 바로 거절
+                raise self._shed_now(blocked_until - time.monotonic())
+
+            me = (priority, next(self._seq))
+            heapq.heappush(self._waiters, me)
+            try:
+                while True:
+                    now = time.monotonic()
+                    blocked_until = max(self._blocked_until, self._shared_blocked_until())
+                    if (
+                        self._waiters[0] == me
+                        and self._active < self.limit
+                        and now >= blocked_until
+                    ):
+                        heapq.heappop(self._waiters)
+                        self._active += 1
+                        # 슬롯이 더 남았으면 다음 대기자도 확인하도록 깨운다
+                        self._cond.notify_all()
+                        return
+                    if now >= deadline or blocked_until > deadline:
+                        raise self._shed_now(max(blocked_until, deadline) - now)
+                    wake_at = deadline if now >= blocked_until else min(deadline, blocked_until)
+                    self._cond.wait(wake_at - now)
+            except BaseException:
+                if me in self._waiters:
+                    self._waiters.remove(me)
+                    heapq.heapify(self._waiters)
+                # 내가 맨 앞이었다면 다음 대기자가 깨어나야 한다
+                self._cond.notify_all()
+                raise
+
+    def _release_local(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def _acquire_file_slot(self, deadline: float):
+        """프로세스 간 공유 슬롯 중 빈 것 하나를 잠근다. 없으면 None."""
+        while True:
+            for i in range(self.max_concurrency):
+                path = os.path.join(self.slot_dir, f"{self.name}.{i}.lock")
+                f = open(path, "a+")
+                try:
+                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return f
+                except OSError:
+                    f.close()
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.02)
+
+    @contextmanager
+    def slot(self, priority: int = PRIORITY_INTERACTIVE):
+        """
+        with limiter.slot(): ... 업스트림 호출 ...
+        차례가 올 때까지 기다린다. 기다릴 수 없으면 UpstreamBusy.
+        """
+        start = time.monotonic()
+        deadline = start + self.queue_timeout_s
+        self._acquire_local(priority, deadline)
+        lock_file = None
+        try:
+            if self.slot_dir:
+                lock_file = self._acquire_file_slot(deadline)
+                if lock_file is None:
+                    raise self._shed_now(DEFAULT_RETRY_AFTER_S)
+            self._wait_hist.observe(time.monotonic() - start)
+            yield
+        finally:
+            if lock_file is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                lock_file.close()
+            self._release_local()
+
+    # ---- 업스트림 응답에 따른 조정 ----
+
+    def on_success(self) -> None:
+        with self._cond:
+            if self._limit < self.max_concurrency:
+                self._limit = min(self.max_concurrency, self._limit + 1.0 / self._limit)
+                self._cond.notify_all()
+
+    def on_throttled(self, retry_after_s: float) -> None:
+        self._throttled.inc()
+        with self._cond:
+            self._limit = max(1.0, self._limit / 2)
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after_s)
+        if self.slot_dir:
+            self._write_shared_blocked_until(time.time() + retry_after_s)
+
+    def _blocked_path(self) -> str:
+        return os.path.join(self.slot_dir, f"{self.name}.blocked_until")
+
+    def _shared_blocked_until(self) -> float:
+        """다른 프로세스가 기록한 정지 시각 (monotonic 기준으로 변환)."""
+        if not self.slot_dir:
+            return 0.0
+        try:
+            with open(self._blocked_path(), encoding="utf-8") as f:
+                wall = float(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0.0
+        return time.monotonic() + (wall - time.time())
+
+    def _write_shared_blocked_until(self, wall: float) -> None:
+        tmp = f"{self._blocked_path()}.{os.getpid()}"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(repr(wall))
+            os.replace(tmp, self._blocked_path())
+        except OSError:
+            pass
+
+    def call(
+        self,
+        fn: Callable[..., T],
+        *args,
+        priority: int = PRIORITY_INTERACTIVE,
+        retries: int = 1,
+        **kwargs,
+    ) -> T:
+        """
+        슬롯을 잡고 fn을 호출한다. fn이 UpstreamThrottled를 던지면 정지 시간을 반영하고
+        대기열을 다시 거쳐 최대 retries번 재시도한다.
+        """
+        for attempt in range(retries + 1):
+            with self.slot(priority):
+                try:
+                    result = fn(*args, **kwargs)
+                except UpstreamThrottled as e:
+                    self.on_throttled(e.retry_after_s)
+                    if attempt == retries:
+                        raise self._shed_now(e.retry_after_s) from e
+                    continue
+            self.on_success()
+            return result
+        raise AssertionError("unreachable")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+# 업스트림별 공용 제한기. UPSTREAM_SLOT_DIR을 주면 여러 프로세스가 슬롯을 공유한다.
+_SLOT_DIR = os.environ.get("UPSTREAM_SLOT_DIR") or None
+
+llm_limiter = ConcurrencyLimiter(
+    "openai",
+    max_concurrency=_env_int("OPENAI_MAX_CONCURRENCY", 8),
+    max_queue=_env_int("OPENAI_MAX_QUEUE", 32),
+    queue_timeout_s=float(_env_int("OPENAI_QUEUE_TIMEOUT_S", 15)),
+    slot_dir=_SLOT_DIR,
+)
+
+vision_limiter = ConcurrencyLimiter(
+    "custom_vision",
+    max_concurrency=_env_int("CUSTOM_VISION_MAX_CONCURRENCY", 8),
+    max_queue=_env_int("CUSTOM_VISION_MAX_QUEUE", 32),
+    queue_timeout_s=float(_env_int("CUSTOM_VISION_QUEUE_TIMEOUT_S", 10)),
+    slot_dir=_SLOT_DIR,
+)
@@ -0,0 +1,183 @@
+# backend/metrics.py
+
+from __future__ import annotations
+
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+# 가벼운 지연 시간/처리량 계측. 히스토그램은 고정 버킷이라 기록 비용이 작고,
+# 백분위수(p50/p95/p99)는 버킷 경계로 근사한다.
+
+# 히스토그램 버킷 상한 (초). 0.1ms ~ 60s를 대략 로그 간격으로.
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str = "", buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[i] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> tuple[list[int], float, int]:
+        with self._lock:
+            return list(self._counts), self._sum, self._count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """q 분위수의 근사값 (해당 버킷 안에서 선형 보간)."""
+        counts, _, total = self.snapshot()
+        if total == 0:
+            return None
+        rank = q * total
+        cumulative = 0
+        for i, c in enumerate(counts):
+            if cumulative + c >= rank and c > 0:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - cumulative) / c
+            cumulative += c
+        return self.buckets[-1]
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str = ""):
+        self.name = name
+        self.help_text = help_text
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+_registry_lock = threading.Lock()
+_histograms: dict[str, Histogram] = {}
+_counters: dict[str, Counter] = {}
+
+
+def histogram(name: str, help_text: str = "") -> Histogram:
+    h = _histograms.get(name)
+    if h is None:
+        with _registry_lock:
+            h = _histograms.setdefault(name, Histogram(name, help_text))
+    return h
+
+
+def counter(name: str, help_text: str = "") -> Counter:
+    c = _counters.get(name)
+    if c is None:
+        with _registry_lock:
+            c = _counters.setdefault(name, Counter(name, help_text))
+    return c
+
+
+@contextmanager
+def timer(name: str):
+    """
+    with timer("folium_render"): ...
+    구간 소요 시간을 {name}_seconds 히스토그램에 기록한다 (호출 수는 히스토그램의 count).
+    예외가 나면 {name}_errors_total 카운터도 올린다.
+    """
+    h = histogram(f"{name}_seconds", f"{name} latency")
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        counter(f"{name}_errors_total", f"{name} errors").inc()
+        raise
+    finally:
+        h.observe(time.perf_counter() - start)
+
+
+def timed(name: str) -> Callable:
+    """함수 전체를 계측하는 데코레이터. 히스토그램은 데코레이트할 때 한 번만 찾는다."""
+
+    def decorator(fn):
+        h = histogram(f"{name}_seconds", f"{name} latency")
+        errors = counter(f"{name}_errors_total", f"{name} errors")
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except BaseException:
+                errors.inc()
+                raise
+            finally:
+                h.observe(time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def summary() -> list[dict]:
+    """디버그 패널용 요약 (이름, 호출 수, 평균, p50/p95/p99 - 초 단위)."""
+    rows = []
+    for name, h in sorted(_histograms.items()):
+        _, total_sum, total = h.snapshot()
+        base = name[: -len("_seconds")] if name.endswith("_seconds") else name
+        errors = _counters.get(f"{base}_errors_total")
+        rows.append(
+            {
+                "name": base,
+                "count": total,
+                "errors": int(errors.value) if errors else 0,
+                "mean": (total_sum / total) if total else None,
+                "p50": h.quantile(0.50),
+                "p95": h.quantile(0.95),
+                "p99": h.quantile(0.99),
+            }
+        )
+    return rows
+
+
+def counter_values() -> dict[str, float]:
+    return {name: c.value for name, c in sorted(_counters.items())}
+
+
+def render_prometheus() -> str:
+    """Prometheus text exposition format (0.0.4)."""
+    lines = []
+    for name, c in sorted(_counters.items()):
+        lines.append(f"# HELP {name} {c.help_text}")
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {c.value}")
+
+    for name, h in sorted(_histograms.items()):
+        counts, total_sum, total = h.snapshot()
+        lines.append(f"# HELP {name} {h.help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for upper, c in zip(h.buckets, counts):
+            cumulative += c
+            lines.append(f'{name}_bucket{{le="{upper}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{le="+Inf"}} {total}')
+        lines.append(f"{name}_sum {total_sum}")
+        lines.append(f"{name}_count {total}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,413 @@
+# backend/poi_store.py
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from backend.dropoff_info import get_dropoff_spots
+from backend.metrics import timed
+from backend.shared_dataset import shared_frame
+from backend.trash_can_info import (
+    TrashDataset,
+    add_reload_listener,
+    current_trash_dataset,
+    haversine_distances_m,
+)
+
+# 레이어 이름
+LAYER_TRASH = "trash"
+LAYER_DROPOFF = "dropoff"
+LAYER_SHOP = "shop"
+
+# 모든 레이어가 공유하는 공통 스키마
+POI_COLUMNS = [
+    "id",
+    "layer",
+    "type",
+    "name",
+    "gu",
+    "road_address",
+    "jibun_address",
+    "detail",
+    "link",
+    "lat",
+    "lng",
+]
+
+# shop 레이어에 남겨 두는 검색어 세그먼트 수 (오래 안 쓴 검색어부터 뺀다)
+SHOP_SEGMENTS_MAX = int(os.environ.get("POI_SHOP_SEGMENTS_MAX", "32"))
+
+# 공간 인덱스 격자 크기 (도 단위, 위도 0.005도 ≈ 550m)
+GRID_SIZE_DEG = 0.005
+METERS_PER_DEG_LAT = 111_320.0
+
+
+def _to_poi_frame(df: pd.DataFrame, layer: str) -> pd.DataFrame:
+    """레이어별 DataFrame을 공통 스키마로 맞춘다 (없는 컬럼은 None)."""
+    df = df.copy()
+    for c in POI_COLUMNS:
+        if c not in df.columns:
+            df[c] = None
+    df["layer"] = layer
+    df["lat"] = pd.to_numeric(df["lat"], errors="coerce")
+    df["lng"] = pd.to_numeric(df["lng"], errors="coerce")
+    df = df.dropna(subset=["lat", "lng"])
+    return df[POI_COLUMNS].reset_index(drop=True)
+
+
+def _grid_cells(lats: np.ndarray, lngs: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    return (
+        np.floor(lats / GRID_SIZE_DEG).astype(np.int64),
+        np.floor(lngs / GRID_SIZE_DEG).astype(np.int64),
+    )
+
+
+@dataclass(frozen=True)
+class PoiSegment:
+    """
+    같은 출처(파일, API 응답 등)에서 온 POI 묶음과 그 인덱스.
+    세그먼트 단위로 교체할 수 있어서, 일부 데이터만 바뀌면 그 부분만 다시 인덱싱한다.
+    """
+
+    key: str
+    df: pd.DataFrame
+    lat: np.ndarray
+    lng: np.ndarray
+    # 격자 셀 → 행 위치 배열
+    cells: dict[tuple[int, int], np.ndarray] = field(repr=False)
+    # 검색용 소문자 문자열 (이름 + 주소)
+    text: pd.Series = field(repr=False)
+    # 워커끼리 공유하는 세그먼트의 버전 토큰 (공유하지 않으면 None)
+    shared_token: Optional[str] = None
+
+
+def _to_indexed_frame(df: pd.DataFrame, layer: str) -> pd.DataFrame:
+    """공통 스키마 + 검색용 소문자 문자열(_text) 컬럼."""
+    df = _to_poi_frame(df, layer)
+    df["_text"] = (
+        df["name"].fillna("").astype(str)
+        + " "
+        + df["road_address"].fillna("").astype(str)
+        + " "
+        + df["jibun_address"].fillna("").astype(str)
+    ).str.lower()
+    return df
+
+
+def build_segment(
+    key: str,
+    df: pd.DataFrame,
+    layer: str,
+    shared_token: Optional[str] = None,
+) -> PoiSegment:
+    """
+    shared_token을 주면 변환된 프레임을 워커끼리 공유한다 (backend/shared_dataset.py).
+    같은 원본이면 같은 토큰을 줘야 한다.
+    """
+    if shared_token is not None:
+        full = shared_frame(f"poi:{key}", shared_token, lambda: _to_indexed_frame(df, layer))
+    else:
+        full = _to_indexed_frame(df, layer)
+    text = full["_text"]
+    df = full.drop(columns="_text")
+
+    lat = df["lat"].to_numpy(dtype=np.float64)
+    lng = df["lng"].to_numpy(dtype=np.float64)
+
+    cells: dict[tuple[int, int], np.ndarray] = {}
+    if len(df):
+        ci, cj = _grid_cells(lat, lng)
+        order = np.lexsort((cj, ci))
+        ci_sorted, cj_sorted = ci[order], cj[order]
+        boundaries = np.flatnonzero(
+            (np.diff(ci_sorted) != 0) | (np.diff(cj_sorted) != 0)
+        ) + 1
+        for chunk in np.split(order, boundaries):
+            cells[(int(ci[chunk[0]]), int(cj[chunk[0]]))] = chunk
+
+    return PoiSegment(
+        key=key, df=df, lat=lat, lng=lng, cells=cells, text=text, shared_token=shared_token
+    )
+
+
+class PoiStore:
+    """
+    휴지통 / 분리배출 장소 / 제로웨이스트 샵을 하나의 컬럼형 저장소로 관리한다.
+
+    세그먼트는 생성 후 바뀌지 않는다. 데이터를 바꿀 때는 with_segments()로
+    새 저장소를 만들고 통째로 교체하므로, 이미 저장소를 들고 있는 쪽은
+    기존 버전을 그대로 안전하게 쓸 수 있다.
+    """
+
+    def __init__(self, segments: Optional[dict[str, PoiSegment]] = None, version: int = 0):
+        self._segments: dict[str, PoiSegment] = dict(segments or {})
+        self._frame: Optional[pd.DataFrame] = None
+        self._layer_frames: dict[str, pd.DataFrame] = {}
+        # 세그먼트가 바뀔 때마다 1씩 증가 (캐시 키로 사용)
+        self.version = version
+
+    @property
+    def segments(self) -> dict[str, PoiSegment]:
+        return dict(self._segments)
+
+    def with_segments(
+        self,
+        updates: Iterable[PoiSegment] = (),
+        removed: Iterable[str] = (),
+    ) -> "PoiStore":
+        segments = dict(self._segments)
+        for key in removed:
+            segments.pop(key, None)
+        for seg in updates:
+            segments[seg.key] = seg
+        return PoiStore(segments, version=self.version + 1)
+
+    # ---- 전체 / 레이어 조회 ----
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        if self._frame is None:
+            frames = [seg.df for seg in self._segments.values() if len(seg.df)]
+            if frames:
+                self._frame = pd.concat(frames, ignore_index=True)
+            else:
+                self._frame = pd.DataFrame(columns=POI_COLUMNS)
+        return self._frame
+
+    @property
+    def layers(self) -> list[str]:
+        return sorted(self.frame["layer"].dropna().unique().tolist())
+
+    def layer_frame(self, layer: str) -> pd.DataFrame:
+        df = self._layer_frames.get(layer)
+        if df is None:
+            segs = [self._segments[k] for k in sorted(self._segments)
+                    if len(self._segments[k].df) and self._segments[k].df["layer"].iat[0] == layer]
+            if segs and all(seg.shared_token is not None for seg in segs):
+                # 레이어의 모든 세그먼트가 공유 데이터면 합친 결과도 워커끼리 공유
+                token = "|".join(seg.shared_token for seg in segs)
+                df = shared_frame(
+                    f"poi-layer:{layer}", token,
+                    lambda: pd.concat([seg.df for seg in segs], ignore_index=True),
+                )
+            elif segs:
+                df = pd.concat([seg.df for seg in segs], ignore_index=True)
+            else:
+                df = pd.DataFrame(columns=POI_COLUMNS)
+            self._layer_frames[layer] = df
+        return df
+
+    def _iter_segments(self, layers: Optional[Iterable[str]]):
+        wanted = set(layers) if layers is not None else None
+        for seg in self._segments.values():
+            if not len(seg.df):
+                continue
+            if wanted is not None and seg.df["layer"].iat[0] not in wanted:
+                continue
+            yield seg
+
+    # ---- 위치 / 텍스트 질의 ----
+
+    def _candidates_in_radius(
+        self, seg: PoiSegment, lat: float, lng: float, radius_m: float
+    ) -> np.ndarray:
+        d_lat = radius_m / METERS_PER_DEG_LAT
+        d_lng = radius_m / (METERS_PER_DEG_LAT * max(math.cos(math.radians(lat)), 1e-6))
+        i0, j0 = _grid_cells(np.array([lat - d_lat]), np.array([lng - d_lng]))
+        i1, j1 = _grid_cells(np.array([lat + d_lat]), np.array([lng + d_lng]))
+
+        chunks = []
+        for i in range(int(i0[0]), int(i1[0]) + 1):
+            for j in range(int(j0[0]), int(j1[0]) + 1):
+                rows = seg.cells.get((i, j))
+                if rows is not None:
+                    chunks.append(rows)
+        if not chunks:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(chunks)
+
+    @timed("poi_query")
+    def query(
+        self,
+        lat: float,
+        lng: float,
+        layers: Optional[Iterable[str]] = None,
+        types: Optional[Iterable[str]] = None,
+        radius_m: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        (lat, lng)에서 가까운 POI를 거리순으로 반환한다.
+        "반경 radius_m 안에서 layers/types에 해당하는 가장 가까운 limit개".
+        """
+        type_set = set(types) if types is not None else None
+        parts = []
+        for seg in self._iter_segments(layers):
+            if radius_m is not None:
+                rows = self._candidates_in_radius(seg, lat, lng, radius_m)
+            else:
+                rows = np.arange(len(seg.df))
+            if not len(rows):
+                continue
+
+            dist = haversine_distances_m(lat, lng, seg.lat[rows], seg.lng[rows])
+            keep = np.ones(len(rows), dtype=bool)
+            if radius_m is not None:
+                keep &= dist <= radius_m
+            if type_set is not None:
+                keep &= seg.df["type"].isin(type_set).to_numpy()[rows]
+            if not keep.any():
+                continue
+
+            part = seg.df.iloc[rows[keep]].copy()
+            part["distance_m"] = dist[keep]
+            parts.append(part)
+
+        if not parts:
+            return pd.DataFrame(columns=POI_COLUMNS + ["distance_m"])
+
+        result = pd.concat(parts, ignore_index=True)
+        if limit is not None and len(result) > limit:
+            top = np.argpartition(result["distance_m"].to_numpy(), limit - 1)[:limit]
+            result = result.iloc[top]
+        return result.sort_values("distance_m").reset_index(drop=True)
+
+    def search(self, keyword: str, layers: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """이름/주소에 keyword가 들어간 POI를 반환한다."""
+        kw = (keyword or "").strip().lower()
+        parts = []
+        for seg in self._iter_segments(layers):
+            if not kw:
+                parts.append(seg.df)
+                continue
+            mask = seg.text.str.contains(kw, regex=False).to_numpy()
+            if mask.any():
+                parts.append(seg.df[mask])
+        if not parts:
+            return pd.DataFrame(columns=POI_COLUMNS)
+        return pd.concat(parts, ignore_index=True)
+
+
+# ---- 프로세스 공용 저장소 ----
+
+_store_lock = threading.Lock()
+_store: Optional[PoiStore] = None
+# 버전 → 저장소. 지금 저장소와, 아직 누군가 들고 있는 예전 저장소만 남는다
+_stores_by_version: "weakref.WeakValueDictionary[int, PoiStore]" = weakref.WeakValueDictionary()
+
+
+def _trash_segment_key(path: str) -> str:
+    return f"{LAYER_TRASH}:{path}"
+
+
+def _trash_token(dataset: TrashDataset, path: str) -> str:
+    return f"{os.path.abspath(path)}:{dataset.signatures[path]}"
+
+
+def _build_default_store() -> PoiStore:
+    dataset = current_trash_dataset()
+    # 휴지통은 CSV 파일 단위로 세그먼트를 나눠서, 바뀐 파일만 다시 인덱싱할 수 있게 한다
+    trash_segments = [
+        build_segment(_trash_segment_key(path), df, LAYER_TRASH, _trash_token(dataset, path))
+        for path, df in sorted(dataset.frames.items())
+    ]
+    return PoiStore().with_segments(
+        trash_segments + [build_segment(LAYER_DROPOFF, get_dropoff_spots(), LAYER_DROPOFF)]
+    )
+
+
+def _on_trash_reload(dataset: TrashDataset, changed: list[str], removed: list[str]) -> None:
+    """휴지통 CSV가 바뀌면 해당 파일의 세그먼트만 교체한다."""
+    if _store is None:
+        return
+    update_poi_store(
+        [
+            build_segment(_trash_segment_key(p), dataset.frames[p], LAYER_TRASH, _trash_token(dataset, p))
+            for p in changed
+        ],
+        [_trash_segment_key(p) for p in removed],
+    )
+
+
+def get_poi_store() -> PoiStore:
+    """프로세스에서 하나만 만들어 공유하는 POI 저장소."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = _build_default_store()
+                _stores_by_version[_store.version] = _store
+    return _store
+
+
+def poi_store_at(version: int) -> PoiStore:
+    """
+    version에 해당하는 저장소. 버전별 캐시가 새로고침 중에도 그 버전의 데이터만 담도록 쓴다.
+    이미 교체되고 아무도 들고 있지 않은 버전이면 ValueError.
+    """
+    store = get_poi_store()
+    if store.version == version:
+        return store
+    store = _stores_by_version.get(version)
+    if store is None:
+        raise ValueError(f"POI 저장소 버전 {version}은(는) 더 이상 없어요 (현재 {get_poi_store().version}).")
+    return store
+
+
+def update_poi_store(
+    updates: Iterable[PoiSegment] = (),
+    removed: Iterable[str] = (),
+) -> PoiStore:
+    """세그먼트를 교체한 새 저장소를 만들어 원자적으로 바꿔 끼운다."""
+    global _store
+    with _store_lock:
+        base = _store if _store is not None else _build_default_store()
+        _store = base.with_segments(updates, removed)
+        _stores_by_version[_store.version] = _store
+        return _store
+
+
+add_reload_listener(_on_trash_reload)
+
+
+_shop_lock = threading.Lock()
+# 검색어 세그먼트 키, 최근에 쓴 순서
+_shop_keys: OrderedDict[str, None] = OrderedDict()
+
+
+def register_shops(query: str, shops: pd.DataFrame) -> PoiStore:
+    """
+    네이버 검색으로 찾은 샵을 저장소의 shop 레이어에 추가한다.
+    같은 검색어로 다시 찾으면 해당 세그먼트만 교체되고, 결과가 같으면 저장소를 바꾸지 않는다.
+    검색어 세그먼트는 최근 SHOP_SEGMENTS_MAX개만 남긴다.
+    """
+    if shops is None or shops.empty or "lat" not in shops.columns:
+        return get_poi_store()
+
+    df = shops.rename(columns={"title": "name", "category": "type", "address": "road_address"})
+    df = df.copy()
+    df["id"] = LAYER_SHOP + "-" + df["link"].fillna("").astype(str) + "-" + df["name"].astype(str)
+    key = f"{LAYER_SHOP}:{str(query).strip()}"
+
+    with _shop_lock:
+        store = get_poi_store()
+        existing = store.segments.get(key)
+        if key in _shop_keys:
+            _shop_keys.move_to_end(key)
+        else:
+            _shop_keys[key] = None
+        if existing is not None and existing.df["id"].tolist() == df["id"].tolist():
+            return store
+        evicted = []
+        while len(_shop_keys) > SHOP_SEGMENTS_MAX:
+            evicted.append(_shop_keys.popitem(last=False)[0])
+        return update_poi_store([build_segment(key, df, LAYER_SHOP)], evicted)
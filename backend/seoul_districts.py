@@ -0,0 +1,174 @@
+# backend/seoul_districts.py
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from backend import ROOT_DIR
+
+GEOJSON_PATH = ROOT_DIR / "data/recycle_link" / "서울_자치구_경계_2017.geojson"
+GU_NAME_KEY = "SIG_KOR_NM"
+
+# 점-다각형 판정 시 한 구를 위도 방향으로 나누는 띠(band) 개수
+N_BANDS = 256
+
+
+@lru_cache(maxsize=1)
+def read_seoul_geojson(path: Path = GEOJSON_PATH) -> dict:
+    """서울 자치구 경계 GeoJSON을 읽는다 (프로세스당 한 번)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _feature_rings(feature: dict) -> list[np.ndarray]:
+    geom = feature.get("geometry") or {}
+    gtype = geom.get("type")
+    coords = geom.get("coordinates") or []
+
+    if gtype == "Polygon":
+        polygons = [coords]
+    elif gtype == "MultiPolygon":
+        polygons = coords
+    else:
+        return []
+
+    # 외곽선/구멍 구분 없이 모든 링을 짝홀(even-odd) 규칙으로 처리
+    return [
+        np.asarray(ring, dtype=np.float64)[:, :2]
+        for poly in polygons
+        for ring in poly
+        if len(ring) >= 3
+    ]
+
+
+@dataclass(frozen=True)
+class DistrictShape:
+    name: str
+    # (min_lng, min_lat, max_lng, max_lat)
+    bbox: tuple[float, float, float, float]
+    # 띠별 변(edge) 목록: (k, 4) 배열 [x1, y1, x2, y2]
+    band_edges: tuple[np.ndarray, ...]
+    band_height: float
+
+    def band_of(self, lats: np.ndarray) -> np.ndarray:
+        b = np.floor((lats - self.bbox[1]) / self.band_height).astype(np.int64)
+        return np.clip(b, 0, len(self.band_edges) - 1)
+
+
+def _build_shape(name: str, rings: list[np.ndarray]) -> DistrictShape:
+    edges = np.concatenate(
+        [np.hstack([ring[:-1], ring[1:]]) for ring in rings if len(ring) >= 2]
+    )
+    xs = np.concatenate([edges[:, 0], edges[:, 2]])
+    ys = np.concatenate([edges[:, 1], edges[:, 3]])
+    bbox = (float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max()))
+    band_height = max((bbox[3] - bbox[1]) / N_BANDS, 1e-12)
+
+    # 각 변이 걸쳐 있는 띠 범위에 변을 등록
+    y_lo = np.minimum(edges[:, 1], edges[:, 3])
+    y_hi = np.maximum(edges[:, 1], edges[:, 3])
+    b_lo = np.floor((y_lo - bbox[1]) / band_height).astype(np.int64).clip(0, N_BANDS - 1)
+    b_hi = np.floor((y_hi - bbox[1]) / band_height).astype(np.int64).clip(0, N_BANDS - 1)
+    span = b_hi - b_lo + 1
+    edge_idx = np.repeat(np.arange(len(edges)), span)
+    offset_in_span = np.arange(span.sum()) - np.repeat(np.cumsum(span) - span, span)
+    band_idx = np.repeat(b_lo, span) + offset_in_span
+
+    order = np.argsort(band_idx, kind="stable")
+    counts = np.bincount(band_idx, minlength=N_BANDS)
+    grouped = np.split(edges[edge_idx[order]], np.cumsum(counts)[:-1])
+
+    return DistrictShape(
+        name=name,
+        bbox=bbox,
+        band_edges=tuple(grouped),
+        band_height=band_height,
+    )
+
+
+@lru_cache(maxsize=1)
+def load_district_shapes() -> tuple[DistrictShape, ...]:
+    """GeoJSON의 자치구 경계를 점-다각형 판정용 구조로 미리 변환해 둔다."""
+    shapes = []
+    for feat in read_seoul_geojson().get("features", []):
+        name = str((feat.get("properties") or {}).get(GU_NAME_KEY, "")).strip()
+        rings = _feature_rings(feat)
+        if name and rings:
+            shapes.append(_build_shape(name, rings))
+    return tuple(shapes)
+
+
+def district_names() -> list[str]:
+    return [s.name for s in load_district_shapes()]
+
+
+def _points_in_shape(shape: DistrictShape, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """shape 안에 있는 점이면 True (반직선 교차 횟수의 짝홀 판정)."""
+    inside = np.zeros(len(lats), dtype=bool)
+    bands = shape.band_of(lats)
+    order = np.argsort(bands, kind="stable")
+    uniq, starts = np.unique(bands[order], return_index=True)
+    ends = np.append(starts[1:], len(order))
+
+    for b, s, e in zip(uniq, starts, ends):
+        edges = shape.band_edges[b]
+        if not len(edges):
+            continue
+        rows = order[s:e]
+        py = lats[rows][:, None]
+        px = lngs[rows][:, None]
+        x1, y1, x2, y2 = edges[:, 0], edges[:, 1], edges[:, 2], edges[:, 3]
+
+        straddles = (y1 > py) != (y2 > py)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_cross = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+        crossings = np.count_nonzero(straddles & (px < x_cross), axis=1)
+        inside[rows] = (crossings % 2) == 1
+
+    return inside
+
+
+def assign_gu(lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """
+    좌표 배열마다 속한 자치구 이름을 반환한다. 서울 밖이면 None.
+    바운딩 박스로 후보를 먼저 거른 뒤, 후보 점만 다각형 판정을 한다.
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+    result = np.full(len(lats), None, dtype=object)
+    unassigned = np.ones(len(lats), dtype=bool)
+
+    for shape in load_district_shapes():
+        min_lng, min_lat, max_lng, max_lat = shape.bbox
+        cand = np.flatnonzero(
+            unassigned
+            & (lats >= min_lat)
+            & (lats <= max_lat)
+            & (lngs >= min_lng)
+            & (lngs <= max_lng)
+        )
+        if not len(cand):
+            continue
+        hit = cand[_points_in_shape(shape, lats[cand], lngs[cand])]
+        result[hit] = shape.name
+        unassigned[hit] = False
+
+    return result
+
+
+@lru_cache(maxsize=1)
+def district_centers() -> dict[str, tuple[float, float]]:
+    """자치구별 대표 좌표 (외곽선 꼭짓점 평균, (lat, lng))."""
+    centers = {}
+    for feat in read_seoul_geojson().get("features", []):
+        name = str((feat.get("properties") or {}).get(GU_NAME_KEY, "")).strip()
+        rings = _feature_rings(feat)
+        if name and rings:
+            outer = rings[0]
+            centers[name] = (float(outer[:, 1].mean()), float(outer[:, 0].mean()))
+    return centers
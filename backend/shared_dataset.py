@@ -0,0 +1,148 @@
+# backend/shared_dataset.py
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import logging
+import os
+from contextlib import contextmanager
+from typing import Callable
+
+import pandas as pd
+import pyarrow as pa
+
+from backend import ROOT_DIR
+from backend.metrics import counter
+
+try:
+    import fcntl  # 여러 워커가 같은 파일을 동시에 만들지 않도록 잠글 때 사용 (POSIX)
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# 여러 워커(Streamlit/uvicorn 프로세스)가 정규화된 데이터를 한 벌만 공유하기 위한 저장소.
+#
+# 처음 필요해진 워커가 DataFrame을 만들어 Arrow IPC 파일로 한 번 기록하고,
+# 모든 워커(만든 워커 포함)는 그 파일을 mmap으로 붙여서 읽는다.
+# 숫자 컬럼과 문자열 컬럼 모두 OS 페이지 캐시를 공유하므로 워커 수가 늘어도
+# 상주 메모리는 거의 늘지 않는다.
+#
+# 버전 확인: 파일 이름에 (key, token, SCHEMA_VERSION)의 해시가 들어간다.
+# token은 원본 파일의 (mtime, size)처럼 내용이 바뀌면 달라지는 값이라,
+# 원본이 바뀌면 각 워커가 새 이름을 계산해서 자연히 새 파일을 찾거나 만든다.
+# 정규화 코드가 바뀌면 SCHEMA_VERSION을 올린다.
+
+SCHEMA_VERSION = 2
+
+# 비워 두면("") 공유하지 않고 프로세스마다 직접 만든다.
+# 여기 있는 파일은 검사 없이 mmap으로 붙으므로, 다른 사용자가 쓸 수 있는 곳(/tmp 등)은 기본값으로 쓰지 않는다.
+SHARED_DATA_DIR = os.environ.get("SHARED_DATA_DIR", str(ROOT_DIR / "build" / "shared"))
+
+_attached = counter("shared_dataset_attach_total", "shared dataset artifacts attached via mmap")
+_built = counter("shared_dataset_build_total", "shared dataset artifacts built by this process")
+
+
+def ensure_shared_dir(directory: str | None = None) -> str:
+    """
+    공유 폴더를 (없으면 0700으로) 만들고, 이 사용자 소유이며 다른 사용자가 쓸 수 없는지 확인한다.
+    믿을 수 없는 폴더면 PermissionError (호출한 쪽은 공유 없이 직접 만든다).
+    """
+    directory = directory or SHARED_DATA_DIR
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if hasattr(os, "getuid"):
+        st = os.stat(directory)
+        if st.st_uid != os.getuid() or st.st_mode & 0o022:
+            raise PermissionError(
+                f"공유 데이터 폴더의 소유자/권한이 안전하지 않아요 (내 소유, 다른 사용자 쓰기 금지여야 함): {directory}"
+            )
+    return directory
+
+
+def _key_prefix(key: str) -> str:
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def artifact_path(key: str, token: str) -> str:
+    version = hashlib.sha1(f"{SCHEMA_VERSION}:{token}".encode("utf-8")).hexdigest()[:16]
+    return os.path.join(SHARED_DATA_DIR, f"{_key_prefix(key)}-{version}.arrow")
+
+
+@contextmanager
+def _build_lock(key: str):
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(SHARED_DATA_DIR, f"{_key_prefix(key)}.lock"), "a+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _to_table(df: pd.DataFrame) -> pa.Table:
+    # 청크가 여러 개거나 null 비트맵이 있으면 읽을 때 복사가 생긴다.
+    # 한 청크로 합치고, 실수 컬럼은 NaN을 null로 바꾸지 않고 그대로 저장한다.
+    table = pa.Table.from_pandas(df, preserve_index=False).combine_chunks()
+    for i, name in enumerate(table.column_names):
+        if pd.api.types.is_float_dtype(df[name].dtype):
+            values = pa.array(df[name].to_numpy(dtype="float64"), from_pandas=False)
+            table = table.set_column(i, table.field(i).with_nullable(True), values)
+    return table
+
+
+def _write(df: pd.DataFrame, path: str) -> None:
+    table = _to_table(df)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    # 다른 워커는 완성된 파일만 보도록 rename으로 한 번에 공개
+    os.replace(tmp, path)
+
+
+def _remove_stale(key: str, keep: str) -> None:
+    """같은 key의 이전 버전 파일 삭제. 이미 붙어 있는 워커는 unlink 후에도 계속 읽을 수 있다."""
+    for path in glob.glob(os.path.join(SHARED_DATA_DIR, f"{_key_prefix(key)}-*.arrow")):
+        if path != keep:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def attach(path: str) -> pd.DataFrame:
+    """Arrow 파일을 mmap으로 열어 (복사 없이) DataFrame으로 만든다."""
+    source = pa.memory_map(path, "r")
+    table = pa.ipc.open_file(source).read_all()
+    # split_blocks: 컬럼을 하나의 2차원 블록으로 합치면서 생기는 복사를 피한다
+    return table.to_pandas(split_blocks=True)
+
+
+def shared_frame(key: str, token: str, build: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """
+    key/token에 해당하는 공유 DataFrame을 반환한다.
+    아직 아무 워커도 만들지 않았으면 build()로 만들어 공개한 뒤 붙인다.
+    """
+    if not SHARED_DATA_DIR:
+        return build()
+
+    path = artifact_path(key, token)
+    try:
+        ensure_shared_dir()
+        if not os.path.exists(path):
+            with _build_lock(key):
+                # 잠금을 기다리는 동안 다른 워커가 만들었을 수 있다
+                if not os.path.exists(path):
+                    _write(build(), path)
+                    _built.inc()
+                    _remove_stale(key, keep=path)
+        df = attach(path)
+    except (OSError, pa.ArrowException) as e:
+        # 공유 디렉터리를 쓸 수 없으면 프로세스 안에서만 사용
+        logger.warning("공유 데이터 사용 실패, 직접 로드합니다 (%s): %s", key, e)
+        return build()
+
+    _attached.inc()
+    return df
@@ -1,14 +1,26 @@
+import os
 import requests
 import pandas as pd
 import re
 import streamlit as st
 
+from backend.metrics import timed
+from backend.single_flight import SingleFlight
+
 try:
     CLIENT_ID = st.secrets["NAVER_CLIENT_ID"]
     CLIENT_SECRET = st.secrets["NAVER_CLIENT_SECRET"]
 except Exception:
-    CLIENT_ID = ""
-    CLIENT_SECRET = ""
+    # Streamlit 밖(API 서버 등)에서는 환경 변수 사용
+    CLIENT_ID = os.environ.get("NAVER_CLIENT_ID", "")
+    CLIENT_SECRET = os.environ.get("NAVER_CLIENT_SECRET", "")
+
+# 부하 테스트 등에서 로컬 스텁 서버로 바꿀 수 있도록 환경 변수로 덮어쓸 수 있음
+NAVER_LOCAL_SEARCH_URL = os.environ.get(
+    "NAVER_LOCAL_SEARCH_URL", "https://openapi.naver.com/v1/search/local.json"
+)
+
+_flight = SingleFlight()
 
 def clean_html(text):
     """API 결과에 섞인 <b> 태그 등을 제거하는 함수"""
@@ -18,6 +30,14 @@ def clean_html(text):
     cleantext = re.sub(cleanr, '', text)
     return cleantext
 
+def _to_wgs84(value):
+    """네이버 지역 검색의 mapx/mapy(WGS84 좌표 x 10^7 정수)를 도 단위로 변환"""
+    try:
+        return int(value) / 1e7
+    except (TypeError, ValueError):
+        return None
+
+@timed("naver_search")
 def get_shops_by_location(location):
     """
     지역명을 받아 제로웨이스트 샵 정보를 반환합니다.
@@ -26,7 +46,7 @@ def get_shops_by_location(location):
         return pd.DataFrame()
     
     query = f"{location} 제로웨이스트"
-    url = "https://openapi.naver.com/v1/search/local.json"
+    url = NAVER_LOCAL_SEARCH_URL
     
     headers = {
         "X-Naver-Client-Id": CLIENT_ID,
@@ -40,7 +60,8 @@ def get_shops_by_location(location):
     }
 
     try:
-        response = requests.get(url, headers=headers, params=params)
+        # 같은 지역 검색이 동시에 몰리면 네이버 API는 한 번만 호출
+        response = _flight.do(query, requests.get, url, headers=headers, params=params)
         
         if response.status_code != 200:
             st.error(f"🚨 API 호출 에러 발생! (코드: {response.status_code})")
@@ -59,7 +80,9 @@ def get_shops_by_location(location):
                 'title': clean_html(item['title']),
                 'category': clean_html(item['category']),
                 'address': item['roadAddress'] if item['roadAddress'] else item['address'],
-                'link': item['link']
+                'link': item['link'],
+                'lat': _to_wgs84(item.get('mapy')),
+                'lng': _to_wgs84(item.get('mapx')),
             })
         
         return pd.DataFrame(shop_list)
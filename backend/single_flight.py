@@ -0,0 +1,89 @@
+# backend/single_flight.py
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    같은 key로 동시에 들어온 호출을 하나로 합친다.
+    먼저 들어온 호출(리더)만 실제로 실행하고, 나머지는 그 결과를 기다렸다가 같이 받는다.
+    결과를 저장(캐시)하지는 않는다. 실행이 끝나면 다음 호출은 다시 실행된다.
+
+    스레드에서는 do(), asyncio 코루틴에서는 do_async()를 쓴다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._tasks: dict[tuple[int, Hashable], asyncio.Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., T], *args, **kwargs) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def do_async(
+        self,
+        key: Hashable,
+        fn: Callable[..., Awaitable[T]],
+        *args,
+        **kwargs,
+    ) -> T:
+        loop = asyncio.get_running_loop()
+        task_key = (id(loop), key)
+
+        task = self._tasks.get(task_key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._tasks[task_key] = task
+
+            def _cleanup(t: asyncio.Future):
+                self._tasks.pop(task_key, None)
+                # 기다리던 쪽이 모두 취소돼도 "예외를 읽지 않음" 경고가 나지 않도록
+                if not t.cancelled():
+                    t.exception()
+
+            task.add_done_callback(_cleanup)
+
+        # 기다리던 한 요청이 취소돼도 공유 작업은 계속 진행
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """현재 실행 중인 key 개수."""
+        with self._lock:
+            return len(self._calls) + len(self._tasks)
@@ -0,0 +1,365 @@
+# backend/snapshots.py
+
+from __future__ import annotations
+
+import bisect
+import datetime as dt
+import glob
+import json
+import logging
+import os
+import re
+import sys
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from backend.data_quality import _distances_m, text_keys
+from backend.metrics import counter, timed
+
+logger = logging.getLogger(__name__)
+
+# 휴지통 데이터의 날짜별 스냅샷 저장소 (시점 조회 + 스냅샷 간 비교).
+#
+# 파일 이름 끝의 날짜(..._20241226.csv)를 스냅샷 날짜로 본다. 지도/목록은 지금처럼
+# data/trash의 최신 파일만 쓰고, 지난 파일은 data/trash/archive/에 두면 이력에만 들어간다.
+#
+# 저장 방식 (열 기반 + 델타):
+# - 모든 스냅샷에 한 번이라도 나온 휴지통 행을 id 기준으로 한 번만 저장하는 행 표(bins)
+#   id는 출처 + 내용 해시라서, 안 바뀐 휴지통은 몇 달치 스냅샷에서도 한 행만 차지한다.
+# - 출처(자치구 파일)마다 날짜순 버전 목록. 각 버전은 직전 버전 대비 추가/삭제된 행 번호(int32)만 갖고,
+#   KEYFRAME_EVERY 버전마다 전체 행 번호를 같이 저장해서 복원할 때 되짚는 델타 수를 제한한다.
+# - 버전은 추가만 된다 (같은 출처에 더 이른 날짜는 넣을 수 없다).
+
+TRASH_ARCHIVE_GLOB = os.environ.get("TRASH_ARCHIVE_GLOB", "data/trash/archive/*.csv")
+
+KEYFRAME_EVERY = int(os.environ.get("SNAPSHOT_KEYFRAME_EVERY", "12"))
+
+# 같은 휴지통(종류/이름/상세위치 동일)이 이 거리 이상 옮겨졌으면 "이동"으로 본다
+MOVED_MIN_M = float(os.environ.get("SNAPSHOT_MOVED_MIN_M", "5"))
+
+_appended = counter("snapshot_append_total", "bin snapshots appended to the history store")
+
+_DATE_RE = re.compile(r"_(\d{8})$")
+
+
+def snapshot_date(path: str) -> dt.date:
+    """파일 이름의 날짜 (없으면 파일 수정 날짜)."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    match = _DATE_RE.search(stem)
+    if match:
+        return dt.datetime.strptime(match.group(1), "%Y%m%d").date()
+    return dt.date.fromtimestamp(os.path.getmtime(path))
+
+
+def parse_date(value) -> dt.date:
+    """'2025-01-31' / '20250131' / date → date."""
+    if isinstance(value, dt.datetime):
+        return value.date()
+    if isinstance(value, dt.date):
+        return value
+    text = str(value).strip()
+    for fmt in ("%Y-%m-%d", "%Y%m%d"):
+        try:
+            return dt.datetime.strptime(text, fmt).date()
+        except ValueError:
+            pass
+    raise ValueError(f"날짜 형식이 올바르지 않아요: {value} (예: 2025-01-31)")
+
+
+@dataclass(frozen=True)
+class _Version:
+    date: dt.date
+    # 직전 버전 대비 (행 번호, 정렬됨)
+    added: np.ndarray
+    removed: np.ndarray
+    # KEYFRAME_EVERY 버전마다 전체 행 번호
+    keyframe: Optional[np.ndarray] = None
+
+
+@dataclass
+class SnapshotDiff:
+    start: Optional[dt.date]
+    end: dt.date
+    added: pd.DataFrame
+    removed: pd.DataFrame
+    # from_lat/from_lng/lat/lng/moved_m + 이후 버전의 나머지 컬럼
+    moved: pd.DataFrame
+    summary: list[dict] = field(default_factory=list)
+
+
+def _union(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.union1d(a, b).astype(np.int32, copy=False)
+
+
+def _setdiff(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.setdiff1d(a, b, assume_unique=True).astype(np.int32, copy=False)
+
+
+class SnapshotStore:
+    """출처별 날짜 스냅샷을 델타로 보관한다 (스레드 안전, 추가만 가능)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 행 표: 청크 목록 + 합친 결과(필요할 때 다시 합침)
+        self._chunks: list[pd.DataFrame] = []
+        self._bins: Optional[pd.DataFrame] = None
+        self._row_count = 0
+        # 행 표의 id (청크별) + 조회용 인덱스(필요할 때 다시 만듦)
+        self._ids: list[np.ndarray] = []
+        self._id_index: Optional[pd.Index] = None
+        self._versions: dict[str, list[_Version]] = {}
+        self._files: set[tuple[str, dt.date]] = set()
+        # 출처별 마지막 버전의 전체 행 번호 (추가할 때 델타 계산용)
+        self._latest: dict[str, np.ndarray] = {}
+
+    # ---- 추가 ----
+
+    def append(self, source: str, date, df: pd.DataFrame) -> bool:
+        """
+        출처의 date 스냅샷(정규화된 DataFrame)을 추가한다.
+        이미 있는 (출처, 날짜)면 건너뛰고 False, 마지막 날짜보다 이르면 ValueError.
+        """
+        date = parse_date(date)
+        with self._lock:
+            versions = self._versions.setdefault(source, [])
+            if versions and date <= versions[-1].date:
+                if (source, date) in self._files:
+                    return False
+                raise ValueError(
+                    f"{source}: {versions[-1].date} 이후 날짜만 추가할 수 있어요 (받은 날짜 {date})."
+                )
+            rows = self._intern(df)
+            prev = self._latest.get(source, rows[:0])
+            keyframe = rows if len(versions) % KEYFRAME_EVERY == 0 else None
+            versions.append(_Version(date, _setdiff(rows, prev), _setdiff(prev, rows), keyframe))
+            self._latest[source] = rows
+            self._files.add((source, date))
+        _appended.inc()
+        return True
+
+    def _intern(self, df: pd.DataFrame) -> np.ndarray:
+        """df의 행을 행 표에 (없는 id만) 넣고, 각 행의 행 번호(정렬, 중복 없음)를 돌려준다."""
+        ids = df["id"].to_numpy(dtype=np.int64)
+        if self._id_index is None:
+            self._id_index = pd.Index(np.concatenate(self._ids) if self._ids else np.empty(0, np.int64))
+        rows = self._id_index.get_indexer(ids)
+        new = rows < 0
+        if new.any():
+            fresh = df[new].drop_duplicates(subset=["id"]).reset_index(drop=True)
+            fresh_ids = fresh["id"].to_numpy(dtype=np.int64)
+            rows[new] = self._row_count + pd.Index(fresh_ids).get_indexer(ids[new])
+            self._row_count += len(fresh)
+            self._chunks.append(fresh)
+            self._ids.append(fresh_ids)
+            self._bins = None
+            self._id_index = None
+        return np.unique(rows).astype(np.int32)
+
+    # ---- 복원 ----
+
+    def _members(self, versions: list[_Version], index: int) -> np.ndarray:
+        """versions[index] 시점의 전체 행 번호 (가장 가까운 키프레임부터 델타를 적용)."""
+        start = index
+        while versions[start].keyframe is None:
+            start -= 1
+        members = versions[start].keyframe
+        for version in versions[start + 1 : index + 1]:
+            members = _union(_setdiff(members, version.removed), version.added)
+        return members
+
+    def _table(self) -> pd.DataFrame:
+        if self._bins is None:
+            self._bins = (
+                pd.concat(self._chunks, ignore_index=True) if self._chunks else pd.DataFrame()
+            )
+        return self._bins
+
+    def _rows_as_of(self, date: dt.date) -> dict[str, np.ndarray]:
+        out = {}
+        for source, versions in self._versions.items():
+            index = bisect.bisect_right([v.date for v in versions], date) - 1
+            if index >= 0:
+                out[source] = self._members(versions, index)
+        return out
+
+    def _frame(self, rows: np.ndarray, gu: Optional[str]) -> pd.DataFrame:
+        df = self._table().take(rows).reset_index(drop=True)
+        if gu and gu != "전체":
+            df = df[df["gu"] == gu].reset_index(drop=True)
+        return df
+
+    # ---- 조회 ----
+
+    def sources(self) -> list[dict]:
+        """출처별 스냅샷 날짜와 건수."""
+        with self._lock:
+            return [
+                {
+                    "source": source,
+                    "dates": [v.date.isoformat() for v in versions],
+                    "rows": int(len(self._latest[source])),
+                }
+                for source, versions in sorted(self._versions.items())
+            ]
+
+    @timed("snapshot_as_of")
+    def as_of(self, date, gu: Optional[str] = None) -> pd.DataFrame:
+        """date 당시(출처마다 그 날짜 이전의 가장 최근 스냅샷) 휴지통 목록."""
+        date = parse_date(date)
+        with self._lock:
+            by_source = self._rows_as_of(date)
+            rows = np.concatenate(list(by_source.values())) if by_source else np.empty(0, np.int32)
+            return self._frame(np.sort(rows), gu)
+
+    @timed("snapshot_diff")
+    def diff(self, start, end, gu: Optional[str] = None) -> SnapshotDiff:
+        """
+        start → end 사이 바뀐 휴지통. 종류/이름/상세위치가 같은 휴지통이
+        삭제+추가됐고 MOVED_MIN_M 이상 떨어져 있으면 "이동"으로 묶는다.
+        """
+        start_date, end_date = parse_date(start), parse_date(end)
+        if end_date < start_date:
+            raise ValueError("비교 끝 날짜가 시작 날짜보다 빨라요.")
+        with self._lock:
+            before = self._rows_as_of(start_date)
+            after = self._rows_as_of(end_date)
+            added_rows, removed_rows = [], []
+            for source in sorted(set(before) | set(after)):
+                a = before.get(source, np.empty(0, np.int32))
+                b = after.get(source, np.empty(0, np.int32))
+                added_rows.append(_setdiff(b, a))
+                removed_rows.append(_setdiff(a, b))
+            added = self._frame(np.concatenate(added_rows or [np.empty(0, np.int32)]), None)
+            removed = self._frame(np.concatenate(removed_rows or [np.empty(0, np.int32)]), None)
+
+        added, removed, moved = _pair_moves(added, removed)
+        if gu and gu != "전체":
+            added, removed = added[added["gu"] == gu], removed[removed["gu"] == gu]
+            moved = moved[moved["gu"] == gu]
+        return SnapshotDiff(
+            start=start_date, end=end_date,
+            added=added.reset_index(drop=True),
+            removed=removed.reset_index(drop=True),
+            moved=moved.reset_index(drop=True),
+            summary=_summary(added, removed, moved),
+        )
+
+
+def _identity(df: pd.DataFrame) -> pd.Series:
+    return text_keys(df["type"]) + "|" + text_keys(df["name"]) + "|" + text_keys(df["detail"])
+
+
+def _pair_moves(added: pd.DataFrame, removed: pd.DataFrame):
+    """같은 (종류, 이름, 상세위치)의 삭제/추가를 등장 순서대로 짝지어 이동으로 분리한다."""
+    if added.empty or removed.empty:
+        moved = added.iloc[:0].assign(from_lat=[], from_lng=[], moved_m=[])
+        return added, removed, moved
+
+    a = pd.DataFrame({"key": _identity(added), "a": np.arange(len(added))})
+    r = pd.DataFrame({"key": _identity(removed), "r": np.arange(len(removed))})
+    a["n"] = a.groupby("key").cumcount()
+    r["n"] = r.groupby("key").cumcount()
+    pairs = a.merge(r, on=["key", "n"])
+
+    to_ = added.iloc[pairs["a"].to_numpy()]
+    from_ = removed.iloc[pairs["r"].to_numpy()]
+    dist = _distances_m(
+        from_["lat"].to_numpy(), from_["lng"].to_numpy(), to_["lat"].to_numpy(), to_["lng"].to_numpy()
+    )
+    # 내용(주소 등)만 바뀐 건 이동이 아니라 삭제+추가로 둔다
+    is_move = dist >= MOVED_MIN_M
+    pairs = pairs[is_move]
+
+    moved = added.iloc[pairs["a"].to_numpy()].reset_index(drop=True)
+    moved.insert(0, "from_lng", removed["lng"].to_numpy()[pairs["r"].to_numpy()])
+    moved.insert(0, "from_lat", removed["lat"].to_numpy()[pairs["r"].to_numpy()])
+    moved["moved_m"] = dist[is_move]
+
+    keep_a = np.ones(len(added), dtype=bool)
+    keep_a[pairs["a"].to_numpy()] = False
+    keep_r = np.ones(len(removed), dtype=bool)
+    keep_r[pairs["r"].to_numpy()] = False
+    return added[keep_a], removed[keep_r], moved
+
+
+def _summary(added: pd.DataFrame, removed: pd.DataFrame, moved: pd.DataFrame) -> list[dict]:
+    """자치구별 추가/삭제/이동 수."""
+    counts = pd.DataFrame(
+        {
+            "added": added["gu"].value_counts(),
+            "removed": removed["gu"].value_counts(),
+            "moved": moved["gu"].value_counts(),
+        }
+    ).fillna(0).astype(int)
+    counts.index.name = "gu"
+    return counts.sort_index().reset_index().to_dict(orient="records")
+
+
+# ---- 파일에서 채우기 ----
+
+_store = SnapshotStore()
+_sync_lock = threading.Lock()
+
+
+def snapshot_paths() -> list[str]:
+    from backend.trash_can_info import TRASH_CSV_GLOB
+
+    paths = set(glob.glob(TRASH_CSV_GLOB)) | set(glob.glob(TRASH_ARCHIVE_GLOB))
+    return sorted(paths)
+
+
+def get_snapshot_store() -> SnapshotStore:
+    """data/trash(현재) + archive(지난 스냅샷) 파일을 날짜순으로 반영한 저장소. 새 파일만 추가로 읽는다."""
+    from backend.shared_dataset import shared_frame
+    from backend.trash_can_info import (
+        TRASH_CSV_GLOB,
+        _file_signature,
+        _normalize_trash_csv,
+        _read_trash_csv,
+        _signature_token,
+        source_key,
+    )
+
+    with _sync_lock:
+        live = set(glob.glob(TRASH_CSV_GLOB))
+        pending = sorted(
+            ((snapshot_date(p), source_key(p), p) for p in snapshot_paths()),
+        )
+        for date, source, path in pending:
+            if (source, date) in _store._files:
+                continue
+            # 현재 파일은 지도/목록용 로드와 같은 공유 결과를 쓴다.
+            # 지난 스냅샷은 현재 파일과 출처가 같으므로 품질 보고서를 남기지 않는다 (현재 보고서를 덮어씀)
+            read = _read_trash_csv if path in live else (lambda p: _normalize_trash_csv(p)[0])
+            df = shared_frame(
+                f"trash:{os.path.abspath(path)}", _signature_token(_file_signature(path)),
+                lambda path=path, read=read: read(path),
+            )
+            try:
+                _store.append(source, date, df)
+            except ValueError as e:
+                logger.warning("스냅샷을 추가하지 못했어요 (%s): %s", path, e)
+    return _store
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    python -m backend.snapshots                       # 출처별 스냅샷 목록
+    python -m backend.snapshots 2025-01-01 2025-09-01 # 두 시점 비교 요약
+    """
+    args = argv if argv is not None else sys.argv[1:]
+    store = get_snapshot_store()
+    if len(args) >= 2:
+        diff = store.diff(args[0], args[1])
+        print(json.dumps(diff.summary, ensure_ascii=False, indent=2))
+    else:
+        print(json.dumps(store.sources(), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
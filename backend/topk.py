@@ -0,0 +1,146 @@
+# backend/topk.py
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, TypeVar
+
+import numpy as np
+import pandas as pd
+
+from backend.metrics import counter
+
+# 목록 페이지용 부분 정렬.
+# 전체를 정렬하지 않고 지금까지 보여준 만큼만 정렬해 두고(정렬된 앞부분),
+# 다음 페이지가 필요하면 남은 행에서 argpartition으로 필요한 만큼만 골라 정렬해 이어 붙인다.
+# 결과 순서는 (key, 원래 위치) 기준 안정 정렬과 같다.
+
+T = TypeVar("T")
+
+_extended = counter("topk_extend_total", "top-k pager prefix extensions")
+
+
+def _stable_order(keys: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """positions를 (key, position) 순으로 정렬한 결과."""
+    return positions[np.lexsort((positions, keys[positions]))]
+
+
+class TopKPager:
+    """
+    keys(작을수록 앞)로 정렬된 순서를 필요한 만큼만 계산해서 페이지로 돌려준다.
+    한 질의(필터 조건)마다 하나를 만들어 캐시해 두면 "더 보기" 때 이미 정렬한 부분은 다시 정렬하지 않는다.
+    여러 세션이 같은 객체를 공유해도 되도록 잠금으로 보호한다.
+    """
+
+    def __init__(self, keys: np.ndarray):
+        keys = np.asarray(keys)
+        if keys.dtype.kind == "f":
+            # NaN(거리 없음 등)은 맨 뒤로
+            keys = np.where(np.isnan(keys), np.inf, keys)
+        self._keys = keys
+        self._lock = threading.Lock()
+        # 정렬이 끝난 앞부분 (원래 위치) / 아직 정렬하지 않은 나머지
+        self._prefix = np.empty(0, dtype=np.intp)
+        self._rest = np.arange(len(keys), dtype=np.intp)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def sorted_count(self) -> int:
+        return len(self._prefix)
+
+    def _extend_to(self, n: int) -> None:
+        """정렬된 앞부분을 최소 n개로 늘린다 (잠금 안에서 호출)."""
+        if n <= len(self._prefix):
+            return
+        # 남은 행 전체를 훑는 비용(O(전체))이 페이지마다 들지 않도록 앞부분을 두 배씩 늘린다
+        need = min(max(n, 2 * len(self._prefix)), len(self._keys)) - len(self._prefix)
+        _extended.inc()
+        rest = self._rest
+        if need >= len(rest):
+            chosen, rest = _stable_order(self._keys, rest), rest[:0]
+        else:
+            rest_keys = self._keys[rest]
+            kth = rest_keys[np.argpartition(rest_keys, need - 1)[need - 1]]
+            # argpartition은 경계값과 같은 key를 임의로 고르므로,
+            # kth 이하인 행을 모두 후보로 모아 안정 정렬한 뒤 need개만 가져간다
+            chosen = _stable_order(self._keys, rest[rest_keys <= kth])[:need]
+            taken = np.zeros(len(self._keys), dtype=bool)
+            taken[chosen] = True
+            rest = rest[~taken[rest]]
+        self._prefix = np.concatenate([self._prefix, chosen])
+        self._rest = rest
+
+    def head(self, n: int) -> np.ndarray:
+        """정렬 순서상 앞의 n개 위치."""
+        with self._lock:
+            self._extend_to(n)
+            return self._prefix[:n].copy()
+
+    def slice(self, start: int, stop: int) -> np.ndarray:
+        """정렬 순서상 [start, stop) 구간의 위치 (offset/limit 페이지)."""
+        if start < 0 or stop < start:
+            raise ValueError("페이지 범위가 올바르지 않아요.")
+        with self._lock:
+            self._extend_to(stop)
+            return self._prefix[start:stop].copy()
+
+    def page(self, page: int, page_size: int) -> np.ndarray:
+        """0부터 시작하는 page번째 페이지의 위치."""
+        if page < 0 or page_size <= 0:
+            raise ValueError("페이지 번호는 0 이상, 페이지 크기는 1 이상이어야 해요.")
+        return self.slice(page * page_size, (page + 1) * page_size)
+
+    def count_le(self, value: float, at_least: int = 0) -> int:
+        """
+        정렬 순서상 key <= value인 앞부분의 길이 (최소 at_least개까지는 정렬해 둔다).
+        정렬된 앞부분의 마지막 key가 value를 넘을 때까지 두 배씩 늘린다.
+        """
+        with self._lock:
+            n = max(at_least, 1)
+            while True:
+                self._extend_to(n)
+                prefix_keys = self._keys[self._prefix]
+                if len(self._prefix) == len(self._keys) or prefix_keys[-1] > value:
+                    return int(np.searchsorted(prefix_keys, value, side="right"))
+                n = len(self._prefix) * 2
+
+
+def rank_of(df: pd.DataFrame, by: list[str]) -> np.ndarray:
+    """
+    by 컬럼 기준 안정 정렬(결측은 맨 뒤)에서 각 행의 순위.
+    데이터 버전마다 한 번만 계산해 두면 부분집합은 순위만 골라 TopKPager에 넘기면 된다.
+    """
+    sort_keys = [np.arange(len(df))]
+    for col in reversed(by):
+        codes, uniques = pd.factorize(df[col], sort=True)
+        sort_keys.append(np.where(codes < 0, len(uniques), codes))
+    order = np.lexsort(sort_keys)
+    rank = np.empty(len(df), dtype=np.int64)
+    rank[order] = np.arange(len(df), dtype=np.int64)
+    return rank
+
+
+class LruCache:
+    """질의별 TopKPager 등을 최근 사용 순으로 max_entries개까지 보관 (스레드 안전)."""
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._items: OrderedDict[Hashable, object] = OrderedDict()
+
+    def get(self, key: Hashable, build: Callable[[], T]) -> T:
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+        # 만드는 동안은 잠그지 않는다 (동시에 만들면 먼저 넣은 쪽을 쓴다)
+        value = build()
+        with self._lock:
+            value = self._items.setdefault(key, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return value
@@ -3,20 +3,32 @@
 from __future__ import annotations
 
 import glob
+import io
+import logging
 import math
+import os
+import re
+import threading
+import time
 from dataclasses import dataclass
-from functools import lru_cache
-from typing import Iterable, Literal, Optional
+from typing import Callable, Optional
 
+import numpy as np
 import pandas as pd
 
-GuName = Literal["마포구", "구로구", "노원구", "서초구", "성북구", "중랑구"]
+from backend.csv_schema import FIELDS, CsvSchema, apply_schema, content_hash, detect_schema, schema_for
+from backend.data_quality import QualityReport, validate_frame, write_report
+from backend.metrics import timed
+from backend.shared_dataset import shared_frame
+from backend.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
 class TrashCan:
-    id: str
-    gu: GuName
+    id: int
+    gu: str
     name: str
     road_address: Optional[str]
     jibun_address: Optional[str]
@@ -26,88 +38,263 @@ class TrashCan:
     type: Optional[str] = None
 
 
-# CSV → 공통 컬럼명 매핑 후보
-COL_MAP = {
-    "gu": ["시군구명", "자치구명", "구명"],
-    "name": ["설치장소명", "휴지통설치장소", "설치 장소명"],
-    "road_address": ["소재지도로명주소", "도로명주소"],
-    "jibun_address": ["소재지지번주소", "지번주소"],
-    "lat": ["위도", "Y좌표", "Y좌표(WGS84)"],
-    "lng": ["경도", "X좌표", "X좌표(WGS84)"],
-    "detail": ["상세위치", "세부위치", "비고"],
-    "type": ["휴지통종류", "용도구분"],
-}
-
+# id는 JS Number로도 정확히 표현되도록 53비트 양의 정수로 만든다
+ID_MASK = (1 << 53) - 1
 
-def _find_first_existing_column(df: pd.DataFrame, candidates: Iterable[str]) -> Optional[str]:
-    for c in candidates:
-        if c in df.columns:
-            return c
-    return None
 
+def source_key(path: str) -> str:
+    """
+    파일 경로에서 스냅샷 날짜를 뗀 출처 이름.
+    예: data/trash/서울특별시_구로구_휴지통_20241226.csv → 서울특별시_구로구_휴지통
+    같은 자치구 파일이 새 날짜로 교체돼도 id가 유지되도록 날짜는 빼고 쓴다.
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return re.sub(r"_\d{8}$", "", stem)
 
-def _normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
-    rename_map = {}
-    for key, candidates in COL_MAP.items():
-        col = _find_first_existing_column(df, candidates)
-        if col:
-            rename_map[col] = key
-
-    df = df.rename(columns=rename_map)
 
-    # 위도/경도 필수
-    if "lat" not in df.columns or "lng" not in df.columns:
-        raise ValueError("위도/경도 컬럼을 찾을 수 없어요. CSV 컬럼명을 확인해 주세요.")
+def make_stable_ids(df: pd.DataFrame, source: str) -> np.ndarray:
+    """
+    출처 + 행 내용(이름/주소/좌표)의 해시로 id를 만든다 (한 번의 벡터 연산).
+    행 순서나 다른 파일 추가와 무관하게 같은 휴지통은 같은 id를 갖는다.
+    내용이 완전히 같은 행은 등장 순서로 구분한다.
+    """
+    key = pd.DataFrame(
+        {
+            "source": source,
+            "name": df["name"].astype("string"),
+            "road_address": df["road_address"].astype("string"),
+            "jibun_address": df["jibun_address"].astype("string"),
+            "lat": df["lat"].round(7).to_numpy(),
+            "lng": df["lng"].round(7).to_numpy(),
+        }
+    )
+    content_hash = pd.util.hash_pandas_object(key, index=False).to_numpy()
+    occurrence = pd.Series(content_hash).groupby(content_hash).cumcount().to_numpy()
+    ids = pd.util.hash_pandas_object(
+        pd.DataFrame({"h": content_hash, "n": occurrence}), index=False
+    ).to_numpy()
+    return (ids & np.uint64(ID_MASK)).astype(np.int64)
 
-    # 필요한 컬럼만 추출 (없으면 NaN으로 채워짐)
-    needed_cols = ["gu", "name", "road_address", "jibun_address", "lat", "lng", "detail", "type"]
-    for c in needed_cols:
-        if c not in df.columns:
-            df[c] = None
 
-    df = df[needed_cols]
+def normalize_with_report(
+    df: pd.DataFrame, source: str = "", schema: Optional[CsvSchema] = None
+) -> tuple[pd.DataFrame, QualityReport]:
+    """
+    컬럼 정리 + 좌표 검증/중복 제거 (data_quality) + id 생성. 검증 결과 보고서도 같이 돌려준다.
+    schema가 없으면 헤더/표본 행으로 컬럼 매핑과 좌표계를 감지한다 (csv_schema).
+    """
+    if schema is None:
+        schema = detect_schema(df)
 
-    # 숫자 변환
-    df["lat"] = pd.to_numeric(df["lat"], errors="coerce")
-    df["lng"] = pd.to_numeric(df["lng"], errors="coerce")
-    df = df.dropna(subset=["lat", "lng"])
+    # 표준 컬럼만 추출 (없는 필드는 None), 좌표는 WGS84 위경도로 변환
+    df = apply_schema(df, schema)
+    needed_cols = list(FIELDS)
 
-    # 구 필터 (우리가 쓸 6개만)
-    valid_gu = {"마포구", "구로구", "노원구", "서초구", "성북구", "중랑구"}
-    df = df[df["gu"].isin(valid_gu)]
+    # 좌표 숫자 변환, 뒤바뀐 위도/경도 복구, 서울 밖 제거, 근접 중복 제거.
+    # 자치구는 CSV 값 대신 좌표가 속한 경계 폴리곤으로 판정한다.
+    df, report = validate_frame(df, source)
 
-    # 인덱스로 id 생성
+    # 출처 + 내용 해시로 안정적인 정수 id 생성
     df = df.reset_index(drop=True)
-    df["id"] = df.index.map(lambda i: f"{df.loc[i, 'gu']}-{i}")
+    df["id"] = make_stable_ids(df, source)
 
     # 컬럼 순서 정리
     df = df[["id"] + needed_cols]
 
+    return df, report
+
+
+def _normalize_dataframe(df: pd.DataFrame, source: str = "") -> pd.DataFrame:
+    return normalize_with_report(df, source)[0]
+
+
+TRASH_CSV_GLOB = "data/trash/*.csv"
+
+# 백그라운드 폴링 간격 (초)
+RELOAD_INTERVAL_S = float(os.environ.get("TRASH_RELOAD_INTERVAL_S", "30"))
+
+
+@dataclass(frozen=True)
+class TrashDataset:
+    """
+    한 시점의 휴지통 데이터 스냅샷. 생성 후에는 바뀌지 않는다.
+    새 데이터는 항상 새 스냅샷으로 만들어 교체하므로, 이전 스냅샷을 들고 있는
+    세션은 끝날 때까지 그대로 사용할 수 있다.
+    """
+
+    version: int
+    # 파일 경로 → (mtime_ns, size)
+    signatures: dict[str, tuple[int, int]]
+    # 파일 경로 → 정규화된 DataFrame
+    frames: dict[str, pd.DataFrame]
+    df: pd.DataFrame
+    # id → df 안의 행 위치 (세션/캐시에 저장된 id로 행을 다시 찾을 때 사용)
+    id_lookup: pd.Series
+
+
+def _read_raw_csv(path: str) -> tuple[pd.DataFrame, CsvSchema]:
+    """CSV 원본과 그 스키마. 스키마는 파일 내용 해시별로 캐시돼서 같은 파일이면 다시 분석하지 않는다."""
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        df = pd.read_csv(io.BytesIO(data), encoding="utf-8-sig")
+    except UnicodeDecodeError:
+        df = pd.read_csv(io.BytesIO(data), encoding="cp949")
+    return df, schema_for(content_hash(data), lambda: df)
+
+
+def _normalize_trash_csv(path: str) -> tuple[pd.DataFrame, QualityReport]:
+    """CSV 파일 → (정규화된 DataFrame, 검증 보고서). 보고서는 저장하지 않는다."""
+    raw, schema = _read_raw_csv(path)
+    return normalize_with_report(raw, source=source_key(path), schema=schema)
+
+
+@timed("trash_csv_load")
+def _read_trash_csv(path: str) -> pd.DataFrame:
+    # 지금 쓰는 파일만 보고서를 남긴다 (지난 스냅샷은 출처가 같아서 덮어쓰면 안 됨)
+    df, report = _normalize_trash_csv(path)
+    write_report(report)
     return df
 
 
-@lru_cache(maxsize=1)
+def _file_signature(path: str) -> tuple[int, int]:
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _signature_token(signature) -> str:
+    """공유 데이터의 버전 토큰 (원본 파일 시그니처가 같으면 워커끼리 같은 값)."""
+    return repr(signature)
+
+
+def _combine_frames(frames: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    all_df = pd.concat([frames[p] for p in sorted(frames)], ignore_index=True)
+    # 혹시 중복 id가 있으면 제거
+    return all_df.drop_duplicates(subset=["id"]).reset_index(drop=True)
+
+
+_dataset_lock = threading.Lock()
+# 리스너 알림 순서 보장용: 스냅샷을 바꾼 순서대로 알린다
+_notify_lock = threading.Lock()
+_dataset: Optional[TrashDataset] = None
+_reload_listeners: list[Callable[[TrashDataset, list[str], list[str]], None]] = []
+_reloader_thread: Optional[threading.Thread] = None
+_load_flight = SingleFlight()
+
+
+def add_reload_listener(
+    listener: Callable[[TrashDataset, list[str], list[str]], None],
+) -> None:
+    """
+    데이터가 바뀔 때마다 listener(새 스냅샷, 바뀐 파일 목록, 삭제된 파일 목록)를 호출한다.
+    """
+    if listener not in _reload_listeners:
+        _reload_listeners.append(listener)
+
+
+def refresh_trash_cans() -> tuple[TrashDataset, list[str], list[str]]:
+    """
+    data/trash 폴더를 다시 훑어서 새로 생기거나 바뀐 CSV만 다시 정규화한다.
+    바뀐 게 있으면 새 스냅샷을 만들어 원자적으로 교체한다.
+    동시에 여러 세션이 호출해도(콜드 스타트 등) 실제 로드는 한 번만 한다.
+    """
+    return _load_flight.do("refresh", _refresh_trash_cans)
+
+
+def _refresh_trash_cans() -> tuple[TrashDataset, list[str], list[str]]:
+    global _dataset
+
+    with _dataset_lock:
+        csv_paths = sorted(glob.glob(TRASH_CSV_GLOB))
+        if not csv_paths:
+            raise FileNotFoundError(f"{TRASH_CSV_GLOB} 경로에서 CSV 파일을 찾을 수 없어요.")
+
+        old = _dataset
+        old_sigs = old.signatures if old else {}
+        signatures = {p: _file_signature(p) for p in csv_paths}
+
+        changed = [p for p in csv_paths if old_sigs.get(p) != signatures[p]]
+        removed = [p for p in old_sigs if p not in signatures]
+        if old is not None and not changed and not removed:
+            return old, [], []
+
+        # 정규화 결과는 워커끼리 공유 (다른 워커가 이미 만들었으면 mmap으로 붙기만 한다)
+        frames = {p: f for p, f in (old.frames if old else {}).items() if p in signatures}
+        for path in changed:
+            frames[path] = shared_frame(
+                f"trash:{os.path.abspath(path)}", _signature_token(signatures[path]),
+                lambda path=path: _read_trash_csv(path),
+            )
+
+        all_df = shared_frame(
+            "trash:all", _signature_token(
+                sorted((os.path.abspath(p), sig) for p, sig in signatures.items())
+            ),
+            lambda: _combine_frames(frames),
+        )
+        _dataset = TrashDataset(
+            version=(old.version + 1) if old else 1,
+            signatures=signatures,
+            frames=frames,
+            df=all_df,
+            id_lookup=pd.Series(np.arange(len(all_df)), index=all_df["id"].to_numpy()),
+        )
+        dataset = _dataset
+        # 스냅샷 잠금을 풀기 전에 알림 잠금을 잡아서, 다음 새로고침의 알림이 앞지르지 못하게 한다
+        # (리스너는 스냅샷 잠금 밖에서 호출)
+        _notify_lock.acquire()
+
+    try:
+        for listener in list(_reload_listeners):
+            listener(dataset, changed, removed)
+    finally:
+        _notify_lock.release()
+    return dataset, changed, removed
+
+
+def current_trash_dataset() -> TrashDataset:
+    """현재 스냅샷 (처음 호출 시 로드)."""
+    if _dataset is None:
+        refresh_trash_cans()
+    return _dataset
+
+
+def start_trash_reloader(interval_s: float = RELOAD_INTERVAL_S) -> None:
+    """
+    CSV 변경을 주기적으로 확인하는 백그라운드 스레드를 (프로세스당 한 번) 시작한다.
+    """
+    global _reloader_thread
+
+    if interval_s <= 0 or (_reloader_thread is not None and _reloader_thread.is_alive()):
+        return
+
+    def _loop():
+        while True:
+            time.sleep(interval_s)
+            try:
+                refresh_trash_cans()
+            except Exception:  # 폴링 실패는 다음 주기에 다시 시도
+                logger.exception("휴지통 데이터 새로고침 실패")
+
+    _reloader_thread = threading.Thread(target=_loop, name="trash-reloader", daemon=True)
+    _reloader_thread.start()
+
+
+@timed("load_trash_cans")
 def load_trash_cans() -> pd.DataFrame:
     """
-    data/trash 폴더 내의 모든 CSV를 읽어서 하나의 DataFrame으로 합친다.
+    data/trash 폴더 내의 모든 CSV를 하나로 합친 현재 스냅샷의 DataFrame.
     """
-    csv_paths = glob.glob("data/trash/*.csv")
-    if not csv_paths:
-        raise FileNotFoundError("data/trash/*.csv 경로에서 CSV 파일을 찾을 수 없어요.")
+    return current_trash_dataset().df
 
-    frames = []
-    for path in csv_paths:
-        try:
-            df_raw = pd.read_csv(path, encoding="utf-8-sig")
-        except UnicodeDecodeError:
-            df_raw = pd.read_csv(path, encoding="cp949")
-        df_norm = _normalize_dataframe(df_raw)
-        frames.append(df_norm)
 
-    all_df = pd.concat(frames, ignore_index=True)
-    # 혹시 중복 id가 있으면 제거
-    all_df = all_df.drop_duplicates(subset=["id"]).reset_index(drop=True)
-    return all_df
+def lookup_trash_can(bin_id: int) -> Optional[pd.Series]:
+    """id로 현재 스냅샷의 휴지통 행을 찾는다. 없어졌으면 None."""
+    dataset = current_trash_dataset()
+    pos = dataset.id_lookup.get(bin_id)
+    if pos is None:
+        return None
+    return dataset.df.iloc[int(pos)]
 
 
 def get_trash_cans() -> pd.DataFrame:
@@ -115,7 +302,7 @@ def get_trash_cans() -> pd.DataFrame:
     return load_trash_cans().copy()
 
 
-def filter_by_gu(df: pd.DataFrame, gu: Optional[GuName | str]) -> pd.DataFrame:
+def filter_by_gu(df: pd.DataFrame, gu: Optional[str]) -> pd.DataFrame:
     if gu is None or gu == "전체":
         return df
     return df[df["gu"] == gu]
@@ -166,6 +353,28 @@ def haversine_distance_m(lat1: float, lng1: float, lat2: float, lng2: float) ->
     return EARTH_RADIUS * c
 
 
+def haversine_distances_m(
+    center_lat: float,
+    center_lng: float,
+    lats: np.ndarray,
+    lngs: np.ndarray,
+) -> np.ndarray:
+    """
+    중심점에서 여러 점까지의 거리(미터)를 한 번에 계산한다 (numpy 벡터 연산).
+    """
+    lats = np.radians(np.asarray(lats, dtype=np.float64))
+    lngs = np.radians(np.asarray(lngs, dtype=np.float64))
+    c_lat = math.radians(center_lat)
+    c_lng = math.radians(center_lng)
+
+    a = (
+        np.sin((lats - c_lat) / 2) ** 2
+        + math.cos(c_lat) * np.cos(lats) * np.sin((lngs - c_lng) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+@timed("annotate_distance")
 def annotate_distance(
     df: pd.DataFrame,
     center_lat: float,
@@ -176,13 +385,39 @@ def annotate_distance(
     주어진 중심점으로부터의 거리를 계산해 DataFrame에 추가한다.
     """
     df = df.copy()
-    df[col_name] = df.apply(
-        lambda row: haversine_distance_m(center_lat, center_lng, row["lat"], row["lng"]),
-        axis=1,
+    df[col_name] = haversine_distances_m(
+        center_lat, center_lng, df["lat"].to_numpy(), df["lng"].to_numpy()
     )
     return df
 
 
+def refine_nearest(
+    df_sorted: pd.DataFrame,
+    center_lat: float,
+    center_lng: float,
+    limit: int,
+    error_m: float,
+    col_name: str = "distance_m",
+) -> pd.DataFrame:
+    """
+    근사 기준점(예: 위치 셀 중심)으로 거리순 정렬된 df에서
+    실제 위치 기준으로 가장 가까운 limit개를 정확히 구한다.
+
+    실제 위치가 근사 기준점에서 error_m 이내라면 두 거리의 차도 error_m 이내이므로,
+    근사 거리가 (limit번째 근사 거리 + 2 * error_m) 이하인 행만 다시 계산하면 된다.
+    """
+    if df_sorted.empty or limit <= 0:
+        return df_sorted.head(0)
+
+    approx = df_sorted[col_name].to_numpy(dtype=np.float64)
+    k = min(limit, len(approx))
+    n_candidates = int(np.searchsorted(approx, approx[k - 1] + 2 * error_m, side="right"))
+
+    candidates = annotate_distance(df_sorted.iloc[:n_candidates], center_lat, center_lng, col_name)
+    return candidates.sort_values(col_name, kind="stable").head(limit)
+
+
+@timed("find_nearby")
 def find_nearby(
     df: pd.DataFrame,
     center_lat: float,
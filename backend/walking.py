@@ -0,0 +1,408 @@
+# backend/walking.py
+
+from __future__ import annotations
+
+import bz2
+import gzip
+import hashlib
+import heapq
+import logging
+import math
+import os
+import shutil
+import threading
+import xml.etree.ElementTree as ET
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from backend import ROOT_DIR, geo_cell
+from backend.metrics import counter, timer
+from backend.shared_dataset import SHARED_DATA_DIR, ensure_shared_dir
+from backend.topk import LruCache
+
+logger = logging.getLogger(__name__)
+
+# 도보 거리 (선택 기능).
+# 직선거리로는 80m인 휴지통이 강/큰길 건너편이라 실제로는 400m를 걸어야 할 수 있다.
+# 로컬 OSM 추출 파일(.osm / .osm.gz / .osm.bz2, XML)에서 보행 그래프를 만들어 두고,
+# 출발 위치 셀마다 거리 제한이 있는 다중 출발 Dijkstra를 한 번 돌려 결과를 LRU로 캐시한다.
+# 같은 셀의 사용자는 같은 결과를 공유하므로, 캐시된 셀에서는 후보 재정렬이 몇 ms 안에 끝난다.
+#
+# 파일이 없으면 기능이 꺼지고(load_walk_graph()가 None) 직선거리만 사용한다.
+# 그래프 배열은 SHARED_DATA_DIR에 .npy로 저장해 두고 mmap으로 읽어 워커끼리 공유한다.
+
+WALK_GRAPH_PATH = os.environ.get(
+    "WALK_GRAPH_PATH", str(ROOT_DIR / "data" / "osm" / "seoul-walk.osm")
+)
+# 이보다 멀리 걸어야 하는 휴지통은 "도보 거리 없음"으로 본다
+WALK_MAX_M = float(os.environ.get("WALK_MAX_M", "1500"))
+# 최근 출발 셀 몇 개의 Dijkstra 결과를 보관할지
+WALK_CACHE_SIZE = int(os.environ.get("WALK_CACHE_SIZE", "128"))
+# 출발 셀 크기: 정밀도 8 ≈ 38m x 19m (셀 중심을 출발점으로 쓰므로 이 정도 오차가 있다)
+WALK_CELL_PRECISION = 8
+
+# 그래프 생성 코드가 바뀌면 올린다
+GRAPH_FORMAT_VERSION = 1
+
+# 긴 길은 이 간격 이하로 중간 노드를 넣어, 점을 가장 가까운 노드에 붙여도 오차가 작게 한다
+DENSIFY_M = 25.0
+
+# 점 → 그래프 노드 연결: 가장 가까운 노드와 거리 차이가 SNAP_SLACK_M 이내인 노드 최대 SNAP_NODES개.
+# 멀리 있는 노드까지 붙이면 강/큰길 건너편 노드로 "순간 이동"할 수 있어서 여유를 작게 둔다.
+SNAP_NODES = 4
+SNAP_SLACK_M = 15.0
+SNAP_MAX_M = 150.0
+
+# 노드 격자 색인 칸 크기 (도)
+_GRID_DEG = 0.001
+_GRID_ROW = 400_000
+
+# 보행자가 다닐 수 없는 도로
+_NO_FOOT_HIGHWAYS = {
+    "motorway", "motorway_link", "trunk", "trunk_link",
+    "construction", "proposed", "raceway", "bus_guideway", "escape",
+}
+_NO_ACCESS = {"no", "private"}
+
+EARTH_RADIUS = 6371000.0  # meters
+
+_dijkstra_runs = counter("walk_dijkstra_total", "walking-distance Dijkstra runs (origin cache misses)")
+
+
+def _pair_distances_m(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """두 좌표 배열의 같은 위치끼리 거리(미터) - 하버사인."""
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(a, dtype=np.float64)) for a in (lat1, lng1, lat2, lng2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _grid_keys(lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+    iy = np.floor((np.asarray(lat) + 90.0) / _GRID_DEG).astype(np.int64)
+    ix = np.floor((np.asarray(lng) + 180.0) / _GRID_DEG).astype(np.int64)
+    return iy * _GRID_ROW + ix
+
+
+# ---- OSM → 보행 그래프 ----
+
+def _open_extract(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".bz2"):
+        return bz2.open(path, "rb")
+    return open(path, "rb")
+
+
+def _is_walkable(tags: dict[str, str]) -> bool:
+    highway = tags.get("highway")
+    if highway is None:
+        return False
+    foot = tags.get("foot")
+    if foot in _NO_ACCESS:
+        return False
+    if foot in ("yes", "designated", "permissive"):
+        return True
+    if highway in _NO_FOOT_HIGHWAYS:
+        return False
+    return tags.get("access") not in _NO_ACCESS
+
+
+def parse_osm(path: str) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    OSM XML에서 보행 가능한 길만 골라 (lat, lng, 간선 시작 노드, 간선 끝 노드)를 만든다.
+    노드 번호는 0부터 다시 매긴다.
+    """
+    coords: dict[int, tuple[float, float]] = {}
+    index: dict[int, int] = {}
+    src: list[int] = []
+    dst: list[int] = []
+
+    with _open_extract(path) as f:
+        refs: list[int] = []
+        tags: dict[str, str] = {}
+        for _, elem in ET.iterparse(f, events=("end",)):
+            tag = elem.tag
+            if tag == "node":
+                coords[int(elem.get("id"))] = (float(elem.get("lat")), float(elem.get("lon")))
+                tags = {}
+                elem.clear()
+            elif tag == "nd":
+                refs.append(int(elem.get("ref")))
+            elif tag == "tag":
+                tags[elem.get("k")] = elem.get("v")
+            elif tag in ("way", "relation"):
+                if tag == "way" and _is_walkable(tags):
+                    # 추출 범위 밖으로 잘린 노드가 있으면 그 구간은 잇지 않는다
+                    for a, b in zip(refs, refs[1:]):
+                        if a in coords and b in coords:
+                            src.append(index.setdefault(a, len(index)))
+                            dst.append(index.setdefault(b, len(index)))
+                refs, tags = [], {}
+                elem.clear()
+
+    lat = np.empty(len(index), dtype=np.float64)
+    lng = np.empty(len(index), dtype=np.float64)
+    for osm_id, i in index.items():
+        lat[i], lng[i] = coords[osm_id]
+    return lat, lng, np.asarray(src, dtype=np.int64), np.asarray(dst, dtype=np.int64)
+
+
+def densify(
+    lat: np.ndarray, lng: np.ndarray, src: np.ndarray, dst: np.ndarray, step_m: float = DENSIFY_M
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """step_m보다 긴 간선을 같은 길이의 짧은 간선들로 나눈다 (중간 노드 추가)."""
+    length = _pair_distances_m(lat[src], lng[src], lat[dst], lng[dst])
+    segs = np.maximum(1, np.ceil(length / step_m)).astype(np.int64)
+    extra = segs - 1
+    first_new = len(lat) + np.cumsum(extra) - extra  # 간선별 첫 중간 노드 번호
+
+    # 중간 노드 좌표
+    e_new = np.repeat(np.arange(len(src)), extra)
+    j = np.arange(int(extra.sum())) - np.repeat(first_new - len(lat), extra) + 1
+    frac = j / segs[e_new]
+    new_lat = lat[src[e_new]] + (lat[dst[e_new]] - lat[src[e_new]]) * frac
+    new_lng = lng[src[e_new]] + (lng[dst[e_new]] - lng[src[e_new]]) * frac
+
+    # 간선 e의 p번째 조각: (p == 0 ? src : 중간 p) → (p == segs-1 ? dst : 중간 p+1)
+    e_idx = np.repeat(np.arange(len(src)), segs)
+    p = np.arange(int(segs.sum())) - np.repeat(np.cumsum(segs) - segs, segs)
+    new_src = np.where(p == 0, src[e_idx], first_new[e_idx] + p - 1)
+    new_dst = np.where(p == segs[e_idx] - 1, dst[e_idx], first_new[e_idx] + p)
+    return (
+        np.concatenate([lat, new_lat]),
+        np.concatenate([lng, new_lng]),
+        new_src,
+        new_dst,
+    )
+
+
+def build_csr(
+    lat: np.ndarray, lng: np.ndarray, src: np.ndarray, dst: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """간선 목록 → 양방향 CSR (indptr, indices, 간선 길이 m)."""
+    length = _pair_distances_m(lat[src], lng[src], lat[dst], lng[dst]).astype(np.float32)
+    u = np.concatenate([src, dst])
+    v = np.concatenate([dst, src])
+    w = np.concatenate([length, length])
+    order = np.argsort(u, kind="stable")
+    indptr = np.zeros(len(lat) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(u, minlength=len(lat)), out=indptr[1:])
+    return indptr, v[order].astype(np.int32), w[order]
+
+
+_ARRAYS = ("lat", "lng", "indptr", "indices", "weights")
+
+
+class WalkGraph:
+    """CSR 보행 그래프 + 노드 격자 색인 + 출발 셀별 Dijkstra 캐시."""
+
+    def __init__(self, arrays: dict[str, np.ndarray], token: str):
+        self.lat = arrays["lat"]
+        self.lng = arrays["lng"]
+        self.indptr = arrays["indptr"]
+        self.indices = arrays["indices"]
+        self.weights = arrays["weights"]
+        self.token = token
+
+        keys = _grid_keys(self.lat, self.lng)
+        self._grid_order = np.argsort(keys, kind="stable")
+        self._grid_keys = keys[self._grid_order]
+
+        self._origins = LruCache(max_entries=WALK_CACHE_SIZE)
+        # 휴지통 좌표는 거의 바뀌지 않으므로 연결 결과를 넉넉히 보관
+        self._snaps = LruCache(max_entries=200_000)
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    def nearest_nodes(
+        self, lat: float, lng: float, k: int = SNAP_NODES, max_m: float = SNAP_MAX_M
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """(lat, lng)에서 max_m 이내의 가장 가까운 노드 k개와 거리."""
+        key = int(_grid_keys(np.array([lat]), np.array([lng]))[0])
+        cells = int(math.ceil(max_m / (_GRID_DEG * geo_cell.METERS_PER_DEG_LAT * math.cos(math.radians(lat)))))
+        parts = []
+        for dy in range(-cells, cells + 1):
+            row = key + dy * _GRID_ROW
+            lo = np.searchsorted(self._grid_keys, row - cells, side="left")
+            hi = np.searchsorted(self._grid_keys, row + cells, side="right")
+            if hi > lo:
+                parts.append(self._grid_order[lo:hi])
+        if not parts:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        nodes = np.concatenate(parts)
+        dist = _pair_distances_m(lat, lng, self.lat[nodes], self.lng[nodes])
+        near = dist <= max_m
+        if near.any():
+            near &= dist <= dist[near].min() + SNAP_SLACK_M
+        nodes, dist = nodes[near], dist[near]
+        order = np.argsort(dist, kind="stable")[:k]
+        return nodes[order], dist[order]
+
+    def _snap(self, lat: float, lng: float) -> tuple[np.ndarray, np.ndarray]:
+        return self._snaps.get((lat, lng), lambda: self.nearest_nodes(lat, lng))
+
+    def shortest_from(self, lat: float, lng: float, max_m: float = WALK_MAX_M) -> dict[int, float]:
+        """
+        (lat, lng) 근처 노드 여러 개를 (직선 접근 거리와 함께) 출발점으로 하는 Dijkstra.
+        max_m 안에 닿는 노드까지의 도보 거리만 담는다.
+        """
+        nodes, offsets = self._snap(lat, lng)
+        dist: dict[int, float] = {}
+        heap: list[tuple[float, int]] = []
+        for node, off in zip(nodes.tolist(), offsets.tolist()):
+            if off < dist.get(node, math.inf):
+                dist[node] = off
+                heap.append((off, node))
+        heapq.heapify(heap)
+
+        indptr, indices, weights = self.indptr, self.indices, self.weights
+        settled: set[int] = set()
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u in settled:
+                continue
+            settled.add(u)
+            a, b = int(indptr[u]), int(indptr[u + 1])
+            for v, w in zip(indices[a:b].tolist(), weights[a:b].tolist()):
+                nd = d + w
+                if nd <= max_m and nd < dist.get(v, math.inf):
+                    dist[v] = nd
+                    heapq.heappush(heap, (nd, v))
+        return dist
+
+    def origin_distances(self, lat: float, lng: float) -> dict[int, float]:
+        """출발 위치가 속한 셀 중심 기준 도보 거리 (셀별로 캐시)."""
+        cell = geo_cell.encode(lat, lng, WALK_CELL_PRECISION)
+
+        def run() -> dict[int, float]:
+            _dijkstra_runs.inc()
+            with timer("walk_dijkstra"):
+                return self.shortest_from(*geo_cell.cell_center(cell))
+
+        return self._origins.get(cell, run)
+
+    def walking_distances_m(
+        self, origin_lat: float, origin_lng: float, lats, lngs
+    ) -> np.ndarray:
+        """출발 위치에서 각 점까지의 도보 거리(m). 닿지 않거나 길에서 너무 먼 점은 NaN."""
+        from_origin = self.origin_distances(origin_lat, origin_lng)
+        out = np.full(len(lats), np.nan)
+        for i, (lat, lng) in enumerate(zip(np.asarray(lats, dtype=np.float64).tolist(),
+                                           np.asarray(lngs, dtype=np.float64).tolist())):
+            nodes, offsets = self._snap(lat, lng)
+            best = min(
+                (from_origin[n] + off for n, off in zip(nodes.tolist(), offsets.tolist()) if n in from_origin),
+                default=math.inf,
+            )
+            if best <= WALK_MAX_M:
+                out[i] = best
+        return out
+
+
+# ---- 로드 (워커끼리 공유) ----
+
+def _graph_token(path: str) -> str:
+    stat = os.stat(path)
+    raw = f"{GRAPH_FORMAT_VERSION}:{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _build_arrays(path: str) -> dict[str, np.ndarray]:
+    with timer("walk_graph_build"):
+        lat, lng, src, dst = parse_osm(path)
+        keep = src != dst
+        lat, lng, src, dst = densify(lat, lng, src[keep], dst[keep])
+        indptr, indices, weights = build_csr(lat, lng, src, dst)
+    return {"lat": lat, "lng": lng, "indptr": indptr, "indices": indices, "weights": weights}
+
+
+def _load_arrays(path: str, token: str) -> dict[str, np.ndarray]:
+    """저장해 둔 그래프 배열을 mmap으로 읽고, 없으면 만들어 저장한다."""
+    if not SHARED_DATA_DIR:
+        return _build_arrays(path)
+
+    cache_dir = os.path.join(SHARED_DATA_DIR, f"walk-{token}")
+    try:
+        ensure_shared_dir()
+        if not os.path.isdir(cache_dir):
+            arrays = _build_arrays(path)
+            tmp = f"{cache_dir}.{os.getpid()}.tmp"
+            os.makedirs(tmp, exist_ok=True)
+            for name in _ARRAYS:
+                np.save(os.path.join(tmp, f"{name}.npy"), arrays[name])
+            try:
+                os.rename(tmp, cache_dir)
+            except OSError:
+                # 다른 워커가 먼저 만들었다
+                shutil.rmtree(tmp, ignore_errors=True)
+        return {name: np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode="r") for name in _ARRAYS}
+    except OSError as e:
+        logger.warning("보행 그래프 캐시 사용 실패, 직접 만듭니다: %s", e)
+        return _build_arrays(path)
+
+
+_graph_lock = threading.Lock()
+_graph: Optional[WalkGraph] = None
+
+
+def load_walk_graph(path: Optional[str] = None) -> Optional[WalkGraph]:
+    """보행 그래프 (파일이 없으면 None). 파일이 바뀌면 다시 만든다."""
+    global _graph
+    path = path or WALK_GRAPH_PATH
+    try:
+        token = _graph_token(path)
+    except OSError:
+        return None
+
+    with _graph_lock:
+        if _graph is None or _graph.token != token:
+            _graph = WalkGraph(_load_arrays(path, token), token)
+        return _graph
+
+
+def walking_available() -> bool:
+    return os.path.exists(WALK_GRAPH_PATH)
+
+
+def rank_by_walking(
+    candidates: pd.DataFrame,
+    lat: float,
+    lng: float,
+    limit: int,
+    graph: Optional[WalkGraph] = None,
+    col_name: str = "walk_m",
+) -> pd.DataFrame:
+    """
+    후보(직선거리가 WALK_MAX_M 이내인 휴지통 전부)에 도보 거리를 붙여 가까운 limit개를 고른다.
+    도보 거리는 항상 직선거리 이상이므로 이 후보 밖에서 더 가까운 곳이 나올 수 없다.
+    길로 닿지 않는 곳(NaN)은 뒤로 보내고 직선거리순으로 채운다.
+    """
+    if graph is None:
+        graph = load_walk_graph()
+    df = candidates.copy()
+    if graph is None or df.empty:
+        df[col_name] = np.nan
+        return df.head(limit)
+
+    with timer("walk_rank"):
+        df[col_name] = graph.walking_distances_m(lat, lng, df["lat"].to_numpy(), df["lng"].to_numpy())
+        sort_cols = [col_name, "distance_m"] if "distance_m" in df.columns else [col_name]
+        return df.sort_values(sort_cols, kind="stable", na_position="last").head(limit)
+
+
+def main() -> None:
+    """배포 전에 보행 그래프 캐시를 미리 만든다: python -m backend.walking"""
+    graph = load_walk_graph()
+    if graph is None:
+        print(f"보행 그래프 파일이 없어요: {WALK_GRAPH_PATH}")
+        return
+    print(f"노드 {len(graph):,}개, 간선 {len(graph.indices):,}개 ({WALK_GRAPH_PATH})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# benchmarks/cases.py
+
+from __future__ import annotations
+
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import pandas as pd
+
+from backend import csv_schema, data_quality, item_lookup, shared_dataset, trash_can_info
+from backend.seoul_districts import read_seoul_geojson
+from backend.topk import TopKPager
+from backend.trash_can_info import (
+    _normalize_dataframe,
+    annotate_distance,
+    find_nearby,
+    search_by_keyword,
+)
+from benchmarks.synthetic import raw_trash_csv_frame
+
+# 벤치마크 기준 위치 (마포구청 근처)
+CENTER = (37.5663, 126.9019)
+
+
+@dataclass
+class Case:
+    """
+    setup(n)이 준비한 상태로 run(state)를 반복 측정한다.
+    max_size보다 큰 크기에서는 건너뛴다 (예: folium 마커 생성은 1M에서 비현실적).
+    """
+
+    name: str
+    setup: Callable[[int], object]
+    run: Callable[[object], object]
+    max_size: Optional[int] = None
+    teardown: Optional[Callable[[object], None]] = None
+
+
+_raw_cache: dict[int, pd.DataFrame] = {}
+_norm_cache: dict[int, pd.DataFrame] = {}
+
+
+def raw_frame(n: int) -> pd.DataFrame:
+    if n not in _raw_cache:
+        _raw_cache[n] = raw_trash_csv_frame(n)
+    return _raw_cache[n]
+
+
+def normalized_frame(n: int) -> pd.DataFrame:
+    if n not in _norm_cache:
+        _norm_cache[n] = _normalize_dataframe(raw_frame(n), source="bench")
+    return _norm_cache[n]
+
+
+# ---- load_trash_cans: 임시 폴더에 자치구별 CSV를 써두고 콜드 로드 측정 ----
+
+def _setup_csv_dir(n: int):
+    tmp = tempfile.TemporaryDirectory()
+    raw = raw_frame(n)
+    for gu, part in raw.groupby("시군구명"):
+        path = os.path.join(tmp.name, f"서울특별시_{gu}_휴지통_20250101.csv")
+        part.to_csv(path, index=False, encoding="utf-8-sig")
+    return tmp
+
+
+def _cold_load(tmp) -> pd.DataFrame:
+    saved = (
+        trash_can_info.TRASH_CSV_GLOB,
+        trash_can_info._dataset,
+        shared_dataset.SHARED_DATA_DIR,
+        data_quality.QUALITY_REPORT_DIR,
+        csv_schema.SCHEMA_CACHE_DIR,
+    )
+    trash_can_info.TRASH_CSV_GLOB = os.path.join(tmp.name, "*.csv")
+    trash_can_info._dataset = None
+    # 반복 측정이 공유 파일에 붙기만 하지 않도록 정규화부터 다시 한다
+    shared_dataset.SHARED_DATA_DIR = ""
+    # 합성 CSV는 실제 파일과 출처 이름이 같으므로 보고서/스키마 캐시를 임시 폴더에 쓴다
+    data_quality.QUALITY_REPORT_DIR = os.path.join(tmp.name, "quality")
+    csv_schema.SCHEMA_CACHE_DIR = os.path.join(tmp.name, "schemas")
+    try:
+        return trash_can_info.load_trash_cans()
+    finally:
+        (
+            trash_can_info.TRASH_CSV_GLOB,
+            trash_can_info._dataset,
+            shared_dataset.SHARED_DATA_DIR,
+            data_quality.QUALITY_REPORT_DIR,
+            csv_schema.SCHEMA_CACHE_DIR,
+        ) = saved
+
+
+# ---- 목록 / 검색 ----
+
+def _list_first_page(df: pd.DataFrame):
+    # 목록 첫 페이지 (거리순 20개): 전체 정렬 대신 부분 정렬
+    df = annotate_distance(df, *CENTER)
+    return df.iloc[TopKPager(df["distance_m"].to_numpy()).page(0, 20)]
+
+
+# ---- create_map 마커 생성 ----
+
+def _create_map(df: pd.DataFrame):
+    from views.seoul_trash_map import create_map
+
+    return create_map(df, center=CENTER, zoom=13)
+
+
+def _render_map(df: pd.DataFrame) -> str:
+    # 브라우저로 보내는 HTML 직렬화까지 포함
+    return _create_map(df).get_root().render()
+
+
+# ---- GeoJSON 중심점 ----
+
+def _centroids(geojson: dict):
+    from views.seoul_waste_request import _get_feature_centroid
+
+    return [_get_feature_centroid(f) for f in geojson.get("features", [])]
+
+
+# ---- 품목 이름 검색 ----
+
+_ITEM_QUERIES = [
+    "컵라면 용기", "pizza box", "페트병", "plastic bottles", "맥주캔",
+    "택배 상자", "우유팩", "비닐봉지", "건전지", "휴대폰",
+]
+
+
+def _item_queries(n: int) -> list[str]:
+    # 질의 n개 (캐시/인덱스 준비는 setup에서 끝낸다)
+    item_lookup.load_item_index()
+    return [_ITEM_QUERIES[i % len(_ITEM_QUERIES)] for i in range(n)]
+
+
+def _resolve_items(queries: list[str]):
+    return [item_lookup.resolve_item(q) for q in queries]
+
+
+CASES = [
+    Case("normalize_dataframe", raw_frame, lambda raw: _normalize_dataframe(raw, source="bench")),
+    Case("load_trash_cans", _setup_csv_dir, _cold_load, teardown=lambda tmp: tmp.cleanup()),
+    Case("search_by_keyword", normalized_frame, lambda df: search_by_keyword(df, "독막로")),
+    Case("annotate_distance", normalized_frame, lambda df: annotate_distance(df, *CENTER)),
+    Case("find_nearby", normalized_frame, lambda df: find_nearby(df, *CENTER, radius_m=500)),
+    Case("list_first_page", normalized_frame, _list_first_page),
+    Case("create_map", normalized_frame, _create_map, max_size=10_000),
+    Case("render_map", normalized_frame, _render_map, max_size=10_000),
+    # 자치구 경계는 실제 데이터 25개 고정 (크기와 무관)
+    Case("geojson_centroids", lambda n: read_seoul_geojson(), _centroids, max_size=1_000),
+    # n개 질의 일괄 조회 (초당 처리량 = n / 시간)
+    Case("item_lookup", _item_queries, _resolve_items, max_size=10_000),
+]
+
+
+def select(names: Optional[list[str]]) -> list[Case]:
+    if not names:
+        return CASES
+    wanted = set(names)
+    return [c for c in CASES if c.name in wanted]
@@ -0,0 +1,162 @@
+# benchmarks/run.py
+"""
+위치/검색 핫패스 벤치마크.
+
+    python -m benchmarks.run                                  # 1k / 100k / 1M 전체
+    python -m benchmarks.run --sizes 1k,100k --cases find_nearby
+    python -m benchmarks.run --output benchmarks/results/new.json \\
+        --baseline benchmarks/results/base.json --threshold 20
+
+--baseline을 주면 각 항목의 중앙값(median)을 비교해서
+--threshold(%)보다 느려진 항목이 있으면 종료 코드 1로 끝난다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.cases import select
+
+SIZE_ALIASES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+
+def parse_sizes(text: str) -> list[int]:
+    sizes = []
+    for token in text.split(","):
+        token = token.strip().lower()
+        if token:
+            sizes.append(SIZE_ALIASES.get(token) or int(token))
+    return sizes
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(case, n: int, repeat: int, min_time: float) -> dict:
+    state = case.setup(n)
+    try:
+        case.run(state)  # 워밍업 (캐시/임포트)
+        timings = []
+        started = time.perf_counter()
+        while len(timings) < repeat or (time.perf_counter() - started) < min_time:
+            t0 = time.perf_counter()
+            case.run(state)
+            timings.append(time.perf_counter() - t0)
+            if len(timings) >= repeat * 20:
+                break
+    finally:
+        if case.teardown is not None:
+            case.teardown(state)
+
+    return {
+        "case": case.name,
+        "size": n,
+        "repeats": len(timings),
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "mean_s": statistics.fmean(timings),
+    }
+
+
+def compare(results: list[dict], baseline: dict, threshold_pct: float) -> list[str]:
+    base = {(r["case"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        b = base.get((r["case"], r["size"]))
+        if b is None or not b["median_s"]:
+            continue
+        change = (r["median_s"] / b["median_s"] - 1.0) * 100
+        r["baseline_median_s"] = b["median_s"]
+        r["change_pct"] = round(change, 2)
+        if change > threshold_pct:
+            regressions.append(
+                f"{r['case']}@{r['size']}: {b['median_s'] * 1000:.2f}ms → "
+                f"{r['median_s'] * 1000:.2f}ms ({change:+.1f}%)"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--sizes", default="1k,100k,1m")
+    parser.add_argument("--cases", default="", help="쉼표로 구분한 케이스 이름 (기본: 전체)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.5, help="케이스당 최소 측정 시간(초)")
+    parser.add_argument("--output", default="", help="JSON 리포트 저장 경로")
+    parser.add_argument("--baseline", default="", help="비교할 이전 JSON 리포트")
+    parser.add_argument("--threshold", type=float, default=20.0, help="허용 느려짐 비율(%%)")
+    args = parser.parse_args(argv)
+
+    sizes = parse_sizes(args.sizes)
+    cases = select([c for c in args.cases.split(",") if c.strip()])
+
+    results = []
+    for case in cases:
+        for n in sizes:
+            if case.max_size is not None and n > case.max_size:
+                continue
+            r = measure(case, n, args.repeat, args.min_time)
+            results.append(r)
+            print(
+                f"{case.name:<22} n={n:>9,}  "
+                f"median {r['median_s'] * 1000:10.2f} ms  (x{r['repeats']})"
+            )
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "results": results,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        report["meta"]["baseline"] = args.baseline
+        report["meta"]["threshold_pct"] = args.threshold
+        report["regressions"] = regressions
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if regressions:
+        print(f"\n느려진 항목 ({args.threshold:.0f}% 초과):", file=sys.stderr)
+        for line in regressions:
+            print(f"  - {line}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+# benchmarks/synthetic.py
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from backend.seoul_districts import assign_gu
+
+# 서울 전체를 덮는 바운딩 박스 (lat_min, lat_max, lng_min, lng_max)
+SEOUL_BBOX = (37.413, 37.715, 126.764, 127.184)
+
+_PLACES = ["역", "버스정류장", "공원", "사거리", "시장", "주민센터", "초등학교", "교차로"]
+_ROADS = ["독막로", "양화로", "동일로", "서초대로", "보문로", "망우로", "경인로", "노해로"]
+_TYPES = ["일반쓰레기", "재활용쓰레기"]
+
+
+def seoul_points(n: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """서울 자치구 경계 안의 무작위 좌표 n개와 각 좌표의 자치구 이름."""
+    rng = np.random.default_rng(seed)
+    lats, lngs, gus = [], [], []
+    remaining = n
+    while remaining > 0:
+        batch = int(remaining * 1.8) + 16
+        lat = rng.uniform(SEOUL_BBOX[0], SEOUL_BBOX[1], batch)
+        lng = rng.uniform(SEOUL_BBOX[2], SEOUL_BBOX[3], batch)
+        gu = assign_gu(lat, lng)
+        inside = gu != None  # noqa: E711 (object 배열 비교)
+        lats.append(lat[inside][:remaining])
+        lngs.append(lng[inside][:remaining])
+        gus.append(gu[inside][:remaining])
+        remaining -= len(lats[-1])
+    return np.concatenate(lats), np.concatenate(lngs), np.concatenate(gus)
+
+
+def raw_trash_csv_frame(n: int, seed: int = 0) -> pd.DataFrame:
+    """data/trash CSV와 같은 한글 컬럼의 원본 DataFrame (정규화 전)."""
+    rng = np.random.default_rng(seed)
+    lat, lng, gu = seoul_points(n, seed)
+    place = rng.integers(0, len(_PLACES), n)
+    road = rng.integers(0, len(_ROADS), n)
+    num = rng.integers(1, 500, n)
+
+    places = np.array(_PLACES, dtype=object)[place]
+    roads = np.array(_ROADS, dtype=object)[road]
+    nums = num.astype(str).astype(object)
+
+    return pd.DataFrame(
+        {
+            "설치장소명": gu + " " + roads + " " + places + " " + nums + "번",
+            "시도명": "서울특별시",
+            "시군구명": gu,
+            "소재지도로명주소": "서울특별시 " + gu + " " + roads + " " + nums,
+            "소재지지번주소": None,
+            "위도": lat,
+            "경도": lng,
+            "세부위치": None,
+            "휴지통종류": np.array(_TYPES, dtype=object)[rng.integers(0, 2, n)],
+        }
+    )
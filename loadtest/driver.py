@@ -0,0 +1,214 @@
+# loadtest/driver.py
+"""
+동시 사용자 N명이 코칭(사진 업로드 → 품목 인식 → 배출 가이드)과
+제로웨이스트 샵 검색을 반복할 때의 처리량/지연 시간/에러 비율을 잰다.
+
+    # 스텁 서버를 같은 프로세스에서 띄워서 실행
+    python -m loadtest.driver --start-stubs --users 50 --duration 60
+
+    # 이미 떠 있는 스텁(python -m loadtest.stubs)이나 다른 주소를 사용
+    python -m loadtest.driver --stub-url http://127.0.0.1:8900 --users 20
+
+백엔드 모듈은 import할 때 엔드포인트/키를 읽으므로, 환경 변수를 먼저 설정한 뒤 import한다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+REGIONS = ["마포구", "용산구", "성동구", "종로구", "강남구", "서초구", "송파구", "관악구"]
+
+
+def _configure_env(stub_url: str) -> None:
+    base = stub_url.rstrip("/")
+    os.environ["AZURE_CV_ENDPOINT"] = f"{base}/customvision/predict"
+    os.environ["AZURE_CV_PREDICTION_KEY"] = "stub"
+    os.environ["AZURE_OPENAI_ENDPOINT"] = f"{base}/openai/v1"
+    os.environ["OPENAI_API_KEY"] = "stub"
+    os.environ["NAVER_LOCAL_SEARCH_URL"] = f"{base}/v1/search/local.json"
+    os.environ["NAVER_CLIENT_ID"] = "stub"
+    os.environ["NAVER_CLIENT_SECRET"] = "stub"
+
+
+def _start_stubs(host: str, port: int, args) -> None:
+    """스텁 서버를 백그라운드 스레드에서 띄우고 준비될 때까지 기다린다."""
+    import uvicorn
+
+    from loadtest.stubs import UpstreamProfile, create_app
+
+    def profile(latency_ms: float) -> UpstreamProfile:
+        return UpstreamProfile(latency_ms=latency_ms, jitter=args.jitter, error_rate=args.error_rate)
+
+    app = create_app(
+        vision=profile(args.vision_latency_ms),
+        llm=profile(args.llm_latency_ms),
+        naver=profile(args.naver_latency_ms),
+    )
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning", access_log=False))
+    threading.Thread(target=server.run, daemon=True).start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("스텁 서버가 10초 안에 시작되지 않았어요.")
+        time.sleep(0.05)
+
+
+@dataclass
+class FlowStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, seconds: float, ok: bool) -> None:
+        with self.lock:
+            self.latencies.append(seconds)
+            if not ok:
+                self.errors += 1
+
+    def report(self, elapsed_s: float) -> dict:
+        n = len(self.latencies)
+        lat = np.asarray(self.latencies) * 1000
+        return {
+            "requests": n,
+            "throughput_rps": n / elapsed_s if elapsed_s else 0.0,
+            "error_rate": self.errors / n if n else 0.0,
+            "p50_ms": float(np.percentile(lat, 50)) if n else None,
+            "p95_ms": float(np.percentile(lat, 95)) if n else None,
+            "p99_ms": float(np.percentile(lat, 99)) if n else None,
+            "max_ms": float(lat.max()) if n else None,
+        }
+
+
+def _coach_flow(image: bytes) -> bool:
+    from backend.call_custom_vision import call_custom_vision
+    from backend.call_openai_api import call_openai_api
+
+    cv_result = call_custom_vision(image)
+    if "error" in cv_result:
+        return False
+    guide = call_openai_api(cv_result["tag"], cv_result["probability"], "ko")
+    # ❌: 호출 에러, ⏳: 제한기가 거절 (둘 다 실패로 집계)
+    return not guide.startswith(("❌", "⏳"))
+
+
+def _shop_flow(region: str) -> bool:
+    from backend.shop_finder import get_shops_by_location
+
+    return not get_shops_by_location(region).empty
+
+
+def run(args) -> dict:
+    images = [os.urandom(2048) for _ in range(args.images)]
+    stats = {"coach": FlowStats(), "shop": FlowStats()}
+    stop_at = time.monotonic() + args.duration
+
+    def user(seed: int) -> None:
+        rng = random.Random(seed)
+        while time.monotonic() < stop_at:
+            if rng.random() < args.coach_ratio:
+                name, fn, arg = "coach", _coach_flow, rng.choice(images)
+            else:
+                name, fn, arg = "shop", _shop_flow, rng.choice(REGIONS)
+            start = time.perf_counter()
+            try:
+                ok = fn(arg)
+            except Exception:
+                ok = False
+            stats[name].record(time.perf_counter() - start, ok)
+            if args.think_ms:
+                time.sleep(rng.expovariate(1000 / args.think_ms))
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=user, args=(i,), daemon=True) for i in range(args.users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - started
+
+    from backend.metrics import counter_values, summary
+
+    return {
+        "users": args.users,
+        "duration_s": elapsed,
+        "flows": {name: s.report(elapsed) for name, s in stats.items()},
+        # 업스트림별 실제 호출 지연 (single-flight로 합쳐진 호출은 한 번만 잡힘)
+        "upstream": [
+            row for row in summary()
+            if row["name"].startswith(("custom_vision", "openai", "naver_search"))
+        ],
+        # 제한기가 거절한 요청 수 / 업스트림 429 수
+        "limiter": {
+            name: value for name, value in counter_values().items()
+            if name.endswith(("_shed_total", "_throttled_total"))
+        },
+        # 프롬프트/응답 토큰 합계
+        "tokens": {
+            name: value for name, value in counter_values().items()
+            if name.startswith("openai_") and "tokens" in name
+        },
+    }
+
+
+def _print_report(report: dict) -> None:
+    print(f"users={report['users']}  duration={report['duration_s']:.1f}s")
+    print(f"{'flow':<8}{'reqs':>8}{'rps':>9}{'err%':>8}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for name, r in report["flows"].items():
+        if not r["requests"]:
+            print(f"{name:<8}{0:>8}")
+            continue
+        print(
+            f"{name:<8}{r['requests']:>8}{r['throughput_rps']:>9.1f}{r['error_rate'] * 100:>7.1f}%"
+            f"{r['p50_ms']:>7.0f}ms{r['p95_ms']:>7.0f}ms{r['p99_ms']:>7.0f}ms"
+        )
+    for row in report["upstream"]:
+        print(f"  upstream {row['name']}: calls={row['count']} errors={row['errors']}")
+    for name, value in report["limiter"].items():
+        print(f"  limiter {name}: {value:.0f}")
+    for name, value in report["tokens"].items():
+        print(f"  {name}: {value:.0f}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20, help="동시 사용자 수 (스레드)")
+    parser.add_argument("--duration", type=float, default=30.0, help="실행 시간 (초)")
+    parser.add_argument("--coach-ratio", type=float, default=0.5, help="코칭 흐름 비율 (나머지는 샵 검색)")
+    parser.add_argument("--think-ms", type=float, default=500.0, help="요청 사이 평균 대기 시간 (지수 분포)")
+    parser.add_argument("--images", type=int, default=50, help="서로 다른 업로드 이미지 수")
+    parser.add_argument("--stub-url", default="http://127.0.0.1:8900")
+    parser.add_argument("--start-stubs", action="store_true", help="스텁 서버를 이 프로세스에서 띄움")
+    parser.add_argument("--vision-latency-ms", type=float, default=350)
+    parser.add_argument("--llm-latency-ms", type=float, default=2500)
+    parser.add_argument("--naver-latency-ms", type=float, default=120)
+    parser.add_argument("--jitter", type=float, default=0.4)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--output", help="JSON 보고서 경로")
+    args = parser.parse_args(argv)
+
+    _configure_env(args.stub_url)
+    if args.start_stubs:
+        from urllib.parse import urlparse
+
+        parsed = urlparse(args.stub_url)
+        _start_stubs(parsed.hostname or "127.0.0.1", parsed.port or 8900, args)
+
+    report = run(args)
+    _print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+# loadtest/stubs.py
+"""
+Azure Custom Vision / Azure OpenAI / 네이버 지역 검색을 흉내 내는 로컬 스텁 서버.
+응답 모양은 실제 API와 같고, 지연 시간 분포와 에러 비율을 설정할 수 있다.
+
+    python -m loadtest.stubs --port 8900 --latency-ms 300 --jitter 0.5 --error-rate 0.02
+
+    # 앱/드라이버가 스텁을 쓰도록 하는 환경 변수
+    AZURE_CV_ENDPOINT=http://127.0.0.1:8900/customvision/predict
+    AZURE_OPENAI_ENDPOINT=http://127.0.0.1:8900/openai/v1
+    NAVER_LOCAL_SEARCH_URL=http://127.0.0.1:8900/v1/search/local.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+from dataclasses import dataclass, field
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+TAGS = ["pet_bottle", "can", "glass_bottle", "paper", "cardboard", "vinyl", "styrofoam", "plastic"]
+
+
+@dataclass
+class UpstreamProfile:
+    """
+    업스트림 하나의 지연/에러 설정.
+    지연은 중앙값 latency_ms, 퍼짐 정도 jitter(로그정규 sigma)인 로그정규 분포.
+    에러 중 throttle_share 비율은 429 + Retry-After, 나머지는 500.
+    """
+
+    latency_ms: float = 200.0
+    jitter: float = 0.4
+    error_rate: float = 0.0
+    throttle_share: float = 0.5
+    retry_after_s: int = 1
+    rng: random.Random = field(default_factory=random.Random, repr=False)
+
+    def sample_latency_s(self) -> float:
+        if self.jitter <= 0:
+            return self.latency_ms / 1000
+        return self.rng.lognormvariate(0.0, self.jitter) * self.latency_ms / 1000
+
+    def sample_error(self) -> JSONResponse | None:
+        if self.rng.random() >= self.error_rate:
+            return None
+        if self.rng.random() < self.throttle_share:
+            return JSONResponse(
+                {"error": {"code": "429", "message": "Rate limit exceeded (stub)"}},
+                status_code=429,
+                headers={"Retry-After": str(self.retry_after_s)},
+            )
+        return JSONResponse({"error": {"code": "500", "message": "Internal error (stub)"}}, status_code=500)
+
+
+def create_app(
+    vision: UpstreamProfile | None = None,
+    llm: UpstreamProfile | None = None,
+    naver: UpstreamProfile | None = None,
+) -> FastAPI:
+    vision = vision or UpstreamProfile(latency_ms=350)
+    llm = llm or UpstreamProfile(latency_ms=2500, jitter=0.5)
+    naver = naver or UpstreamProfile(latency_ms=120)
+
+    app = FastAPI(title="loadtest stubs")
+    app.state.calls = {"vision": 0, "llm": 0, "naver": 0}
+
+    async def _simulate(profile: UpstreamProfile, name: str) -> JSONResponse | None:
+        app.state.calls[name] += 1
+        await asyncio.sleep(profile.sample_latency_s())
+        return profile.sample_error()
+
+    @app.post("/customvision/predict")
+    async def custom_vision(request: Request):
+        body = await request.body()
+        if (err := await _simulate(vision, "vision")) is not None:
+            return err
+        # 같은 이미지에는 같은 결과 (캐시/중복 제거 검증용)
+        seed = int.from_bytes(hashlib.sha256(body).digest()[:8], "big")
+        rng = random.Random(seed)
+        probs = sorted((rng.random() for _ in range(3)), reverse=True)
+        return {
+            "id": f"stub-{seed:x}",
+            "project": "stub",
+            "iteration": "stub",
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "predictions": [
+                {"probability": p, "tagId": f"tag-{i}", "tagName": rng.choice(TAGS)}
+                for i, p in enumerate(probs)
+            ],
+        }
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        payload = await request.json()
+        if (err := await _simulate(llm, "llm")) is not None:
+            return err
+        if (payload.get("response_format") or {}).get("type") == "json_object":
+            # 구조화 출력 모드 (guide_prompts v2)
+            content = json.dumps(
+                {
+                    "status": "confident",
+                    "item": "페트병",
+                    "rinse": "내용물을 비우고 헹궈 주세요.",
+                    "separate": "라벨과 뚜껑을 분리해 주세요.",
+                    "compress": "찌그러뜨려 주세요.",
+                    "location": "투명 페트병 전용 수거함에 넣어 주세요.",
+                    "tip": "",
+                },
+                ensure_ascii=False,
+            )
+        else:
+            content = (
+                "## 🗑️ 배출 가이드 (stub)\n"
+                "비우기/헹구기 🚿: 내용물을 비우고 헹궈 주세요.\n"
+                "분리하기 ✂️: 라벨과 뚜껑을 분리해 주세요.\n"
+                "부피 줄이기 🦶: 찌그러뜨려 주세요.\n"
+                "배출 장소 📦: 재질별 수거함에 넣어 주세요.\n"
+            )
+        prompt_tokens = sum(len(m.get("content", "")) for m in payload.get("messages", [])) // 2
+        completion_tokens = len(content) // 2
+        return {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "stub"),
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": content},
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    @app.get("/v1/search/local.json")
+    async def naver_local(query: str = "", display: int = 10):
+        if (err := await _simulate(naver, "naver")) is not None:
+            return err
+        rng = random.Random(query)
+        n = min(display, 5)
+        items = []
+        for i in range(n):
+            lat = 37.55 + rng.uniform(-0.05, 0.05)
+            lng = 126.98 + rng.uniform(-0.08, 0.08)
+            items.append(
+                {
+                    "title": f"<b>{query.split()[0] if query else '서울'}</b> 리필샵 {i + 1}",
+                    "link": f"https://example.com/shop/{i + 1}",
+                    "category": "생활,편의>생활용품점",
+                    "description": "",
+                    "telephone": "",
+                    "address": f"서울특별시 어딘가 {i + 1}",
+                    "roadAddress": f"서울특별시 어딘가로 {i + 1}",
+                    "mapx": str(int(lng * 1e7)),
+                    "mapy": str(int(lat * 1e7)),
+                }
+            )
+        return {
+            "lastBuildDate": time.strftime("%a, %d %b %Y %H:%M:%S +0900"),
+            "total": n,
+            "start": 1,
+            "display": n,
+            "items": items,
+        }
+
+    @app.get("/stats")
+    async def stats():
+        """스텁이 실제로 받은 호출 수 (캐시/중복 제거 효과 확인용)."""
+        return dict(app.state.calls)
+
+    return app
+
+
+def main(argv: list[str] | None = None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--vision-latency-ms", type=float, default=350)
+    parser.add_argument("--llm-latency-ms", type=float, default=2500)
+    parser.add_argument("--naver-latency-ms", type=float, default=120)
+    parser.add_argument("--jitter", type=float, default=0.4, help="로그정규 sigma (0이면 고정 지연)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    def profile(latency_ms: float) -> UpstreamProfile:
+        return UpstreamProfile(latency_ms=latency_ms, jitter=args.jitter, error_rate=args.error_rate)
+
+    app = create_app(
+        vision=profile(args.vision_latency_ms),
+        llm=profile(args.llm_latency_ms),
+        naver=profile(args.naver_latency_ms),
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
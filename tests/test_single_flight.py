@@ -0,0 +1,160 @@
+# tests/test_single_flight.py
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.single_flight import SingleFlight
+
+N_CALLERS = 16
+
+
+class CountingUpstream:
+    """호출 수를 세고, release가 켜질 때까지 응답을 붙잡아 두는 느린 업스트림."""
+
+    def __init__(self, error: BaseException | None = None):
+        self.calls = 0
+        self.release = threading.Event()
+        self.error = error
+        self._lock = threading.Lock()
+
+    def __call__(self, value):
+        with self._lock:
+            self.calls += 1
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        # 호출마다 새 객체를 돌려줘서 "같은 결과를 받았는지"를 is로 확인할 수 있게 한다
+        return {"value": value}
+
+
+def _run_threads(flight: SingleFlight, upstream: CountingUpstream, key="k"):
+    results: list = [None] * N_CALLERS
+    errors: list = [None] * N_CALLERS
+    start = threading.Barrier(N_CALLERS)
+
+    def worker(i):
+        start.wait()
+        try:
+            results[i] = flight.do(key, upstream, "payload")
+        except BaseException as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(N_CALLERS)]
+    for t in threads:
+        t.start()
+    # 모두 들어와서 리더의 결과를 기다리는 동안 업스트림을 붙잡아 둔다
+    time.sleep(0.2)
+    upstream.release.set()
+    for t in threads:
+        t.join(5)
+    return results, errors
+
+
+def test_concurrent_callers_share_one_upstream_call():
+    flight, upstream = SingleFlight(), CountingUpstream()
+    results, errors = _run_threads(flight, upstream)
+
+    assert upstream.calls == 1
+    assert errors == [None] * N_CALLERS
+    assert all(r is results[0] for r in results)
+    assert results[0] == {"value": "payload"}
+    assert flight.in_flight() == 0
+
+
+def test_concurrent_callers_share_the_same_exception():
+    boom = RuntimeError("upstream down")
+    flight, upstream = SingleFlight(), CountingUpstream(error=boom)
+    results, errors = _run_threads(flight, upstream)
+
+    assert upstream.calls == 1
+    assert results == [None] * N_CALLERS
+    assert all(e is boom for e in errors)
+    assert flight.in_flight() == 0
+
+
+def test_result_is_not_cached_after_completion():
+    flight, upstream = SingleFlight(), CountingUpstream()
+    upstream.release.set()
+
+    first = flight.do("k", upstream, 1)
+    second = flight.do("k", upstream, 1)
+
+    assert upstream.calls == 2
+    assert first == second and first is not second
+
+
+def test_different_keys_do_not_coalesce():
+    flight, upstream = SingleFlight(), CountingUpstream()
+    upstream.release.set()
+
+    assert flight.do("a", upstream, "a") == {"value": "a"}
+    assert flight.do("b", upstream, "b") == {"value": "b"}
+    assert upstream.calls == 2
+
+
+def test_async_callers_share_one_upstream_call():
+    flight = SingleFlight()
+    calls = 0
+
+    async def upstream(value):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"value": value}
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async("k", upstream, "payload") for _ in range(N_CALLERS)))
+
+    results = asyncio.run(main())
+
+    assert calls == 1
+    assert all(r is results[0] for r in results)
+    assert flight.in_flight() == 0
+
+
+def test_async_callers_share_the_same_exception():
+    flight = SingleFlight()
+    boom = RuntimeError("upstream down")
+    calls = 0
+
+    async def upstream():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        raise boom
+
+    async def main():
+        return await asyncio.gather(
+            *(flight.do_async("k", upstream) for _ in range(N_CALLERS)), return_exceptions=True
+        )
+
+    errors = asyncio.run(main())
+
+    assert calls == 1
+    assert all(e is boom for e in errors)
+
+
+def test_async_cancelled_waiter_does_not_cancel_shared_call():
+    flight = SingleFlight()
+    calls = 0
+
+    async def upstream():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return "done"
+
+    async def main():
+        first = asyncio.ensure_future(flight.do_async("k", upstream))
+        second = asyncio.ensure_future(flight.do_async("k", upstream))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "done"
+    assert calls == 1
@@ -1,6 +1,12 @@
+import hashlib
+from collections import OrderedDict
+
 import streamlit as st
 from backend.call_custom_vision import call_custom_vision
+from backend.analytics import span
 from backend.call_openai_api import call_openai_api
+from backend.item_lookup import normalize_query, resolve_item
+from backend.metrics import counter
 
 FEEDBACK_URL = (
     "https://github.com/EchoSongEEE/recycling-app/issues/new"
@@ -47,6 +53,14 @@ TEXTS = {
             "분리배출 전에 한 번 더 육안으로 확인해 주세요."
         ),
         "uploaded_image_label": "업로드된 이미지",
+        "query_label": "사진이 없으면 품목 이름으로 찾아보세요.",
+        "query_placeholder": "예: 컵라면 용기, 택배 상자",
+        "query_button": "이름으로 찾기",
+        "matched_item": "찾은 품목",
+        "matched_synonym": "비슷한 이름",
+        "match_score": "일치도",
+        "no_match": "정확히 맞는 품목을 찾지 못해 입력한 이름으로 안내해 드려요.",
+        "candidates": "비슷한 품목",
         "privacy_title": "🛡️ 개인정보 보호 및 공정성 방침",
         "privacy_content": """
         <div style="font-size: 0.85rem; color: #666; line-height: 1.4;">
@@ -91,6 +105,14 @@ TEXTS = {
             "Please double-check the item yourself before disposal."
         ),
         "uploaded_image_label": "Uploaded Image",
+        "query_label": "No photo? Search by item name.",
+        "query_placeholder": "e.g. cup noodle container, pizza box",
+        "query_button": "Search by Name",
+        "matched_item": "Matched Item",
+        "matched_synonym": "Closest name",
+        "match_score": "Match",
+        "no_match": "No exact item match was found, so the guide is based on the name you entered.",
+        "candidates": "Similar items",
         "privacy_title": "🛡️ Privacy & Fairness Policy",
         "privacy_content": """
         <div style="font-size: 0.85rem; color: #666; line-height: 1.4;">
@@ -123,15 +145,94 @@ MOOD_LABELS = {
 }
 
 
+# 세션마다 기억해 두는 이미지 수 (이미지 해시 → 인식 결과 + 언어별 안내)
+MEMO_MAX_IMAGES = 8
+
+# 일시적인 실패 안내(대기열 가득/호출 에러)는 기억하지 않고 다음에 다시 요청한다
+_TRANSIENT_GUIDE_PREFIXES = ("⏳", "❌")
+
+_memo_hits = counter("coach_memo_hit_total", "coach results shown from the session memo without upstream calls")
+
+
+def _memo() -> OrderedDict:
+    if "coach_memo" not in st.session_state:
+        st.session_state.coach_memo = OrderedDict()
+    return st.session_state.coach_memo
+
+
+def _memo_entry(image_key: str) -> dict | None:
+    memo = _memo()
+    entry = memo.get(image_key)
+    if entry is not None:
+        memo.move_to_end(image_key)
+    return entry
+
+
+def _remember_vision(image_key: str, cv_result: dict) -> dict:
+    memo = _memo()
+    entry = memo[image_key] = {"cv": cv_result, "guides": {}}
+    while len(memo) > MEMO_MAX_IMAGES:
+        memo.popitem(last=False)
+    return entry
+
+
+def _resolve_text(query: str) -> dict:
+    """품목 이름 → 인식 결과와 같은 모양의 dict (source="text").
+    못 찾으면 입력한 이름을 그대로 태그로 써서 안내를 만든다."""
+    with span("coach", "text") as ev:
+        match, candidates = resolve_item(query)
+        ev.update(tag=match.tag if match else None, probability=match.score if match else None,
+                  outcome="resolved" if match else "unresolved")
+    return {
+        "tag": match.tag if match else query.strip(),
+        "probability": match.score if match else None,
+        "synonym": match.synonym if match else None,
+        "candidates": [c.tag for c in candidates],
+        "source": "text",
+    }
+
+
+def _generate_guide(cv_result: dict, lang: str) -> str:
+    # 이름으로 찾은 결과의 점수는 인식 정확도가 아니므로 넘기지 않는다 (다시 찍기 안내 방지)
+    confidence = None if cv_result.get("source") == "text" else cv_result["probability"]
+    try:
+        return call_openai_api(
+            identified_tag=cv_result["tag"],
+            confidence=confidence,  # 0~1 사이 신뢰도
+            lang=lang,
+        )
+    except TypeError:
+        # (혹시 구버전 함수가 배포돼 있을 때 대비)
+        return call_openai_api(cv_result["tag"], lang=lang)
+
+
+def _guide_for(entry: dict, lang: str, t: dict) -> str:
+    """이미지의 안내를 언어별로 한 번만 만든다 (언어를 바꿔도 인식 결과는 다시 요청하지 않음)."""
+    guide = entry["guides"].get(lang)
+    if guide is not None:
+        return guide
+    with st.spinner(t["spinner_guide"]):
+        guide = _generate_guide(entry["cv"], lang)
+    if not guide.startswith(_TRANSIENT_GUIDE_PREFIXES):
+        entry["guides"][lang] = guide
+    return guide
+
+
+def _clear_text_result() -> None:
+    st.session_state.coach_text = None
+
+
 def page():
     # ───────────────── 언어 선택 (사이드바) ─────────────────
     if "lang" not in st.session_state:
         st.session_state.lang = "ko"
 
+    # key로 선택을 유지한다 (index를 매번 계산해 넘기면 위젯이 새로 만들어져 선택이 되돌아감)
     lang_label = st.sidebar.selectbox(
         "Language / 언어 선택",
         options=list(LANG_OPTIONS.keys()),
         index=0 if st.session_state.lang == "ko" else 1,
+        key="coach_lang",
     )
     lang = LANG_OPTIONS[lang_label]
     st.session_state.lang = lang
@@ -188,21 +289,28 @@ def page():
         st.markdown(video_html, unsafe_allow_html=True)
         st.caption(t["video_caption"])
 
+        # key를 고정해서 언어를 바꿔 라벨이 달라져도 올린 파일이 유지되게 한다
         uploaded_file = st.file_uploader(
             t["uploader_label"],
             type=["jpg", "jpeg", "png"],
+            key="coach_image",
+            # 새 이미지를 올리면 이름으로 찾은 결과 대신 이미지 결과를 보여 준다
+            on_change=_clear_text_result,
         )
 
         with st.expander(t["privacy_title"], expanded=False): 
             st.markdown(t["privacy_content"], unsafe_allow_html=True)
 
         if uploaded_file is None:
+            # 화면의 결과만 지우고 이미지별 기록은 남겨 둔다 (같은 파일을 다시 올리면 바로 보여 줌)
             st.session_state.cv_result = None
             st.session_state.guide = None
+            st.session_state.coach_shown = None
 
         if uploaded_file is not None:
             # 파일 포인터에서 바이트로 읽어서 재사용
             image_bytes = uploaded_file.getvalue()
+            image_key = hashlib.sha256(image_bytes).hexdigest()
 
             img_left, img_center, img_right = st.columns([1, 3, 1])
             with img_center:
@@ -212,36 +320,56 @@ def page():
                     use_container_width=True,
                 )
 
+            entry = _memo_entry(image_key)
             if st.button(t["analyze_button"], use_container_width=True):
-                with st.spinner(t["spinner_analyze"]):
-                    cv_result = call_custom_vision(image_bytes)
-
-                if "error" in cv_result:
-                    st.session_state.cv_result = cv_result
-                    st.session_state.guide = None
-                
+                st.session_state.coach_text = None
+                if entry is not None:
+                    _memo_hits.inc()
                 else:
-                    tag = cv_result["tag"]
-                    prob = cv_result["probability"]  # 👈 0~1 사이 신뢰도
-
-                    with st.spinner(t["spinner_guide"]):
-                        try:
-                            guide = call_openai_api(
-                                identified_tag=tag,
-                                confidence=prob,   # 👈 여기!
-                                lang=lang,
-                            )
-                        except TypeError:
-                            # (혹시 구버전 함수가 배포돼 있을 때 대비)
-                            guide = call_openai_api(tag, lang=lang)
-
-                    st.session_state.cv_result = cv_result
-                    st.session_state.guide = guide
-                
+                    with st.spinner(t["spinner_analyze"]):
+                        cv_result = call_custom_vision(image_bytes)
+
+                    if "error" in cv_result:
+                        # 실패는 기억하지 않는다 (다시 누르면 재시도)
+                        st.session_state.cv_result = cv_result
+                        st.session_state.guide = None
+                        st.session_state.coach_shown = (image_key, lang)
+                    else:
+                        entry = _remember_vision(image_key, cv_result)
+
+            if entry is not None:
+                # 이미 분석한 이미지면 (다시 올렸거나 언어를 바꿨을 때) 버튼 없이 기록에서 보여 준다.
+                # 언어만 바뀌었으면 인식 결과는 그대로 쓰고 안내만 (없을 때) 새로 만든다.
+                if st.session_state.get("coach_shown") != (image_key, lang) and lang in entry["guides"]:
+                    _memo_hits.inc()
+                st.session_state.cv_result = entry["cv"]
+                st.session_state.guide = _guide_for(entry, lang, t)
+                st.session_state.coach_shown = (image_key, lang)
+            elif (st.session_state.get("coach_shown") or (None,))[0] != image_key:
+                # 다른 이미지로 바꿨으면 이전 이미지의 결과는 내린다
+                st.session_state.cv_result = None
+                st.session_state.guide = None
 
         else:
             st.info(t["upload_hint"])
 
+        # 사진 대신 품목 이름으로 찾기 (결과는 이미지와 같은 기록에 "text:이름" 키로 남긴다)
+        query = st.text_input(t["query_label"], placeholder=t["query_placeholder"], key="coach_query")
+        if st.button(t["query_button"], use_container_width=True) and normalize_query(query):
+            text_key = f"text:{normalize_query(query)}"
+            if _memo_entry(text_key) is not None:
+                _memo_hits.inc()
+            else:
+                _remember_vision(text_key, _resolve_text(query))
+            st.session_state.coach_text = text_key
+
+        text_key = st.session_state.get("coach_text")
+        text_entry = _memo_entry(text_key) if text_key else None
+        if text_entry is not None:
+            st.session_state.cv_result = text_entry["cv"]
+            st.session_state.guide = _guide_for(text_entry, lang, t)
+            st.session_state.coach_shown = (text_key, lang)
+
     # ----------------- 오른쪽 영역: 분석 결과 -----------------
     with col_right:
         st.markdown(f"### {t['result_section_title']}")
@@ -257,6 +385,22 @@ def page():
             st.write(t["no_result"])
         elif "error" in cv_result:
             st.error(f"{t['error_prefix']}: {cv_result['error']}")
+        elif cv_result.get("source") == "text":
+            st.markdown(f"{t['matched_item']}: **{cv_result['tag']}**")
+            if cv_result["probability"] is not None:
+                st.caption(
+                    f"{t['matched_synonym']}: {cv_result['synonym']} · "
+                    f"{t['match_score']}: {cv_result['probability'] * 100:.0f}%"
+                )
+            else:
+                st.info(t["no_match"])
+                if cv_result["candidates"]:
+                    st.caption(f"{t['candidates']}: {', '.join(cv_result['candidates'])}")
+
+            st.markdown(f"### {t['guide_section_title']}")
+            if guide:
+                st.write(guide)
+            st.markdown("---")
         else:
             tag = cv_result["tag"]
             prob = cv_result["probability"]
@@ -0,0 +1,32 @@
+import pandas as pd
+import streamlit as st
+
+from backend.metrics import summary
+
+
+def render_metrics_panel():
+    """
+    사이드바에 백엔드 호출별 지연 시간(p50/p95/p99)을 보여주는 디버그 패널.
+    URL에 ?debug=1 을 붙였을 때만 표시된다.
+    """
+    rows = summary()
+    with st.sidebar.expander("🛠️ 성능 지표 (debug)", expanded=False):
+        if not rows:
+            st.caption("아직 기록된 지표가 없어요.")
+            return
+
+        df = pd.DataFrame(rows).set_index("name")
+        # 초 → 밀리초로 보기 좋게
+        for col in ["mean", "p50", "p95", "p99"]:
+            df[col] = (df[col] * 1000).round(1)
+        df = df.rename(
+            columns={
+                "count": "호출 수",
+                "errors": "에러",
+                "mean": "평균(ms)",
+                "p50": "p50(ms)",
+                "p95": "p95(ms)",
+                "p99": "p99(ms)",
+            }
+        )
+        st.dataframe(df, use_container_width=True)
@@ -3,6 +3,8 @@ import folium
 from streamlit_folium import st_folium
 from streamlit_js_eval import get_geolocation
 
+from backend.poi_store import LAYER_DROPOFF, get_poi_store
+
 
 def page():
     st.title("📦 서울시 분리배출 장소 지도")
@@ -33,70 +35,14 @@ def page():
         icon=folium.Icon(color="red", icon="user"),
     ).add_to(m)
 
-    # 분리배출 장소 마커 데이터
-    recycling_spots = [
-        {
-            "name": "재활용품 수거함",
-            "lat": 37.531405951,
-            "lon": 126.968820855,
-            "loc": "서울특별시 용산구 한강대로39길 34-5",
-        },
-        {
-            "name": "재활용품 수거함",
-            "lat": 37.526158356,
-            "lon": 126.963991217,
-            "loc": "서울특별시 용산구 한강대로15길 8-5",
-        },
-        {
-            "name": "재활용품 수거함",
-            "lat": 37.532477219,
-            "lon": 126.992280033,
-            "loc": "서울특별시 용산구 녹사평대로26가길 13",
-        },
-        {
-            "name": "재활용품 수거함",
-            "lat": 37.546230421,
-            "lon": 126.968248405,
-            "loc": "서울특별시 용산구 청파로57가길 20",
-        },
-        {
-            "name": "재활용품 수거함",
-            "lat": 37.543276420,
-            "lon": 126.967577129,
-            "loc": "서울특별시 용산구 청파로43길 47-16",
-        },
-        {
-            "name": "재활용품 수거함",
-            "lat": 37.542685125,
-            "lon": 126.96436403,
-            "loc": "서울특별시 용산구 백범로79길 91",
-        },
-        {
-            "name": "재활용품 수거함",
-            "lat": 37.553795554,
-            "lon": 126.977122664,
-            "loc": "서울특별시 용산구 소월로2나길 15-7",
-        },
-        {
-            "name": "재활용품 수거함",
-            "lat": 37.54254174,
-            "lon": 126.963011087,
-            "loc": "서울특별시 용산구 효창원로72길 23",
-        },
-        {
-            "name": "재활용품 수거함",
-            "lat": 37.534944062,
-            "lon": 126.990599864,
-            "loc": "서울특별시 용산구 이태원로15길 18",
-        },
-    ]
+    # 분리배출 장소 마커 (공용 POI 저장소에서 가까운 순으로 조회)
+    spots = get_poi_store().query(center_lat, center_lon, layers=[LAYER_DROPOFF])
 
-    # 분리배출 장소 마커 추가
-    for spot in recycling_spots:
+    for _, spot in spots.iterrows():
         folium.Marker(
-            [spot["lat"], spot["lon"]],
+            [spot["lat"], spot["lng"]],
             popup=spot["name"],
-            tooltip=spot["loc"],
+            tooltip=spot["road_address"],
         ).add_to(m)
 
     # 지도 출력
@@ -0,0 +1,131 @@
+"""
+마커 수천~수만 개를 folium.Marker 객체 없이 한 레이어로 그리는 folium 요소.
+
+좌표/id/아이콘 상태는 typed array(float32, float64, uint8)를 base64로 묶어서 넣고,
+팝업 문자열은 중복을 없앤 문자열 표 + 행별 인덱스로 넣는다.
+브라우저에서 배열을 풀어 마커를 한 번에 만들고, 팝업 HTML은 열 때 만든다.
+"""
+
+from __future__ import annotations
+
+import base64
+
+import numpy as np
+import pandas as pd
+from branca.element import MacroElement
+from folium.template import Template
+
+# 아이콘 상태 (uint8)
+STATE_DEFAULT = 0
+STATE_SELECTED = 1
+
+
+def _b64(values: np.ndarray) -> str:
+    return base64.b64encode(np.ascontiguousarray(values).tobytes()).decode("ascii")
+
+
+def pack_markers(df: pd.DataFrame, selected_id: int | None = None) -> dict:
+    """DataFrame → 브라우저로 보낼 압축 payload."""
+    n = len(df)
+    addr = df["road_address"].where(df["road_address"].notna() & (df["road_address"] != ""))
+    addr = addr.fillna(df["jibun_address"]).fillna("")
+    columns = [
+        df["name"].fillna("").astype(str),
+        addr.astype(str),
+        df["gu"].fillna("").astype(str),
+        df["type"].fillna("").astype(str),
+    ]
+    # 네 필드를 한 번에 factorize해서 문자열 표 하나를 공유
+    codes, strings = pd.factorize(pd.concat(columns, ignore_index=True))
+    index_dtype = np.dtype("<u2") if len(strings) < 2**16 else np.dtype("<u4")
+
+    ids = df["id"].to_numpy(dtype=np.float64)  # 53비트 id는 float64에 정확히 들어감
+    state = np.zeros(n, dtype=np.uint8)
+    if selected_id is not None:
+        state[ids == selected_id] = STATE_SELECTED
+
+    return {
+        "n": n,
+        "lat": _b64(df["lat"].to_numpy(dtype="<f4")),
+        "lng": _b64(df["lng"].to_numpy(dtype="<f4")),
+        "id": _b64(ids.astype("<f8")),
+        "state": _b64(state),
+        "strings": strings.tolist(),
+        "index_type": "u16" if index_dtype.itemsize == 2 else "u32",
+        # (필드 수 x n) 행 우선
+        "fields": _b64(codes.astype(index_dtype)),
+    }
+
+
+class PackedMarkers(MacroElement):
+    """
+    부모가 MarkerCluster면 addLayers()로 한 번에 넣고, 지도/레이어면 하나씩 붙인다.
+    마커 아이콘은 folium.Icon과 같은 Leaflet.awesome-markers 아이콘을 상태별로 하나씩만 만든다.
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+        (function () {
+            var payload = {{ this.payload|tojson }};
+            function decode(b64, Type) {
+                var bin = atob(b64);
+                var bytes = new Uint8Array(bin.length);
+                for (var i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i);
+                return new Type(bytes.buffer);
+            }
+            function esc(s) {
+                return String(s).replace(/[&<>"']/g, function (c) {
+                    return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}[c];
+                });
+            }
+            var n = payload.n;
+            var lat = decode(payload.lat, Float32Array);
+            var lng = decode(payload.lng, Float32Array);
+            var ids = decode(payload.id, Float64Array);
+            var state = decode(payload.state, Uint8Array);
+            var fields = decode(payload.fields, payload.index_type === "u16" ? Uint16Array : Uint32Array);
+            var strings = payload.strings;
+            var icons = {{ this.colors|tojson }}.map(function (color) {
+                return L.AwesomeMarkers.icon({
+                    icon: "trash", prefix: "fa", markerColor: color, iconColor: "white"
+                });
+            });
+            function popup(i) {
+                var name = strings[fields[i]], addr = strings[fields[n + i]];
+                var gu = strings[fields[2 * n + i]], type = strings[fields[3 * n + i]];
+                return "<b>" + esc(name) + "</b><br/>" + esc(addr) + "<br/>"
+                    + esc(gu) + " · " + esc(type || {{ this.default_type|tojson }});
+            }
+            // 팝업 내용은 열 때 문자열 표에서 만든다 (모든 마커가 같은 함수를 공유)
+            function popupFor(layer) { return popup(layer.options.row); }
+            var markers = new Array(n);
+            for (var i = 0; i < n; i++) {
+                markers[i] = L.marker([lat[i], lng[i]], {icon: icons[state[i]], binId: ids[i], row: i})
+                    .bindPopup(popupFor, {maxWidth: 250});
+            }
+            var parent = {{ this._parent.get_name() }};
+            if (typeof parent.addLayers === "function") {
+                parent.addLayers(markers);
+            } else {
+                markers.forEach(function (m) { m.addTo(parent); });
+            }
+        })();
+        {% endmacro %}
+        """
+    )
+
+    def __init__(
+        self,
+        df: pd.DataFrame | None = None,
+        selected_id: int | None = None,
+        default_type: str = "일반 휴지통",
+        payload: dict | None = None,
+    ):
+        super().__init__()
+        self._name = "PackedMarkers"
+        # payload를 주면 (캐시해 둔 pack_markers() 결과) 다시 압축하지 않고 그대로 쓴다 (읽기 전용)
+        self.payload = payload if payload is not None else pack_markers(df, selected_id)
+        # STATE_DEFAULT, STATE_SELECTED 순서
+        self.colors = ["blue", "orange"]
+        self.default_type = default_type
@@ -0,0 +1,84 @@
+"""
+기본 상태(필터/이동 전) 지도의 HTML을 미리 만들어 두고 그대로 내보내는 캐시.
+
+처음 들어온 사용자가 보는 지도(서울 전체 자치구 지도, 전체 휴지통 지도)는 항상 같으므로
+folium 레이아웃을 방문마다 다시 하지 않고, 데이터 버전별로 한 번만 렌더링해서 파일로 저장한다.
+배포 때 미리 만들어 둘 수도 있다:
+
+    python -m views.prerendered_maps
+"""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import logging
+import os
+from typing import Callable
+
+import folium
+
+from backend import ROOT_DIR
+from backend.metrics import timer
+
+logger = logging.getLogger(__name__)
+
+# 렌더링 코드(마커 모양, 팝업 등)가 바뀌면 올려서 예전 파일을 쓰지 않게 한다
+MAP_RENDER_VERSION = 2
+
+PRERENDER_DIR = os.environ.get("PRERENDER_DIR", str(ROOT_DIR / "build" / "maps"))
+
+
+def artifact_key(*parts) -> str:
+    """데이터 버전을 나타내는 값들(파일 시그니처 등)로 만든 짧은 해시."""
+    raw = repr((MAP_RENDER_VERSION,) + parts).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+
+def file_signature(path) -> tuple[str, int, int]:
+    stat = os.stat(path)
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def load_or_render(name: str, key: str, render: Callable[[], folium.Map]) -> str:
+    """
+    name/key에 해당하는 HTML 파일이 있으면 읽고, 없으면 render()로 지도를 만들어 저장한다.
+    같은 name의 이전 버전 파일은 지운다.
+    """
+    path = os.path.join(PRERENDER_DIR, f"{name}-{key}.html")
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+
+    with timer(f"prerender_{name}"):
+        html = render().get_root().render()
+
+    try:
+        os.makedirs(PRERENDER_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(html)
+        os.replace(tmp, path)
+        for old in glob.glob(os.path.join(PRERENDER_DIR, f"{name}-*.html")):
+            if old != path:
+                os.remove(old)
+    except OSError as e:
+        # 저장하지 못해도 이번 응답은 그대로 사용
+        logger.warning("미리 렌더링한 지도를 저장하지 못했어요 (%s): %s", name, e)
+    return html
+
+
+def main() -> None:
+    from views.seoul_trash_map import trash_overview_html
+    from views.seoul_waste_request import district_overview_html
+
+    for name, build in (("districts", district_overview_html), ("trash-overview", trash_overview_html)):
+        html = build()
+        print(f"{name}: {len(html) / 1024:.0f} KB")
+    print(f"-> {PRERENDER_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,31 @@
 from __future__ import annotations
 
+import time
+
 import folium
+import numpy as np
 import pandas as pd
 import streamlit as st
 from streamlit_folium import st_folium
 from streamlit_js_eval import get_geolocation
 from folium.plugins import MarkerCluster
 
+from backend import geo_cell, shared_dataset
+from backend.analytics import record
+from backend.metrics import timed, timer
+from backend.poi_store import LAYER_TRASH, get_poi_store, poi_store_at
+from backend.seoul_districts import district_centers
+from backend.topk import TopKPager, rank_of
+from backend.walking import WALK_MAX_M, rank_by_walking, walking_available
+from views.packed_markers import PackedMarkers, pack_markers
+from views.prerendered_maps import artifact_key, load_or_render
 from backend.trash_can_info import (
     annotate_distance,
+    current_trash_dataset,
     filter_by_gu,
     find_nearby,
-    get_trash_cans,
+    lookup_trash_can,
+    refine_nearest,
     search_by_keyword,
 )
 
@@ -20,29 +34,38 @@ DEFAULT_CENTER = (37.5665, 126.9780)
 DEFAULT_ZOOM = 12
 
 
-@st.cache_data
-def load_data() -> pd.DataFrame:
-    return get_trash_cans()
+@st.cache_resource(max_entries=2)
+def load_data(store_version: int) -> pd.DataFrame:
+    # 저장소 버전이 바뀌면(데이터 새로고침) 새로 계산, 같은 버전이면 캐시 재사용
+    # cache_data와 달리 복사본을 만들지 않고 (워커끼리 mmap으로 공유하는) 프레임을 그대로 돌려준다
+    # 새로고침 중이라도 키로 받은 버전의 저장소에서 읽는다 (지금 저장소는 이미 다음 버전일 수 있음)
+    return poi_store_at(store_version).layer_frame(LAYER_TRASH)
+
+
+# 자치구 경계 폴리곤에서 계산한 구별 중심 좌표
+GU_CENTERS = district_centers()
 
 
-GU_CENTERS = {
-    "마포구": (37.5663, 126.9019),
-    "구로구": (37.4954, 126.8874),
-    "노원구": (37.6542, 127.0568),
-    "서초구": (37.4837, 127.0324),
-    "성북구": (37.5894, 127.0167),
-    "중랑구": (37.6063, 127.0925),
-}
+def _popup_html(row: pd.Series) -> str:
+    addr = row.get("road_address") or row.get("jibun_address") or ""
+    return f"""
+    <b>{row['name']}</b><br/>
+    {addr}<br/>
+    {row['gu']} · {row.get('type') or '일반 휴지통'}
+    """
 
 
+@timed("create_map")
 def create_map(
-    df: pd.DataFrame,
+    df: pd.DataFrame | None,
     center: tuple[float, float],
     zoom: int = 13,
     user_location: tuple[float, float] | None = None,
     radius_m: int | None = None,
-    selected_bin_id: str | None = None,
+    selected_bin_id: int | None = None,
+    payload: dict | None = None,
 ) -> folium.Map:
+    """payload를 주면 df 대신 미리 압축한 마커 배열(pack_markers)을 쓴다."""
     m = folium.Map(
         location=center,
         zoom_start=zoom,
@@ -50,8 +73,10 @@ def create_map(
         prefer_canvas=True,
     )
 
-    if len(df) > 100:
-        marker_cluster = MarkerCluster(
+    # 휴지통 마커는 folium.Marker를 하나씩 만들지 않고 압축 배열 하나로 넣는다
+    parent = m
+    if (payload["n"] if payload is not None else len(df)) > 100:
+        parent = MarkerCluster(
             options={
                 "maxClusterRadius": 50,
                 "disableClusteringAtZoom": 16,
@@ -59,40 +84,7 @@ def create_map(
                 "chunkedLoading": True,
             }
         ).add_to(m)
-
-        for _, row in df.iterrows():
-            addr = row.get("road_address") or row.get("jibun_address") or ""
-            popup_html = f"""
-            <b>{row['name']}</b><br/>
-            {addr}<br/>
-            {row['gu']} · {row.get('type') or '일반 휴지통'}
-            """
-
-            is_selected = selected_bin_id is not None and row["id"] == selected_bin_id
-            icon_color = "orange" if is_selected else "blue"
-
-            folium.Marker(
-                location=[row["lat"], row["lng"]],
-                icon=folium.Icon(color=icon_color, icon="trash", prefix="fa"),
-                popup=folium.Popup(popup_html, max_width=250, lazy=True),
-            ).add_to(marker_cluster)
-    else:
-        for _, row in df.iterrows():
-            addr = row.get("road_address") or row.get("jibun_address") or ""
-            popup_html = f"""
-            <b>{row['name']}</b><br/>
-            {addr}<br/>
-            {row['gu']} · {row.get('type') or '일반 휴지통'}
-            """
-
-            is_selected = selected_bin_id is not None and row["id"] == selected_bin_id
-            icon_color = "orange" if is_selected else "blue"
-
-            folium.Marker(
-                location=[row["lat"], row["lng"]],
-                icon=folium.Icon(color=icon_color, icon="trash", prefix="fa"),
-                popup=folium.Popup(popup_html, max_width=250, lazy=True),
-            ).add_to(m)
+    PackedMarkers(df, selected_id=selected_bin_id, payload=payload).add_to(parent)
 
     if user_location is not None:
         folium.Marker(
@@ -112,6 +104,422 @@ def create_map(
     return m
 
 
+# ----------------- 캐시되는 계산 -----------------
+# 필터 결과와 지도는 (저장소 버전, 자치구, 검색어, 위치 셀)으로 캐시해서
+# 리스트 클릭 / 더 보기 / 위치 새로고침 때 다시 계산하지 않는다.
+# 위치는 geohash 셀로 묶기 때문에 같은 동네 사용자끼리 캐시를 공유한다.
+
+nearby_mode: bool = False   # 현재는 false로 고정 (필요하면 토글로 확장 가능)
+RADIUS_M: int = 300
+
+
+def _location_cell(user_location: tuple[float, float] | None) -> str | None:
+    if user_location is None:
+        return None
+    return geo_cell.encode(user_location[0], user_location[1])
+
+
+@st.cache_data(max_entries=64)
+def filter_trash_cans(
+    store_version: int,
+    gu: str | None,
+    keyword: str,
+    loc_cell: str | None,
+) -> pd.DataFrame:
+    """
+    자치구/검색어로 거르고, 위치 셀이 있으면 셀 중심 기준 거리를 붙인다.
+    정렬은 하지 않는다. 목록 순서는 list_pager()가 보여줄 만큼만 계산한다.
+    """
+    filtered = filter_by_gu(load_data(store_version), gu)
+    filtered = search_by_keyword(filtered, keyword)
+
+    if loc_cell is not None:
+        lat, lng = geo_cell.cell_center(loc_cell)
+        if nearby_mode:
+            # 셀 안 어디에 있든 반경 안의 휴지통을 놓치지 않도록 셀 크기만큼 넓혀서 거른다
+            radius = RADIUS_M + geo_cell.cell_radius_m(loc_cell)
+            return find_nearby(filtered, lat, lng, radius_m=radius, limit=None)
+        return annotate_distance(filtered, lat, lng)
+
+    filtered = filtered.copy()
+    filtered["distance_m"] = None
+    return filtered
+
+
+@st.cache_resource(max_entries=2)
+def _name_rank(store_version: int) -> np.ndarray:
+    """(자치구, 이름) 순 정렬에서 전체 데이터 각 행의 순위. 데이터 버전마다 한 번만 정렬한다."""
+    return rank_of(load_data(store_version), ["gu", "name"])
+
+
+@st.cache_resource(max_entries=64)
+def list_pager(
+    store_version: int,
+    gu: str | None,
+    keyword: str,
+    loc_cell: str | None,
+) -> TopKPager:
+    """
+    질의별 목록 정렬 상태. 위치가 있으면 (셀 중심 기준) 거리순, 없으면 자치구/이름순.
+    세션끼리 공유하므로 "더 보기"를 누를 때마다 이미 정렬한 앞부분은 다시 정렬하지 않는다.
+    """
+    filtered = filter_trash_cans(store_version, gu, keyword, loc_cell)
+    if loc_cell is not None:
+        return TopKPager(filtered["distance_m"].to_numpy(dtype=np.float64))
+    # load_data()는 RangeIndex라 걸러낸 행의 index가 곧 전체 데이터에서의 위치
+    return TopKPager(_name_rank(store_version)[filtered.index.to_numpy()])
+
+
+def _exact_page(
+    filtered: pd.DataFrame,
+    pager: TopKPager,
+    loc_cell: str | None,
+    user_location: tuple[float, float] | None,
+    limit: int,
+    walk_mode: bool = False,
+) -> pd.DataFrame:
+    """
+    보여줄 limit개만 정렬해서 꺼내고, 위치가 있으면 실제 위치 기준 거리로 다시 계산/정렬한다.
+    walk_mode면 직선거리 WALK_MAX_M 이내 후보를 도보 거리순으로 다시 줄 세운다.
+    """
+    if loc_cell is None or user_location is None:
+        return filtered.iloc[pager.head(limit)]
+
+    error_m = geo_cell.cell_radius_m(loc_cell)
+    if walk_mode:
+        # 도보 거리는 직선거리 이상이므로 (근사 직선거리 기준) WALK_MAX_M + 셀 반경 밖은 볼 필요가 없다
+        n_candidates = pager.count_le(WALK_MAX_M + error_m, at_least=limit)
+        candidates = annotate_distance(filtered.iloc[pager.head(n_candidates)], *user_location)
+        return rank_by_walking(candidates, user_location[0], user_location[1], limit)
+
+    # refine_nearest()가 다시 계산할 후보(limit번째 근사 거리 + 2 * 셀 반경 이내)까지만 정렬
+    head = pager.head(limit)
+    if len(head) == 0:
+        return filtered.iloc[:0]
+    kth = filtered["distance_m"].iat[int(head[-1])]
+    n_candidates = pager.count_le(kth + 2 * error_m, at_least=limit)
+
+    page_df = refine_nearest(
+        filtered.iloc[pager.head(n_candidates)],
+        user_location[0],
+        user_location[1],
+        limit=limit,
+        error_m=error_m,
+    )
+    if nearby_mode:
+        page_df = page_df[page_df["distance_m"] <= RADIUS_M]
+    return page_df
+
+
+def _base_view(
+    gu: str | None,
+    loc_cell: str | None,
+) -> tuple[tuple[float, float], int]:
+    """선택한 휴지통이 없을 때의 기본 지도 중심/줌."""
+    if loc_cell is not None:
+        return geo_cell.cell_center(loc_cell), (15 if nearby_mode else 13)
+    if gu is not None and gu in GU_CENTERS:
+        return GU_CENTERS[gu], 14
+    return DEFAULT_CENTER, DEFAULT_ZOOM
+
+
+@st.cache_resource(max_entries=32)
+def base_marker_payload(
+    store_version: int,
+    gu: str | None,
+    keyword: str,
+    loc_cell: str | None,
+) -> dict:
+    """
+    전체 마커의 압축 배열 (같은 위치 셀의 사용자끼리 공유, 읽기 전용).
+    사용자별 값(정확한 위치, 선택)은 넣지 않는다.
+    """
+    return pack_markers(filter_trash_cans(store_version, gu, keyword, loc_cell))
+
+
+def build_base_map(
+    store_version: int,
+    gu: str | None,
+    keyword: str,
+    loc_cell: str | None,
+    zoom: int,
+) -> folium.Map:
+    """
+    전체 마커가 올라간 지도. 렌더링마다 새로 만든다.
+    st_folium이 feature_group_to_add를 지도에 붙이고 요소 id를 바꾸므로 folium 객체는
+    세션끼리 공유하지 않고, 비싼 마커 압축(base_marker_payload)만 캐시에서 가져온다.
+    내 위치 / 선택 / 이동은 st_folium의 center/zoom과 feature_group_to_add로 처리한다.
+    """
+    center, _ = _base_view(gu, loc_cell)
+    return create_map(
+        df=None,
+        center=center,
+        zoom=zoom,
+        payload=base_marker_payload(store_version, gu, keyword, loc_cell),
+    )
+
+
+@st.cache_resource(max_entries=2)
+def _trash_overview_html(key: str, _store_version: int) -> str:
+    return load_or_render(
+        "trash-overview",
+        key,
+        lambda: create_map(
+            df=filter_trash_cans(_store_version, None, "", None),
+            center=DEFAULT_CENTER,
+            zoom=DEFAULT_ZOOM,
+        ),
+    )
+
+
+def trash_overview_html(store_version: int | None = None) -> str:
+    """
+    처음 들어왔을 때의 전체 휴지통 지도 HTML (자치구/검색/위치/선택 없음).
+    휴지통 CSV 시그니처가 같으면 프로세스가 달라도 같은 파일을 쓴다.
+    """
+    # 렌더링이 끝날 때까지 저장소를 들고 있어야 poi_store_at()으로 같은 버전을 찾을 수 있다
+    store = get_poi_store() if store_version is None else poi_store_at(store_version)
+    store_version = store.version
+    # 정규화 코드가 바뀌면(SCHEMA_VERSION) 같은 CSV라도 마커가 달라진다
+    key = artifact_key(shared_dataset.SCHEMA_VERSION, sorted(current_trash_dataset().signatures.items()))
+    return _trash_overview_html(key, store_version)
+
+
+def _is_default_view(
+    gu: str | None,
+    keyword: str,
+    loc_cell: str | None,
+) -> bool:
+    return (
+        gu is None
+        and not keyword
+        and loc_cell is None
+        and st.session_state["user_location"] is None
+        and st.session_state.get("selected_bin_id") is None
+        and tuple(st.session_state.get("map_center", DEFAULT_CENTER)) == DEFAULT_CENTER
+        and st.session_state.get("map_zoom", DEFAULT_ZOOM) == DEFAULT_ZOOM
+    )
+
+
+# ----------------- 프래그먼트 -----------------
+
+def _parse_geolocation(location) -> tuple[float, float] | None:
+    if not location:
+        return None
+    try:
+        coords = location.get("coords") or {}
+        lat = coords.get("latitude")
+        lon = coords.get("longitude")
+        if lat is not None and lon is not None:
+            return (float(lat), float(lon))
+    except (TypeError, KeyError, ValueError, AttributeError):
+        pass
+    return None
+
+
+@st.fragment
+def _location_fragment():
+    """
+    내 위치 표시 / 새로고침. 위치 셀이 바뀐 경우에만 페이지 전체를 다시 실행한다.
+    """
+    page_run = st.session_state["trash_page_run"]
+    in_full_run = st.session_state.get("trash_loc_seen_run") != page_run
+    st.session_state["trash_loc_seen_run"] = page_run
+
+    user_location = _parse_geolocation(get_geolocation())
+    cell = _location_cell(user_location)
+    st.session_state["user_location"] = user_location
+
+    st.markdown('<div class="row1-wrap">', unsafe_allow_html=True)
+    row1_col1, row1_col2, row1_col3 = st.columns([0.12, 0.58, 0.30])
+
+    with row1_col1:
+        st.markdown("**📍 내 위치**")
+
+    with row1_col2:
+        if user_location is not None:
+            lat, lon = user_location
+            st.markdown(
+                f"<span style='background:#cfe4ff;padding:4px 8px;border-radius:4px;'>"
+                f"{lat:.5f}, {lon:.5f}</span>",
+                unsafe_allow_html=True,
+            )
+        else:
+            st.markdown("🔔 브라우저에서 위치 권한을 **허용**해 주세요.")
+
+    with row1_col3:
+        # 버튼을 누르면 이 프래그먼트만 다시 실행되며 위치를 다시 읽는다
+        st.button("위치 새로고침", use_container_width=True)
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    if cell != st.session_state.get("user_loc_cell"):
+        st.session_state["user_loc_cell"] = cell
+        if not in_full_run:
+            st.rerun(scope="app")
+
+
+def _load_more():
+    st.session_state["list_limit"] += 20
+
+
+@st.fragment
+def _list_fragment(
+    store_version: int,
+    gu: str | None,
+    keyword: str,
+    loc_cell: str | None,
+    walk_mode: bool = False,
+):
+    st.subheader("🗑️ 휴지통 목록")
+
+    list_start = time.perf_counter()
+    filtered_disp = filter_trash_cans(store_version, gu, keyword, loc_cell)
+    has_user_loc = loc_cell is not None
+
+    st.caption(
+        f"조건에 해당하는 휴지통: **{len(filtered_disp)}개**"
+        + (
+            " (내 위치 기준 도보 거리순)"
+            if walk_mode and has_user_loc
+            else " (내 위치 기준 거리순)"
+            if nearby_mode and has_user_loc
+            else " (자치구/검색 기준)"
+        )
+    )
+
+    if filtered_disp.empty:
+        record("map", "list", (time.perf_counter() - list_start) * 1000, gu=gu, count=0,
+               keyword=bool(keyword), nearby=has_user_loc, walking=walk_mode)
+        st.warning("조건에 맞는 휴지통이 없어요 🥲", icon="⚠️")
+        return
+
+    limit = st.session_state["list_limit"]
+    pager = list_pager(store_version, gu, keyword, loc_cell)
+    subset = _exact_page(
+        filtered_disp, pager, loc_cell, st.session_state["user_location"], limit, walk_mode
+    )
+    # 사용 기록: 위치/검색어 내용은 남기지 않는다
+    record(
+        "map", "list", (time.perf_counter() - list_start) * 1000, gu=gu, count=len(filtered_disp),
+        keyword=bool(keyword), nearby=has_user_loc, walking=walk_mode, limit=limit,
+    )
+
+    for _, row in subset.iterrows():
+        dist_m = row.get("distance_m", None)
+        dist_text = (
+            f"{dist_m:.0f} m"
+            if dist_m is not None and not pd.isna(dist_m)
+            else "- m"
+        )
+        walk_m = row.get("walk_m", None)
+        if walk_m is not None and not pd.isna(walk_m):
+            dist_text += f" (도보 약 {walk_m:.0f} m)"
+
+        with st.container(border=True):
+            st.markdown(f"**{row['name']}**")
+            addr = row.get("road_address") or row.get("jibun_address") or ""
+            if addr:
+                st.caption(addr)
+
+            detail_line = f"{row['gu']} · {row.get('type') or '일반 휴지통'}"
+            if isinstance(row.get("detail"), str) and row["detail"].strip():
+                detail_line += f" · {row['detail']}"
+            st.write(detail_line)
+
+            footer_left, footer_right = st.columns([0.5, 0.5])
+            with footer_left:
+                if has_user_loc:
+                    st.text(f"📍 내 위치로부터 {dist_text}")
+            with footer_right:
+                if st.button(
+                    "지도에서 보기",
+                    key=f"focus-{row['id']}",
+                    use_container_width=True,
+                ):
+                    st.session_state["selected_bin_id"] = row["id"]
+                    st.session_state["map_center"] = (row["lat"], row["lng"])
+                    st.session_state["map_zoom"] = 18
+                    # 리스트는 캐시된 결과를 그대로 쓰고, 지도는 중심만 옮긴다
+                    st.rerun(scope="app")
+
+    if len(filtered_disp) > limit:
+        st.button("더 보기", key="load_more", on_click=_load_more)
+    else:
+        st.caption("모든 휴지통 정보를 다 불러왔어요 🙂")
+
+
+@st.fragment
+def _map_fragment(
+    store_version: int,
+    gu: str | None,
+    keyword: str,
+    loc_cell: str | None,
+):
+    filtered = filter_trash_cans(store_version, gu, keyword, loc_cell)
+    if filtered.empty:
+        st.info("지도로 표시할 데이터가 없어요.", icon="ℹ️")
+        return
+
+    if _is_default_view(gu, keyword, loc_cell):
+        # 아무것도 고르지 않은 첫 화면은 미리 렌더링한 HTML을 그대로 보여준다
+        with timer("folium_render"):
+            st.iframe(trash_overview_html(store_version), height=600)
+        return
+
+    base_center, base_zoom = _base_view(gu, loc_cell)
+    user_location = st.session_state["user_location"]
+    center = st.session_state.get("map_center", DEFAULT_CENTER)
+    zoom = st.session_state.get("map_zoom", DEFAULT_ZOOM)
+
+    selected_bin_id = st.session_state.get("selected_bin_id")
+    if user_location is not None and selected_bin_id is None:
+        center, zoom = user_location, base_zoom
+
+    folium_map = build_base_map(store_version, gu, keyword, loc_cell, base_zoom)
+
+    # 내 위치와 선택한 휴지통만 별도 레이어로 그림 (전체 마커는 다시 그리지 않음)
+    # 정확한 위치는 이 세션의 렌더링에서만 쓴다. 캐시(필터 결과, 마커 배열, 도보 거리)에는
+    # 위치 셀(loc_cell)만 들어가므로 같은 셀의 다른 사용자에게 내 좌표가 보이지 않는다.
+    selected_layer = folium.FeatureGroup(name="selected")
+    if user_location is not None:
+        folium.Marker(
+            location=user_location,
+            icon=folium.Icon(color="red", icon="user", prefix="fa"),
+            popup="내 위치",
+        ).add_to(selected_layer)
+        if nearby_mode:
+            folium.Circle(
+                location=user_location,
+                radius=RADIUS_M,
+                color="#ff6666",
+                fill=False,
+            ).add_to(selected_layer)
+
+    if selected_bin_id is not None:
+        selected = filtered[filtered["id"] == selected_bin_id]
+    else:
+        selected = filtered.iloc[:0]
+    for _, row in selected.iterrows():
+        folium.Marker(
+            location=[row["lat"], row["lng"]],
+            icon=folium.Icon(color="orange", icon="trash", prefix="fa"),
+            popup=folium.Popup(_popup_html(row), max_width=250, lazy=True),
+        ).add_to(selected_layer)
+
+    with timer("folium_render"):
+        st_folium(
+            folium_map,
+            key="trash-map",
+            width="100%",
+            height=600,
+            center=center,
+            zoom=zoom,
+            feature_group_to_add=selected_layer,
+            returned_objects=[],
+        )
+
+
 def page():
     # 스타일 커스터마이징
     st.markdown(
@@ -187,35 +595,37 @@ def page():
         st.session_state["list_limit"] = 20
     if "last_selected_gu" not in st.session_state:
         st.session_state["last_selected_gu"] = "전체"
+    if "user_location" not in st.session_state:
+        st.session_state["user_location"] = None
+        st.session_state["user_loc_cell"] = None
 
-    # 위치 정보
-    location = get_geolocation()
-    user_location: tuple[float, float] | None = None
-    if location:
-        try:
-            coords = location.get("coords") or {}
-            lat = coords.get("latitude")
-            lon = coords.get("longitude")
-            if lat is not None and lon is not None:
-                user_location = (float(lat), float(lon))
-        except (TypeError, KeyError, ValueError):
-            user_location = None
-
-    has_user_loc = user_location is not None
+    # 프래그먼트가 전체 실행 중인지, 단독 재실행 중인지 구분하기 위한 카운터
+    st.session_state["trash_page_run"] = st.session_state.get("trash_page_run", 0) + 1
+
+    # 데이터 새로고침으로 선택했던 휴지통이 사라졌으면 선택 해제
+    selected_bin_id = st.session_state["selected_bin_id"]
+    if selected_bin_id is not None and lookup_trash_can(selected_bin_id) is None:
+        st.session_state["selected_bin_id"] = None
 
     # 타이틀
     st.title("🗺️ 서울시 휴지통 지도")
+
+    # 이번 실행 동안에는 같은 버전의 저장소를 계속 사용
+    store = get_poi_store()
+    # 프래그먼트만 다시 실행될 때도 이 버전을 찾을 수 있게 세션이 다음 전체 실행까지 들고 있는다
+    st.session_state["trash_store"] = store
+    df = load_data(store.version)
+    available_gu = sorted(df["gu"].dropna().unique().tolist())
+
     st.caption(
-        "서울특별시 마포구 · 구로구 · 노원구 · 서초구 · 성북구 · 중랑구 공공 휴지통 위치 서비스를 제공해요."
+        f"서울특별시 {' · '.join(available_gu)} 공공 휴지통 위치 서비스를 제공해요."
     )
 
-    df = load_data()
-
     # ----------------- 사이드바: 필터/검색 -----------------
     with st.sidebar:
         st.header("검색 / 필터")
 
-        gu_options = ["전체", "마포구", "구로구", "노원구", "서초구", "성북구", "중랑구"]
+        gu_options = ["전체"] + available_gu
         selected_gu = st.selectbox("자치구 선택", gu_options, index=0)
 
         if selected_gu != "전체" and selected_gu in GU_CENTERS:
@@ -236,144 +646,29 @@ def page():
             placeholder="예: 독막로 241, 서초역...",
         )
 
+        # 보행 그래프(OSM 추출 파일)가 있을 때만 보여준다
+        walk_mode = walking_available() and st.checkbox(
+            "도보 거리순 정렬",
+            key="walk_mode",
+            help="내 위치를 켜면 강/큰길을 돌아가는 실제 걷는 거리로 목록을 정렬해요.",
+        )
+
     # ----------------- 레이아웃 컬럼 -----------------
     left, right = st.columns([0.4, 0.6])
 
-    nearby_mode: bool = False   # 현재는 false로 고정 (필요하면 토글로 확장 가능)
-    radius_m: int = 300
-
     # ----------------- 오른쪽 상단: 내 위치 / 버튼 -----------------
     with right:
         st.subheader("지도")
+        _location_fragment()
 
-        st.markdown('<div class="row1-wrap">', unsafe_allow_html=True)
-        row1_col1, row1_col2, row1_col3 = st.columns([0.12, 0.58, 0.30])
-
-        with row1_col1:
-            st.markdown("**📍 내 위치**")
-
-        with row1_col2:
-            if has_user_loc:
-                lat, lon = user_location
-                st.markdown(
-                    f"<span style='background:#cfe4ff;padding:4px 8px;border-radius:4px;'>"
-                    f"{lat:.5f}, {lon:.5f}</span>",
-                    unsafe_allow_html=True,
-                )
-            else:
-                st.markdown("🔔 브라우저에서 위치 권한을 **허용**해 주세요.")
-
-        with row1_col3:
-            if st.button("위치 새로고침", use_container_width=True):
-                st.rerun()
-
-        st.markdown("</div>", unsafe_allow_html=True)
-
-    # ----------------- 필터링/거리 계산 -----------------
-    filtered = filter_by_gu(df, selected_gu if selected_gu != "전체" else None)
-    filtered = search_by_keyword(filtered, search_text)
-
-    if nearby_mode and has_user_loc:
-        filtered = find_nearby(
-            filtered,
-            user_location[0],
-            user_location[1],
-            radius_m=radius_m,
-            limit=None,
-        )
-    elif has_user_loc:
-        filtered = annotate_distance(filtered, user_location[0], user_location[1])
-    else:
-        filtered = filtered.copy()
-        filtered["distance_m"] = None
+    gu = selected_gu if selected_gu != "전체" else None
+    keyword = (search_text or "").strip()
+    loc_cell = st.session_state["user_loc_cell"]
 
     # ----------------- 왼쪽: 리스트 -----------------
     with left:
-        st.subheader("🗑️ 휴지통 목록")
-
-        st.caption(
-            f"조건에 해당하는 휴지통: **{len(filtered)}개**"
-            + (
-                " (내 위치 기준 거리순)"
-                if nearby_mode and has_user_loc
-                else " (자치구/검색 기준)"
-            )
-        )
-
-        if filtered.empty:
-            st.warning("조건에 맞는 휴지통이 없어요 🥲", icon="⚠️")
-        else:
-            if "distance_m" in filtered.columns and filtered["distance_m"].notnull().any():
-                filtered_disp = filtered.sort_values("distance_m")
-            else:
-                filtered_disp = filtered.sort_values(["gu", "name"])
-
-            limit = st.session_state["list_limit"]
-            subset = filtered_disp.head(limit)
-
-            for _, row in subset.iterrows():
-                dist_m = row.get("distance_m", None)
-                dist_text = (
-                    f"{dist_m:.0f} m"
-                    if dist_m is not None and not pd.isna(dist_m)
-                    else "- m"
-                )
-
-                with st.container(border=True):
-                    st.markdown(f"**{row['name']}**")
-                    addr = row.get("road_address") or row.get("jibun_address") or ""
-                    if addr:
-                        st.caption(addr)
-
-                    detail_line = f"{row['gu']} · {row.get('type') or '일반 휴지통'}"
-                    if isinstance(row.get("detail"), str) and row["detail"].strip():
-                        detail_line += f" · {row['detail']}"
-                    st.write(detail_line)
-
-                    footer_left, footer_right = st.columns([0.5, 0.5])
-                    with footer_left:
-                        if has_user_loc:
-                            st.text(f"📍 내 위치로부터 {dist_text}")
-                    with footer_right:
-                        if st.button(
-                            "지도에서 보기",
-                            key=f"focus-{row['id']}",
-                            use_container_width=True,
-                        ):
-                            st.session_state["selected_bin_id"] = row["id"]
-                            st.session_state["map_center"] = (row["lat"], row["lng"])
-                            st.session_state["map_zoom"] = 18
-
-            if len(filtered_disp) > limit:
-                if st.button("더 보기", key="load_more"):
-                    st.session_state["list_limit"] += 20
-            else:
-                st.caption("모든 휴지통 정보를 다 불러왔어요 🙂")
+        _list_fragment(store.version, gu, keyword, loc_cell, walk_mode)
 
     # ----------------- 오른쪽: 지도 -----------------
     with right:
-        if filtered.empty:
-            st.info("지도로 표시할 데이터가 없어요.", icon="ℹ️")
-        else:
-            center = st.session_state.get("map_center", DEFAULT_CENTER)
-            zoom = st.session_state.get("map_zoom", DEFAULT_ZOOM)
-
-            if has_user_loc and st.session_state.get("selected_bin_id") is None:
-                center = user_location
-                zoom = 15 if nearby_mode else 13
-
-            folium_map = create_map(
-                df=filtered,
-                center=center,
-                zoom=zoom,
-                user_location=user_location,
-                radius_m=radius_m if (nearby_mode and has_user_loc) else None,
-                selected_bin_id=st.session_state.get("selected_bin_id"),
-            )
-
-            st_folium(
-                folium_map,
-                width="100%",
-                height=600,
-                returned_objects=[],
-            )
+        _map_fragment(store.version, gu, keyword, loc_cell)
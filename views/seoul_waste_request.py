@@ -1,20 +1,18 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 
 import folium
 import pandas as pd
 import streamlit as st
-from streamlit_folium import st_folium
+
+from backend.seoul_districts import GEOJSON_PATH, GU_NAME_KEY, read_seoul_geojson
+from views.prerendered_maps import artifact_key, file_signature, load_or_render
 
 
 BASE_DIR = Path(__file__).resolve().parents[1]
-GEOJSON_PATH = BASE_DIR / "data/recycle_link" / "서울_자치구_경계_2017.geojson"
 LINK_CSV_PATH = BASE_DIR / "data/recycle_link" / "폐기물_신청_링크.csv"
 
-GU_NAME_KEY = "SIG_KOR_NM"
-
 FEEDBACK_URL = "https://github.com/EchoSongEEE/recycling-app/issues/new?title=[자치구 폐기물 신청 링크 에러]&body=어떤+자치구+신청+링크에서+에러가+있었는지+작성해주세요.+링크+변동이+있다면+변경된+링크를+삽입해주시면+쓰담에게+많은+도움이+됩니다!"
 
 @st.cache_data
@@ -30,9 +28,8 @@ def load_gu_links() -> dict[str, str]:
 
 @st.cache_data
 def load_seoul_geojson() -> dict:
-    with open(GEOJSON_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return data
+    # 휴지통 자치구 판정과 같은 경계 데이터를 공유 (st.cache_data가 복사본을 넘겨줌)
+    return read_seoul_geojson()
 
 
 def _get_feature_centroid(feature: dict) -> tuple[float, float] | None:
@@ -167,24 +164,33 @@ def create_seoul_map(geojson_data: dict, gu_links: dict[str, str]) -> folium.Map
     return m
 
 
+@st.cache_resource(max_entries=2)
+def _district_overview_html(key: str) -> str:
+    return load_or_render(
+        "districts",
+        key,
+        lambda: create_seoul_map(load_seoul_geojson(), load_gu_links()),
+    )
+
+
+def district_overview_html() -> str:
+    """자치구 지도 HTML. 경계/링크 파일이 그대로면 미리 렌더링한 파일을 재사용한다."""
+    key = artifact_key(file_signature(GEOJSON_PATH), file_signature(LINK_CSV_PATH))
+    return _district_overview_html(key)
+
+
 def page():
     st.title("🚚 서울시 폐기물 신청 지도")
     st.caption("구를 클릭하면 폐기물 신청 링크를 팝업으로 제공해요.")
 
     try:
-        gu_links = load_gu_links()
-        geojson_data = load_seoul_geojson()
+        # 필터가 없는 지도라 항상 미리 렌더링한 HTML을 그대로 보여준다
+        map_html = district_overview_html()
     except Exception as e:
         st.error(f"데이터 불러오는 중 오류가 발생했어요: {e}")
         return
 
-    seoul_map = create_seoul_map(geojson_data, gu_links)
-
-    st_folium(
-        seoul_map,
-        width="100%",
-        height=520,
-    )
+    st.iframe(map_html, height=520)
 
                 # 서비스 오류 신고 
     with st.expander("🚨 서비스 오류 / 잘못된 안내 신고하기"):
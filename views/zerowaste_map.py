@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+from backend.poi_store import register_shops
 from backend.shop_finder import get_shops_by_location
 
 
@@ -42,6 +43,9 @@ def page():
                 )
                 st.stop()
 
+            # 찾은 샵을 공용 POI 저장소(shop 레이어)에 등록
+            register_shops(region, df)
+
             rename_map = {
                 "title": "가게명",
                 "category": "카테고리",